@@ -1,71 +1,20 @@
-class CPU(object):
-    def __init__(self, program):
-        self.program = program
-        self.ip = 0
-        self.registers = {'a': 0, 'b': 0}
-        self.instr = {
-            'hlf': self.hlf,
-            'tpl': self.tpl,
-            'inc': self.inc,
-            'jmp': self.jmp,
-            'jie': self.jie,
-            'jio': self.jio
-        }
-
-    def reset(self, a, b):
-        self.ip = 0
-        self.registers['a'] = a
-        self.registers['b'] = b
-
-    def decode_cmd_r(self, cmd):
-        if cmd not in ['a', 'b']:
-            raise TypeError(f'Could not recognise {cmd} as a register')
-        return cmd
-
-    def decode_cmd_o(self, cmd):
-        return int(cmd)
+from aoc.vm import TURING_LOCK, Machine, assemble
 
-    def decode_cmd_r_o(self, cmd):
-        r, o = cmd.split(', ')
-        return self.decode_cmd_r(r), self.decode_cmd_o(o)
 
-    def inc(self, cmd: str):
-        r = self.decode_cmd_r(cmd)
-        self.registers[r] += 1
-        self.ip += 1
-
-    def hlf(self, cmd: str):
-        r = self.decode_cmd_r(cmd)
-        self.registers[r] //= 2
-        self.ip += 1
-
-    def tpl(self, cmd: str):
-        r = self.decode_cmd_r(cmd)
-        self.registers[r] *= 3
-        self.ip += 1
-
-    def jmp(self, cmd: str):
-        o = self.decode_cmd_o(cmd)
-        self.ip += o
+class CPU(object):
+    def __init__(self, program):
+        self.program = assemble(program, TURING_LOCK)
+        self.machine = Machine(self.program)
 
-    def jie(self, cmd: str):
-        r, o = self.decode_cmd_r_o(cmd)
-        if self.registers[r] % 2 == 0:
-            self.ip += o
-        else:
-            self.ip += 1
+    @property
+    def registers(self):
+        return {'a': self.machine['a'], 'b': self.machine['b']}
 
-    def jio(self, cmd: str):
-        r, o = self.decode_cmd_r_o(cmd)
-        if self.registers[r] == 1:
-            self.ip += o
-        else:
-            self.ip += 1
+    def reset(self, a, b):
+        self.machine.reset(a=a, b=b)
 
     def run(self):
-        while 0 <= self.ip < len(self.program):
-            opcode, param = self.program[self.ip].split(' ', maxsplit=1)
-            self.instr[opcode](param.strip())
+        self.machine.run()
 
 
 with open('input') as f:
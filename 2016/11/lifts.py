@@ -1,5 +1,7 @@
 import re
-from itertools import chain
+from itertools import chain, combinations
+
+from aoc.search import bidirectional_bfs
 
 LEVELS = {
     'first': 0,
@@ -81,8 +83,76 @@ def parse(arrangement: str):
     return res
 
 
+def to_state(arrange_list: list) -> tuple:
+    """
+    Reduce the four floor bit patterns from parse() to the lift floor and
+    a sorted tuple of (chip floor, generator floor) pairs, one per element.
+    Elements are interchangeable, so arrangements that differ only by
+    which element sits where share one state.
+
+    :param arrange_list: list
+    :return: tuple
+    """
+    lift = next(floor for floor, contents in enumerate(arrange_list) if contents & LIFT_MASK)
+    pairs = []
+    element = 1
+    while any(contents >> (element * 2 - 1) for contents in arrange_list):
+        chip = next(floor for floor, contents in enumerate(arrange_list) if contents >> (element * 2 - 1) & 1)
+        gen = next(floor for floor, contents in enumerate(arrange_list) if contents >> (element * 2) & 1)
+        pairs.append((chip, gen))
+        element += 1
+    return lift, tuple(sorted(pairs))
+
+
+def moves(state: tuple):
+    """
+    Yield every state one lift trip away: one or two items from the lift's
+    floor carried a floor up or down, leaving no chip beside a foreign
+    generator without its own. Every trip can be reversed, so the same
+    moves lead back towards the start.
+
+    :param state: tuple
+    :return: generator of tuple
+    """
+    lift, pairs = state
+    items = [(i, kind) for i, pair in enumerate(pairs) for kind in (0, 1) if pair[kind] == lift]
+    loads = list(combinations(items, 2)) + [(item,) for item in items]
+    for target in (lift + 1, lift - 1):
+        if not 0 <= target < len(LEVELS):
+            continue
+        for load in loads:
+            new_pairs = list(pairs)
+            for i, kind in load:
+                chip, gen = new_pairs[i]
+                new_pairs[i] = (target, gen) if kind == 0 else (chip, target)
+            powered = {gen for _, gen in new_pairs}
+            if all(chip == gen or chip not in powered for chip, gen in new_pairs):
+                new_pairs.sort()
+                yield target, tuple(new_pairs)
+
+
+def pack(state: tuple) -> int:
+    """Fingerprint a state as one int, four bits per element."""
+    lift, pairs = state
+    packed = lift
+    for chip, gen in pairs:
+        packed = packed << 4 | chip << 2 | gen
+    return packed
+
+
 def lifts_assemble(arrange_list: list):
-    pass
+    """
+    The fewest lift trips needed to bring everything to the fourth floor.
+    The finished state is known in advance, so the search runs from both
+    ends at once and meets in the middle.
+
+    :param arrange_list: list
+    :return: int
+    """
+    start = to_state(arrange_list)
+    goal = (len(LEVELS) - 1, tuple((len(LEVELS) - 1, len(LEVELS) - 1) for _ in start[1]))
+    result = bidirectional_bfs(start, goal, moves, key=pack, track_path=False)
+    return result.depth if result else None
 
 
 if __name__ == '__main__':
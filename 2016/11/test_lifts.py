@@ -1,4 +1,4 @@
-from lifts import parse, lifts_assemble
+from lifts import parse, lifts_assemble, to_state
 
 arrangement = '''The first floor contains a hydrogen-compatible microchip and a lithium-compatible microchip.
 The second floor contains a hydrogen generator.
@@ -19,3 +19,11 @@ def test_parse():
 
 def test_lifts_assemble():
     assert lifts_assemble(parse(arrangement)) == 11
+
+
+def test_to_state():
+    assert to_state(parse(arrangement)) == (0, ((0, 1), (0, 2)))
+
+
+def test_lifts_assemble():
+    assert lifts_assemble(parse(arrangement)) == 11
@@ -1,128 +1,55 @@
-CODE = []
-REGISTERS = {'a': 0, 'b': 0, 'c': 0, 'd': 0}
-ip: int = 0
-
-
-def val_or_reg(x):
-    if x.lstrip('+-').isdigit():
-        return int(x)
-    else:
-        return REGISTERS[x]
-
-
-def ins_cpy(x, y):
-    REGISTERS[y] = val_or_reg(x)
-    return 1
-
-
-def ins_inc(x):
-    REGISTERS[x] += 1
-    return 1
-
-
-def ins_dec(x):
-    REGISTERS[x] -= 1
-    return 1
-
-
-def ins_jnz(x, y):
-    return val_or_reg(y) if val_or_reg(x) != 0 else 1
-
-
-OPCODE_TX = {
-    'inc': 'dec',
-    'dec': 'inc',
-    'jnz': 'cpy',
-    'cpy': 'jnz',
-    'tgl': 'inc',
-    'out': 'inc'
-}
-
-
-def ins_tgl(x):
-    global ip
-    target_ip = ip + val_or_reg(x)
-    if 0 <= target_ip < len(CODE):
-        temp = CODE[target_ip]
-        CODE[target_ip] = OPCODE_TX[temp[:3]] + temp[3:]
-    return 1
-
-
-def ins_out(x):
-    n = val_or_reg(x)
-    if n != ins_out.target:
-        raise ValueError(f'Expected {ins_out.target}, got {n}')
-    else:
-        ins_out.target = 1 - ins_out.target
-        ins_out.count += 1
-        if ins_out.count > 1000:
-            raise StopIteration(f'Looks like a match')
-    return 1
-
-
-ins_out.target = 0
-ins_out.count = 0
-
-OPCODES = {
-    'cpy': ins_cpy,
-    'inc': ins_inc,
-    'dec': ins_dec,
-    'jnz': ins_jnz,
-    'tgl': ins_tgl,
-    'out': ins_out
-}
-
-
-def run():
-    global ip
-    ins_out.target = 0
-    ins_out.count = 0
-    ip = 0
-    while ip < len(CODE):
-        if ip == 0:
-            # 0: cpy a d
-            # 1: cpy 9 c
-            # 2: cpy 282 b
-            # 3: inc d
-            # 4: dec b
-            # 5: jnz b -2
-            # 6: dec c
-            # 7: jnz c -5
-            # becomes:
-            REGISTERS['d'] = REGISTERS['a'] + 9 * 282
-            ip = 8
-        elif ip == 10:
-            # 10: cpy a b
-            # 11: cpy 0 a
-            # 12: cpy 2 c
-            # 13: jnz b 2
-            # 14: jnz 1 6
-            # 15: dec b
-            # 16: dec c
-            # 17: jnz c -4
-            # 18: inc a
-            # 19: jnz 1 -7
-            # becomes:
-            REGISTERS['a'], REGISTERS['c'] = divmod(REGISTERS['a'], 2)
-            REGISTERS['c'] = 2 - REGISTERS['c']
-            ip = 20
-        else:
-            ins, *params = CODE[ip].split()
-            ip += OPCODES[ins](*params)
+from aoc.vm import ASSEMBUNNY, Halt, Machine, assemble
+
+
+def halve(registers):
+    # 10: cpy a b
+    # 11: cpy 0 a
+    # 12: cpy 2 c
+    # 13: jnz b 2
+    # 14: jnz 1 6
+    # 15: dec b
+    # 16: dec c
+    # 17: jnz c -4
+    # 18: inc a
+    # 19: jnz 1 -7
+    # becomes:
+    registers[0], registers[2] = divmod(registers[0], 2)
+    registers[2] = 2 - registers[2]
+    return 20
+
+
+class ClockTester(object):
+    """Runs the program for one value of `a` after another, checking its output."""
+
+    def __init__(self, code, length=1000):
+        self.length = length
+        self.signal = []
+        self.computer = Machine(code, out=self.out)
+        self.computer.patch(10, halve)
+
+    def out(self, value):
+        if value != len(self.signal) % 2:
+            raise Halt(f'Expected {len(self.signal) % 2}, got {value}')
+        self.signal.append(value)
+        if len(self.signal) > self.length:
+            raise Halt('Looks like a match')
+
+    def is_clock_signal(self, a):
+        """Whether the program started with `a` outputs 0, 1, 0, 1, ... for `length` values."""
+        self.signal.clear()
+        self.computer.reset(a=a)
+        self.computer.run()
+        return len(self.signal) > self.length
 
 
 if __name__ == '__main__':
     with open('input.txt') as assembunny_file:
-        CODE.extend(assembunny_file.read().splitlines(keepends=False))
+        CODE = assemble(assembunny_file.read().splitlines(keepends=False), ASSEMBUNNY)
+    tester = ClockTester(CODE)
     a = 1
     while True:
         print(a, end=', ')
-        REGISTERS["a"] = a
-        try:
-            run()
-        except ValueError:
-            pass
-        except StopIteration:
+        if tester.is_clock_signal(a):
             break
         a += 1
     print(f'\nDay 25, part 1: {a}')
@@ -1,38 +1,12 @@
-from collections import defaultdict
+from aoc.vm import COPROCESSOR, Machine, assemble
 
 
 def coprocessor_conflagration(inp, part1=True):
-    registers = defaultdict(lambda: 0)
-    if not part1:
-        registers['a'] = 1
-
-    def reg_or_val(s: str) -> int:
-        if len(s) == 1 and s.isalpha():
-            return registers[s]
-        else:
-            return int(s)
-
     if part1:
-        ip = 0
-        mul_count = 0
-        while 0 <= ip < len(inp):
-            line = inp[ip]
-            mnemonic, *params = line.split()
-            if mnemonic == 'set':
-                registers[params[0]] = reg_or_val(params[1])
-            elif mnemonic == 'sub':
-                registers[params[0]] -= reg_or_val(params[1])
-            elif mnemonic == 'mul':
-                registers[params[0]] *= reg_or_val(params[1])
-                mul_count += 1
-            elif mnemonic == 'jnz':
-                if reg_or_val(params[0]) != 0:
-                    ip += reg_or_val(params[1])
-                    continue
-            else:
-                print(f'Bad mnemonic {mnemonic} at {ip}')
-            ip += 1
-        return mul_count
+        program = assemble(inp, COPROCESSOR)
+        counts = [0] * len(program)
+        Machine(program).run(counts)
+        return sum(counts[ip] for ip in program.addresses('mul'))
 
     b = 93 * 100 + 100000
     c = b + 17000
@@ -1,68 +1,13 @@
-def run_script(inp, ip_reg, zero_start):
-    registers = [zero_start, 0, 0, 0, 0, 0]
-    r_names = ['A', 'B', 'C', 'D', 'IP', 'F']
+from aoc.vm import ELFCODE, Machine, assemble
 
-    if zero_start == 2:
-        while 0 <= registers[ip_reg] <= len(inp):
-            line = inp[registers[ip_reg]]
-            print(f'[{" ".join([f"{n}:{r:<3}" for r, n in zip(registers, r_names)]):^30}] : ', end='')
-            op, *params = line.split()
-            a, b, c = map(int, params)
-            if op == 'addr':
-                registers[c] = registers[a] + registers[b]
-                print(f'{op} {r_names[a]} + {r_names[b]} -> {r_names[c]} [{registers[c]}]')
-            elif op == 'addi':
-                registers[c] = registers[a] + b
-                print(f'{op} {r_names[a]} + {b} -> {r_names[c]} [{registers[c]}]')
-            elif op == 'mulr':
-                registers[c] = registers[a] * registers[b]
-                print(f'{op} {r_names[a]} * {r_names[b]} -> {r_names[c]} [{registers[c]}]')
-            elif op == 'muli':
-                registers[c] = registers[a] * b
-                print(f'{op} {r_names[a]} * {b} -> {r_names[c]} [{registers[c]}]')
-            elif op == 'banr':
-                registers[c] = registers[a] & registers[b]
-                print(f'{op} {r_names[a]} & {r_names[b]} -> {r_names[c]} [{registers[c]}]')
-            elif op == 'bani':
-                registers[c] = registers[a] & b
-                print(f'{op} {r_names[a]} & {b} -> {r_names[c]} [{registers[c]}]')
-            elif op == 'borr':
-                registers[c] = registers[a] | registers[b]
-                print(f'{op} {r_names[a]} | {r_names[b]} -> {r_names[c]} [{registers[c]}]')
-            elif op == 'bori':
-                registers[c] = registers[a] | b
-                print(f'{op} {r_names[a]} | {b} -> {r_names[c]} [{registers[c]}]')
-            elif op == 'setr':
-                registers[c] = registers[a]
-                print(f'{op} {r_names[a]} -> {r_names[c]} [{registers[c]}]')
-            elif op == 'seti':
-                registers[c] = a
-                print(f'{op} {a} -> {r_names[c]} [{registers[c]}]')
-            elif op == 'gtir':
-                registers[c] = 1 if a > registers[b] else 0
-                print(f'{op} {a} > {r_names[b]} -> {r_names[c]} [{registers[c]}]')
-            elif op == 'gtri':
-                registers[c] = 1 if registers[a] > b else 0
-                print(f'{op} {r_names[a]} > {b} -> {r_names[c]} [{registers[c]}]')
-            elif op == 'gtrr':
-                registers[c] = 1 if registers[a] > registers[b] else 0
-                print(f'{op} {r_names[a]} > {r_names[b]} -> {r_names[c]} [{registers[c]}]')
-            elif op == 'eqir':
-                registers[c] = 1 if a == registers[b] else 0
-                print(f'{op} {a} == {r_names[b]} -> {r_names[c]} [{registers[c]}]')
-            elif op == 'eqri':
-                registers[c] = 1 if registers[a] == b else 0
-                print(f'{op} {r_names[a]} == {b} -> {r_names[c]} [{registers[c]}]')
-            elif op == 'eqrr':
-                registers[c] = 1 if registers[a] == registers[b] else 0
-                print(f'{op} {r_names[a]} == {r_names[b]} -> {r_names[c]} [{registers[c]}]')
-            registers[ip_reg] += 1
+
+def run_script(program, zero_start):
+    if zero_start == 0:
+        machine = Machine(program, {'0': zero_start})
+        machine.run()
+        registers = machine.registers
     else:
-        a, b, c, d, ip, f = registers
-        if a == 0:
-            f = 964
-        else:
-            f = 10551364
+        a, b, c, d, ip, f = zero_start, 0, 0, 0, 0, 10551364
         ##
         # Assembly code reduces to:
         #
@@ -82,12 +27,7 @@ def run_script(inp, ip_reg, zero_start):
 
 
 def go_with_the_flow(inp, zero_start=0):
-    script = inp.copy()
-    ip_reg = -1
-    if script[0].startswith('#ip '):
-        ip_reg = int(script[0][4:])
-        script.remove(script[0])
-    registers = run_script(script, ip_reg, zero_start)
+    registers = run_script(assemble(inp, ELFCODE), zero_start)
     return registers[0]
 
 
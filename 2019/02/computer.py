@@ -1,5 +1,7 @@
 from itertools import product
 
+from intcode.sweep import Case, search
+
 
 def computer(cells):
     c = [int(v) for v in cells.split(',')]
@@ -31,15 +33,11 @@ def run_computer_recover(cells):
 
 def find_key_inputs(cells):
     target = 19690720
-    result = 0
-    for noun, verb in product(range(100), range(100)):
-        c = [int(v) for v in cells.split(',')]
-        c[1] = noun
-        c[2] = verb
-        c = simulate(c)
-        result = c[0]
-        if result == target:
-            print(f'Noun: {noun}, Verb: {verb} results in {c[0]}')
+    cases = (Case(patch={1: noun, 2: verb}) for noun, verb in product(range(100), range(100)))
+    found = search(cells, cases, until=lambda result: result.memory[0] == target, read=(0,))
+    if found is not None:
+        noun, verb = found.case.patch[1], found.case.patch[2]
+        print(f'Noun: {noun}, Verb: {verb} results in {found.memory[0]}')
 
 OPCODES = {1:'+', 2:'*', 99:'halt'}
 
@@ -66,8 +64,11 @@ def disassemble(cells):
         pc += 4
 
 
+INITIAL_CELLS = '1,0,0,3,1,1,2,3,1,3,4,3,1,5,0,3,2,9,1,19,1,19,5,23,1,9,23,27,2,27,6,31,1,5,31,35,2,9,35,39,2,6,39,43,2,43,13,47,2,13,47,51,1,10,51,55,1,9,55,59,1,6,59,63,2,63,9,67,1,67,6,71,1,71,13,75,1,6,75,79,1,9,79,83,2,9,83,87,1,87,6,91,1,91,13,95,2,6,95,99,1,10,99,103,2,103,9,107,1,6,107,111,1,10,111,115,2,6,115,119,1,5,119,123,1,123,13,127,1,127,5,131,1,6,131,135,2,135,13,139,1,139,2,143,1,143,10,0,99,2,0,14,0'
+
+
 if __name__ == '__main__':
-    initial_cells = '1,0,0,3,1,1,2,3,1,3,4,3,1,5,0,3,2,9,1,19,1,19,5,23,1,9,23,27,2,27,6,31,1,5,31,35,2,9,35,39,2,6,39,43,2,43,13,47,2,13,47,51,1,10,51,55,1,9,55,59,1,6,59,63,2,63,9,67,1,67,6,71,1,71,13,75,1,6,75,79,1,9,79,83,2,9,83,87,1,87,6,91,1,91,13,95,2,6,95,99,1,10,99,103,2,103,9,107,1,6,107,111,1,10,111,115,2,6,115,119,1,5,119,123,1,123,13,127,1,127,5,131,1,6,131,135,2,135,13,139,1,139,2,143,1,143,10,0,99,2,0,14,0'
+    initial_cells = INITIAL_CELLS
     run_computer_recover(initial_cells)
     find_key_inputs(initial_cells)
     disassemble(initial_cells)
@@ -1,173 +1,52 @@
-import operator
-from collections import namedtuple, deque
-from enum import IntEnum
+from intcode.intcode import Intcode
 
 
-class AccessMode(IntEnum):
-    PARAMETER = 0
-    IMMEDIATE = 1
+class Processor(Intcode):
+    """The diagnostic computer: the shared Intcode engine, printing each output as it arrives."""
 
-
-class DisStyle(IntEnum):
-    NO_PARAM = 0  # HALT
-    THREE_PARAM = 1  # P3 ← P1 op P2
-    IN_PARAM = 2  # P1 ← console
-    OUT_PARAM = 3  # P1 → console
-    COND_JUMP = 4  # (P1) goto P2
-
-
-OpCodes = namedtuple('OpCodes', 'num instruction length op dis_style')
-
-opcode_list = {
-    1: OpCodes(1, 'ADD', 4, operator.add, DisStyle.THREE_PARAM),
-    2: OpCodes(2, 'MUL', 4, operator.mul, DisStyle.THREE_PARAM),
-    3: OpCodes(3, 'INP', 2, None, DisStyle.IN_PARAM),
-    4: OpCodes(4, 'OUT', 2, None, DisStyle.OUT_PARAM),
-    5: OpCodes(5, 'JNZ', 3, lambda x: x != 0, DisStyle.COND_JUMP),
-    6: OpCodes(6, 'JZ', 3, lambda x: x == 0, DisStyle.COND_JUMP),
-    7: OpCodes(7, 'LT', 4, (lambda x, y: 1 if x < y else 0), DisStyle.THREE_PARAM),
-    8: OpCodes(8, 'EQ', 4, (lambda x, y: 1 if x == y else 0), DisStyle.THREE_PARAM),
-    99: OpCodes(99, 'HLT', 1, None, DisStyle.NO_PARAM)
-}
-
-
-def prepare_mem(init_mem: str):
-    return [int(v) for v in init_mem.split(',')]
-
-
-class Processor(object):
     def __init__(self, mem_str: str):
-        self._core = []
-        self._mem_str = mem_str
-        self._ip = 0
-        self._input = deque()
-        self.reset_core()
-
-    def reset_core(self):
-        self._core = prepare_mem(self._mem_str)
-        self._input.clear()
-        self._ip = 0
-
-    def current_instruction(self):
-        return opcode_list[int(self.core[self.ip] % 100)]
-
-    def parameter(self, param_num, as_str=False, target=False):
-        if 0 < param_num < self.current_instruction().length:
-            mode = AccessMode((self.core[self.ip] // 10 ** (param_num + 1)) % 10)
-            param = self.core[self.ip + param_num]
-            if as_str:
-                return f'[{param}]' if mode == AccessMode.PARAMETER else f'#{param}'
-            else:
-                if target:
-                    return param
-                else:
-                    return self.core[param] if mode == AccessMode.PARAMETER else param
-        else:
-            raise OverflowError(f'Incorrect parameter number: {param_num} at instruction {self.ip}')
-
-    @property
-    def ip(self):
-        return self._ip
-
-    @ip.setter
-    def ip(self, val):
-        if isinstance(val, int) and 0 <= val < len(self.core):
-            self._ip = val
-        else:
-            raise ValueError('IP can only be set to a positive integer within code space')
-
-    @property
-    def core(self):
-        return self._core
-
-    def opcode(self, instruction: OpCodes):
-        ip = self.ip
-        op, *param = self.core[ip:ip + instruction.length]
-        dump = f'{op:05} ' + " ".join(f'{v:5}' for v in param)
-        if instruction.dis_style == DisStyle.THREE_PARAM:
-            return f'{dump:23} : {self.parameter(3, True)} ← {self.parameter(1, True)} ' \
-                   f'{instruction.instruction} {self.parameter(2, True)} '
-        elif instruction.dis_style == DisStyle.IN_PARAM:
-            return f'{dump:23} : {self.parameter(1, True)} ← {instruction.instruction}'
-        elif instruction.dis_style == DisStyle.OUT_PARAM:
-            return f'{dump:23} : {instruction.instruction} ← {self.parameter(1, True)}'
-        elif instruction.dis_style == DisStyle.COND_JUMP:
-            return f'{dump:23} : {instruction.instruction} ({self.parameter(1, True)}) {self.parameter(2, True)}'
-        else:
-            return f'{dump:23} : HALT'
-
-    def step(self):
-        inst = self.current_instruction()
-        if inst.dis_style == DisStyle.THREE_PARAM:
-            self.core[self.parameter(3, target=True)] = inst.op(self.parameter(1), self.parameter(2))
-        elif inst.dis_style == DisStyle.IN_PARAM:
-            self.core[self.parameter(1, target=True)] = self._input.pop()
-        elif inst.dis_style == DisStyle.OUT_PARAM:
-            print(f'OUT({self.ip:05}) → {self.parameter(1)}')
-        elif inst.dis_style == DisStyle.COND_JUMP:
-            if inst.op(self.parameter(1)):
-                self.ip = self.parameter(2)
-                return
-        elif inst.dis_style == DisStyle.NO_PARAM:
-            raise GeneratorExit(f'Halt at {self.ip}')
-        self.ip += inst.length
-
-    def simulate(self, inputs=None, trace=False):
-        if inputs:
-            self._input.extendleft(inputs)
-        while self.ip < len(self.core):
-            if trace:
-                inst = self.current_instruction()
-                print(f'{self.ip:05} : {self.opcode(inst)}')
-            try:
-                self.step()
-            except GeneratorExit:
-                break
-
-    def disassemble(self, patch: str or None = None, start_at=None, end_at=None):
-        if patch:
-            for s in patch.split(','):
-                a, v = [int(x) for x in s.split(':')]
-                self.core[a] = v
-        if start_at:
-            self.ip = start_at
-        if not end_at:
-            end_at = len(self.core)
-
-        while self.ip < end_at:
-            inst = self.current_instruction()
-            print(f'{self.ip:05} : {self.opcode(inst)}')
-            self.ip += inst.length
+        super().__init__(mem_str, 'Diagnostic')
+        self.connect(self._print_output)
+
+    def _print_output(self, value, trace=False):
+        # untraced runs report an output once past the two-word OUT instruction
+        print(f'OUT({self.ip if trace else self.ip - 2:05}) → {value}')
+
+    def simulate(self, inputs=None, trace=False, verbose=False):
+        super().simulate(inputs, trace=trace, verbose=verbose or trace)
+
+
+INITIAL_CELLS = '3,225,1,225,6,6,1100,1,238,225,104,0,1101,86,8,225,1101,82,69,225,101,36,65,224,1001,224,-106,' \
+                '224,4,224,1002,223,8,223,1001,224,5,224,1,223,224,223,102,52,148,224,101,-1144,224,224,4,224,' \
+                '1002,223,8,223,101,1,224,224,1,224,223,223,1102,70,45,225,1002,143,48,224,1001,224,-1344,224,4,' \
+                '224,102,8,223,223,101,7,224,224,1,223,224,223,1101,69,75,225,1001,18,85,224,1001,224,-154,224,4,' \
+                '224,102,8,223,223,101,2,224,224,1,224,223,223,1101,15,59,225,1102,67,42,224,101,-2814,224,224,4,' \
+                '224,1002,223,8,223,101,3,224,224,1,223,224,223,1101,28,63,225,1101,45,22,225,1101,90,16,225,2,' \
+                '152,92,224,1001,224,-1200,224,4,224,102,8,223,223,101,7,224,224,1,223,224,223,1101,45,28,224,' \
+                '1001,224,-73,224,4,224,1002,223,8,223,101,7,224,224,1,224,223,223,1,14,118,224,101,-67,224,224,' \
+                '4,224,1002,223,8,223,1001,224,2,224,1,223,224,223,4,223,99,0,0,0,677,0,0,0,0,0,0,0,0,0,0,0,1105,' \
+                '0,99999,1105,227,247,1105,1,99999,1005,227,99999,1005,0,256,1105,1,99999,1106,227,99999,1106,0,' \
+                '265,1105,1,99999,1006,0,99999,1006,227,274,1105,1,99999,1105,1,280,1105,1,99999,1,225,225,225,' \
+                '1101,294,0,0,105,1,0,1105,1,99999,1106,0,300,1105,1,99999,1,225,225,225,1101,314,0,0,106,0,0,' \
+                '1105,1,99999,7,677,677,224,102,2,223,223,1005,224,329,1001,223,1,223,1008,226,226,224,1002,223,' \
+                '2,223,1005,224,344,1001,223,1,223,1107,677,226,224,1002,223,2,223,1006,224,359,1001,223,1,223,' \
+                '107,677,677,224,102,2,223,223,1005,224,374,101,1,223,223,1108,677,226,224,102,2,223,223,1005,' \
+                '224,389,1001,223,1,223,1007,677,677,224,1002,223,2,223,1005,224,404,101,1,223,223,1008,677,226,' \
+                '224,102,2,223,223,1005,224,419,101,1,223,223,1108,226,677,224,102,2,223,223,1006,224,434,1001,' \
+                '223,1,223,8,677,226,224,1002,223,2,223,1005,224,449,101,1,223,223,1008,677,677,224,1002,223,2,' \
+                '223,1006,224,464,1001,223,1,223,1108,226,226,224,1002,223,2,223,1005,224,479,1001,223,1,223,' \
+                '1007,226,677,224,102,2,223,223,1005,224,494,1001,223,1,223,1007,226,226,224,102,2,223,223,1005,' \
+                '224,509,101,1,223,223,107,677,226,224,1002,223,2,223,1006,224,524,1001,223,1,223,108,677,677,' \
+                '224,102,2,223,223,1006,224,539,101,1,223,223,7,677,226,224,102,2,223,223,1006,224,554,1001,223,' \
+                '1,223,1107,226,677,224,102,2,223,223,1005,224,569,101,1,223,223,108,677,226,224,1002,223,2,223,' \
+                '1006,224,584,101,1,223,223,108,226,226,224,102,2,223,223,1006,224,599,1001,223,1,223,1107,226,' \
+                '226,224,102,2,223,223,1006,224,614,1001,223,1,223,8,226,677,224,102,2,223,223,1006,224,629,1001,' \
+                '223,1,223,107,226,226,224,102,2,223,223,1005,224,644,101,1,223,223,8,226,226,224,102,2,223,223,' \
+                '1006,224,659,101,1,223,223,7,226,677,224,102,2,223,223,1005,224,674,101,1,223,223,4,223,99,226 '
 
 
 if __name__ == '__main__':
-    initial_cells = '3,225,1,225,6,6,1100,1,238,225,104,0,1101,86,8,225,1101,82,69,225,101,36,65,224,1001,224,-106,' \
-                    '224,4,224,1002,223,8,223,1001,224,5,224,1,223,224,223,102,52,148,224,101,-1144,224,224,4,224,' \
-                    '1002,223,8,223,101,1,224,224,1,224,223,223,1102,70,45,225,1002,143,48,224,1001,224,-1344,224,4,' \
-                    '224,102,8,223,223,101,7,224,224,1,223,224,223,1101,69,75,225,1001,18,85,224,1001,224,-154,224,4,' \
-                    '224,102,8,223,223,101,2,224,224,1,224,223,223,1101,15,59,225,1102,67,42,224,101,-2814,224,224,4,' \
-                    '224,1002,223,8,223,101,3,224,224,1,223,224,223,1101,28,63,225,1101,45,22,225,1101,90,16,225,2,' \
-                    '152,92,224,1001,224,-1200,224,4,224,102,8,223,223,101,7,224,224,1,223,224,223,1101,45,28,224,' \
-                    '1001,224,-73,224,4,224,1002,223,8,223,101,7,224,224,1,224,223,223,1,14,118,224,101,-67,224,224,' \
-                    '4,224,1002,223,8,223,1001,224,2,224,1,223,224,223,4,223,99,0,0,0,677,0,0,0,0,0,0,0,0,0,0,0,1105,' \
-                    '0,99999,1105,227,247,1105,1,99999,1005,227,99999,1005,0,256,1105,1,99999,1106,227,99999,1106,0,' \
-                    '265,1105,1,99999,1006,0,99999,1006,227,274,1105,1,99999,1105,1,280,1105,1,99999,1,225,225,225,' \
-                    '1101,294,0,0,105,1,0,1105,1,99999,1106,0,300,1105,1,99999,1,225,225,225,1101,314,0,0,106,0,0,' \
-                    '1105,1,99999,7,677,677,224,102,2,223,223,1005,224,329,1001,223,1,223,1008,226,226,224,1002,223,' \
-                    '2,223,1005,224,344,1001,223,1,223,1107,677,226,224,1002,223,2,223,1006,224,359,1001,223,1,223,' \
-                    '107,677,677,224,102,2,223,223,1005,224,374,101,1,223,223,1108,677,226,224,102,2,223,223,1005,' \
-                    '224,389,1001,223,1,223,1007,677,677,224,1002,223,2,223,1005,224,404,101,1,223,223,1008,677,226,' \
-                    '224,102,2,223,223,1005,224,419,101,1,223,223,1108,226,677,224,102,2,223,223,1006,224,434,1001,' \
-                    '223,1,223,8,677,226,224,1002,223,2,223,1005,224,449,101,1,223,223,1008,677,677,224,1002,223,2,' \
-                    '223,1006,224,464,1001,223,1,223,1108,226,226,224,1002,223,2,223,1005,224,479,1001,223,1,223,' \
-                    '1007,226,677,224,102,2,223,223,1005,224,494,1001,223,1,223,1007,226,226,224,102,2,223,223,1005,' \
-                    '224,509,101,1,223,223,107,677,226,224,1002,223,2,223,1006,224,524,1001,223,1,223,108,677,677,' \
-                    '224,102,2,223,223,1006,224,539,101,1,223,223,7,677,226,224,102,2,223,223,1006,224,554,1001,223,' \
-                    '1,223,1107,226,677,224,102,2,223,223,1005,224,569,101,1,223,223,108,677,226,224,1002,223,2,223,' \
-                    '1006,224,584,101,1,223,223,108,226,226,224,102,2,223,223,1006,224,599,1001,223,1,223,1107,226,' \
-                    '226,224,102,2,223,223,1006,224,614,1001,223,1,223,8,226,677,224,102,2,223,223,1006,224,629,1001,' \
-                    '223,1,223,107,226,226,224,102,2,223,223,1005,224,644,101,1,223,223,8,226,226,224,102,2,223,223,' \
-                    '1006,224,659,101,1,223,223,7,226,677,224,102,2,223,223,1005,224,674,101,1,223,223,4,223,99,226 '
+    initial_cells = INITIAL_CELLS
     computer = Processor(initial_cells)
 
     print('Part 1')
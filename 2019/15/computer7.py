@@ -125,6 +125,7 @@ class Droid(object):
         self._current_path = deque()
         self._update_current_path()
         self._dir = Compass.NORTH
+        self.path_to_oxygen_length = None
 
     def _update_current_path(self):
         here = self._map_grid.hash_pos
@@ -172,6 +173,33 @@ class Droid(object):
         self._processor.connect(self._receiver, self._sender)
         self._processor.simulate(inputs, trace=trace, verbose=False)
 
+    def explore(self):
+        """Map the maze breadth first by forking the droid's machine at every open cell.
+
+        Each fork tries one step from a cell it has already reached, so no
+        droid ever walks back. Sets path_to_oxygen_length on the way.
+        """
+        offsets = {Compass.NORTH: (0, 1), Compass.SOUTH: (0, -1), Compass.WEST: (-1, 0), Compass.EAST: (1, 0)}
+        grid = self._map_grid.grid
+        frontier = deque([((0, 0), 0, self._processor)])
+        while frontier:
+            (x, y), dist, processor = frontier.popleft()
+            for direction, (dx, dy) in offsets.items():
+                spot = (x + dx, y + dy)
+                key = self._map_grid._hash_pos(spot)
+                if key in grid:
+                    continue
+                droid = processor.fork()
+                droid.receiver(direction)
+                _, output = next(droid.run())
+                if output == DroidStatus.WALL:
+                    grid[key] = MazeCell.WALL
+                    continue
+                grid[key] = MazeCell.EMPTY if output == DroidStatus.SUCCESS else MazeCell.OXYGEN
+                if output == DroidStatus.OXYGEN and self.path_to_oxygen_length is None:
+                    self.path_to_oxygen_length = dist + 1
+                frontier.append((spot, dist + 1, droid))
+
     def image(self, plain: bool = False):
         in_img = self._map_grid.image(plain)
         if not plain:
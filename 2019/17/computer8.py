@@ -1,9 +1,11 @@
+from intcode.channel import AsciiChannel
 from intcode.intcode import Intcode
 
 
 class Ascii(object):
     def __init__(self, mem_str: str):
         self._processor = Intcode(mem_str, 'ASCII')
+        self._channel = AsciiChannel(self._processor)
         self._port_view = [[]]
         self._robot_at = (-1, -1)
         self._robot_point = '^'
@@ -12,39 +14,30 @@ class Ascii(object):
 
     def reset_core(self):
         self._processor.reset_core()
-
-    def _receiver(self, output, trace=False):
-        c = chr(output)
-        if self._vac_mode:
-            if 128 > output > 31:
-                print(c, end='')
-            elif output == 10:
-                print()
-            else:
-                print(f'[{output}]')
-        else:
-            if output == 10:
-                if len(self._port_view[-1]) > 0:
-                    self._port_view.append([])
-            else:
-                self._port_view[-1].append(c)
-                if c in ['^v<>']:
-                    self._robot_at = (len(self._port_view[-1]) - 1, len(self._port_view) - 1)
+        self._channel.values.clear()
+
+    def _read_view(self, text):
+        self._port_view = [list(line) for line in text.splitlines() if line]
+        for row, line in enumerate(self._port_view):
+            for c in '^v<>':
+                if c in line:
+                    self._robot_at = (line.index(c), row)
                     self._robot_point = c
 
-    def _sender(self):
-        return self._processor._input.pop()
-
     def run(self, inputs=None, trace=False, vac=False):
         if inputs is None:
             inputs = []
         if vac:
             self._vac_mode = True
             self._processor.core[0] = 2
-        self._processor.connect(self._receiver, self._sender)
-        self._processor.simulate(inputs, trace=trace, verbose=True)
-        if len(self._port_view[-1]) == 0:
-            self._port_view.remove(self._port_view[-1])
+        self._processor.feed(inputs)
+        text = self._channel.read()
+        if self._vac_mode:
+            print(text, end='')
+            for value in self._channel.values:
+                print(f'[{value}]')
+        else:
+            self._read_view(text)
 
     def get_cell(self, col, row):
         if col < 0 or row < 0 or row >= len(self._port_view) or col >= len(self._port_view[row]):
@@ -129,7 +122,7 @@ if __name__ == '__main__':
         'R,4,L,10,R,10',
         'n'
     ]
-    computer.run([ord(c) for c in '\n'.join(instructions) + '\n'], trace=False, vac=True)
+    computer.run('\n'.join(instructions) + '\n', trace=False, vac=True)
 
     '''
     Main:
@@ -1,11 +1,14 @@
 from itertools import product
 
 from intcode.intcode import Intcode
+from intcode.sweep import sweep
 
 
 class TractorBeamDrone(object):
     def __init__(self, mem_str: str):
+        self._mem_str = mem_str
         self._processor = Intcode(mem_str, 'Tractor Beam Drone')
+        self._ready = None
         self.x_offset = 0
         self.y_offset = 0
         self.block_size = (50, 50)
@@ -24,7 +27,12 @@ class TractorBeamDrone(object):
         return self._processor.output[0]
 
     def dispatch_bot(self, target_x, target_y, trace=False):
-        self.reset_core()
+        if self._ready is None:
+            # run the start-up code once, then launch every drone from there
+            self.reset_core()
+            next(self._processor.run())
+            self._ready = self._processor.snapshot()
+        self._processor.restore(self._ready)
         return self.run([target_x, target_y], trace=trace)
 
     def display(self):
@@ -61,6 +69,17 @@ class TractorBeamDrone(object):
                 end_col = min(block_size_x, max(influenced_at) + 2)
         return start_col, end_col
 
+    def sweep_block(self, x_offset=0, y_offset=0, block_size_x=50, block_size_y=50, workers=None):
+        """Fill the grid like scan_block, probing every cell, spread across processes."""
+        self.x_offset = x_offset
+        self.y_offset = y_offset
+        self.block_size = (block_size_x, block_size_y)
+        self.rest_grid()
+        cells = [(x + x_offset, y + y_offset) for y in range(block_size_y) for x in range(block_size_x)]
+        for result in sweep(self._mem_str, cells, workers=workers):
+            x, y = result.case.inputs
+            self.grid[x - x_offset][y - y_offset] = result.output[0]
+
     def zigzag_scan(self, start_x, start_y):
         # make sure that we're starting inside the 'snake'
         if self.dispatch_bot(start_x, start_y) != 1:
@@ -87,7 +106,7 @@ if __name__ == '__main__':
 
     computer = TractorBeamDrone(mem_code)
 
-    first, last = computer.scan_block(0, 0)
+    computer.sweep_block(0, 0)
     computer.display()
 
     print(f'Part 1: {computer.count_affected()}')
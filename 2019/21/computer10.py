@@ -1,12 +1,12 @@
 """
 The springdroid
 """
-from intcode.intcode import Intcode
+from intcode.compiler import CompiledIntcode
 
 
 class SpringDroid(object):
     def __init__(self, mem_str: str):
-        self._processor = Intcode(mem_str)
+        self._processor = CompiledIntcode(mem_str)
         self.prompt = ''
         self.result = None
         self.script = ''
@@ -1,9 +1,11 @@
-from intcode.intcode import Intcode
+from intcode.analysis import analyse
+from intcode.compiler import CompiledIntcode
 
 
 class ExploreDroid(object):
     def __init__(self, mem_code):
-        self._processor = Intcode(mem_code)
+        self._mem_code = mem_code
+        self._processor = CompiledIntcode(mem_code)
         self._cmd_buffer = ''
         self.exploration_commands = []
 
@@ -27,6 +29,62 @@ class ExploreDroid(object):
         self._processor.connect(self._receiver)
         self._processor.simulate()
 
+    def disassemble(self):
+        print('\n'.join(analyse(self._mem_code).listing()))
+
+
+EXPLORATION_COMMANDS = [
+    'south',
+    'south',
+    'south',
+    'take fixed point',
+    'south',
+    'take festive hat',
+    'west',
+    'west',
+    'take jam',
+    'south',
+    'take easter egg',
+    'north',
+    'east',
+    'east',
+    'north',
+    'west',
+    'take asterisk',
+    'east',
+    'north',
+    'west',
+    'north',
+    'north',
+    'take tambourine',
+    'south',
+    'south',
+    'east',
+    'north',
+    'west',
+    'south',
+    'take antenna',
+    'north',
+    'west',
+    'west',
+    'take space heater',
+    'west',
+
+    'drop jam',
+    'drop festive hat',
+    'drop asterisk',
+    'drop antenna',
+    # 'drop easter egg',
+    # 'drop space heater',
+    # 'drop tambourine',
+    # 'drop fixed point',
+    'west'
+    # A loud, robotic voice says "Analysis complete! You may proceed." and you enter the cockpit.
+    # Santa notices your small droid, looks puzzled for a moment,
+    # realizes what has happened, and radios your ship directly.
+    # "Oh, hello! You should be able to get in by typing 2147485856 on the keypad at the main airlock."
+]
+
 
 if __name__ == '__main__':
     with open('input') as f:
@@ -34,57 +92,7 @@ if __name__ == '__main__':
 
     droid = ExploreDroid(mem_dump)
 
-    droid.exploration_commands = [
-        'south',
-        'south',
-        'south',
-        'take fixed point',
-        'south',
-        'take festive hat',
-        'west',
-        'west',
-        'take jam',
-        'south',
-        'take easter egg',
-        'north',
-        'east',
-        'east',
-        'north',
-        'west',
-        'take asterisk',
-        'east',
-        'north',
-        'west',
-        'north',
-        'north',
-        'take tambourine',
-        'south',
-        'south',
-        'east',
-        'north',
-        'west',
-        'south',
-        'take antenna',
-        'north',
-        'west',
-        'west',
-        'take space heater',
-        'west',
-
-        'drop jam',
-        'drop festive hat',
-        'drop asterisk',
-        'drop antenna',
-        # 'drop easter egg',
-        # 'drop space heater',
-        # 'drop tambourine',
-        # 'drop fixed point',
-        'west'
-        # A loud, robotic voice says "Analysis complete! You may proceed." and you enter the cockpit.
-        # Santa notices your small droid, looks puzzled for a moment,
-        # realizes what has happened, and radios your ship directly.
-        # "Oh, hello! You should be able to get in by typing 2147485856 on the keypad at the main airlock."
-    ]
+    droid.exploration_commands = list(EXPLORATION_COMMANDS)
 
     droid.run()
     # Result: 2147485856
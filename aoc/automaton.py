@@ -0,0 +1,281 @@
+from dataclasses import dataclass
+from itertools import product
+from typing import Any, Callable, Iterable
+
+import numpy as np
+
+from aoc.grid import Grid
+
+Counter = Callable[[Any], np.ndarray]
+Rule = Callable[[np.ndarray, Counter], np.ndarray]
+
+
+@dataclass(frozen=True)
+class Neighbourhood:
+    """The cells that influence a cell in a cellular automaton.
+
+    Attributes:
+        offsets: tuple
+            the relative position of each neighbour, one tuple per neighbour
+            with one entry per board axis
+        weights: tuple
+            an optional weight per neighbour; neighbour counts are the sum of
+            the weights of matching neighbours. Defaults to a weight of 1 each.
+
+    Methods:
+        moore
+        von_neumann
+        hexagonal
+        reach
+    """
+
+    offsets: tuple[tuple[int, ...], ...]
+    weights: tuple[int, ...] | None = None
+
+    @classmethod
+    def moore(cls, dimensions: int = 2) -> "Neighbourhood":
+        """Every cell within one step on all axes: 8 in 2D, 26 in 3D, 80 in 4D."""
+        return cls(
+            tuple(
+                offset
+                for offset in product((-1, 0, 1), repeat=dimensions)
+                if any(offset)
+            )
+        )
+
+    @classmethod
+    def von_neumann(cls, dimensions: int = 2) -> "Neighbourhood":
+        """The orthogonally adjacent cells: 4 in 2D, 6 in 3D."""
+        return cls(
+            tuple(
+                tuple(step if axis == moved else 0 for axis in range(dimensions))
+                for moved in range(dimensions)
+                for step in (-1, 1)
+            )
+        )
+
+    @classmethod
+    def hexagonal(cls) -> "Neighbourhood":
+        """The six neighbours of a hexagonal tile in axial (q, r) coordinates."""
+        return cls(((1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, 1)))
+
+    @property
+    def reach(self) -> int:
+        """Return the furthest distance of any neighbour along a single axis."""
+        return max(abs(step) for offset in self.offsets for step in offset)
+
+
+def life_rule(birth: Iterable[int], survive: Iterable[int], alive: Any = 1, dead: Any = 0) -> Rule:
+    """Build a birth/survive rule such as Conway's Life (B3/S23).
+
+    A dead cell becomes alive when its count of live neighbours is in
+    `birth`; a live cell stays alive when its count is in `survive`.
+    """
+    birth = frozenset(birth)
+    survive = frozenset(survive)
+    size = max(birth | survive | {0}) + 1
+    birth_table = np.array([n in birth for n in range(size)] + [False])
+    survive_table = np.array([n in survive for n in range(size)] + [False])
+
+    def rule(board: np.ndarray, count: Counter) -> np.ndarray:
+        counts = np.minimum(count(alive), size)
+        is_alive = board == alive
+        born = ~is_alive & birth_table[counts]
+        stays = is_alive & survive_table[counts]
+        return np.where(born | stays, alive, dead).astype(board.dtype)
+
+    return rule
+
+
+def table_rule(table: Iterable[Any], alive: Any = 1, dead: Any = 0) -> Rule:
+    """Build a rule that looks the next state up by weighted neighbour count.
+
+    Combined with a neighbourhood whose weights are powers of two this
+    implements image-enhancement style automata, e.g. 2021/20.
+    """
+    table = np.array([alive if entry else dead for entry in table])
+
+    def rule(board: np.ndarray, count: Counter) -> np.ndarray:
+        return table[count(alive)].astype(board.dtype)
+
+    return rule
+
+
+class Automaton:
+    """A whole-board cellular automaton stepped with NumPy array operations.
+
+    The board is an n-dimensional array. Each generation the neighbour
+    counts for a state are produced by summing shifted views of the board,
+    one per neighbourhood offset, and the rule maps the board and counts to
+    the next board.
+
+    Attributes:
+        board: np.ndarray
+            the current state of every cell
+        generation: int
+            the number of generations stepped so far
+        background: Any
+            the state of every cell beyond the board when `infinite` is set
+
+    Methods:
+        from_grid
+        to_grid
+        count
+        step
+        population
+    """
+
+    def __init__(
+        self,
+        board: np.ndarray,
+        rule: Rule,
+        neighbourhood: Neighbourhood | None = None,
+        wrap: bool = False,
+        infinite: bool = False,
+        background: Any = 0,
+    ) -> None:
+        """Create an automaton.
+
+        Args:
+            board: The initial board.
+            rule: A callable taking the board and a counter, where
+                `counter(state)` gives the weighted number of neighbours in
+                that state for every cell, and returning the next board.
+            neighbourhood: The neighbourhood to count over. Defaults to the
+                Moore neighbourhood for the board's number of dimensions.
+            wrap: Whether the board is a torus. Defaults to False.
+            infinite: Whether the board grows to follow live cells over an
+                infinite background. Defaults to False, in which case cells
+                beyond the edge always count as `background`.
+            background: The state of cells beyond the board. Defaults to 0.
+        """
+        if wrap and infinite:
+            raise ValueError("A board cannot both wrap and be infinite")
+        self.board = np.asarray(board)
+        self.rule = rule
+        self.neighbourhood = neighbourhood or Neighbourhood.moore(self.board.ndim)
+        if len(self.neighbourhood.offsets[0]) != self.board.ndim:
+            raise ValueError(
+                f"Neighbourhood is {len(self.neighbourhood.offsets[0])}D but the board is {self.board.ndim}D"
+            )
+        self.wrap = wrap
+        self.infinite = infinite
+        self.background = background
+        self.generation = 0
+        self._weights = self.neighbourhood.weights or (1,) * len(self.neighbourhood.offsets)
+        # the narrowest accumulator that can hold the largest possible count
+        self._count_dtype = np.min_scalar_type(sum(self._weights))
+        self._padded = None
+        self._counts = {}
+
+    @classmethod
+    def from_grid(
+        cls,
+        grid: Grid,
+        rule: Rule,
+        states: dict[Any, Any] | None = None,
+        dimensions: int = 2,
+        **kwargs,
+    ) -> "Automaton":
+        """Create an automaton from a two-dimensional Grid.
+
+        The board is indexed as board[x, y], matching the grid coordinates,
+        with the grid's minimum corner at index (0, 0). Extra dimensions are
+        added with a size of one, so a 2D slice can seed a 3D or 4D board.
+
+        Args:
+            grid: The grid to copy.
+            rule: The automaton rule.
+            states: A mapping from grid values to board states. Defaults to
+                '#' as 1 and anything else as 0.
+            dimensions: The number of board dimensions. Defaults to 2.
+            **kwargs: Passed on to the constructor.
+        """
+        if states is None:
+            states = {"#": 1}
+        x0, y0 = grid.axis_min(0), grid.axis_min(1)
+        values = [
+            [states.get(grid[(x, y)], 0) for y in range(y0, y0 + grid.height())]
+            for x in range(x0, x0 + grid.width())
+        ]
+        board = np.array(values)
+        return cls(board.reshape(board.shape + (1,) * (dimensions - 2)), rule, **kwargs)
+
+    def to_grid(self, symbols: dict[Any, Any] | None = None) -> Grid:
+        """Return a two-dimensional board as a Grid.
+
+        Args:
+            symbols: A mapping from board states to grid values. Defaults to
+                1 as '#' and anything else as '.'.
+        """
+        if self.board.ndim != 2:
+            raise ValueError(f"Only 2D boards can become a Grid, not {self.board.ndim}D")
+        if symbols is None:
+            symbols = {1: "#"}
+        width, height = self.board.shape
+        return Grid.from_text(
+            [
+                "".join(symbols.get(self.board[x, y], ".") for x in range(width))
+                for y in range(height)
+            ]
+        )
+
+    def count(self, state: Any) -> np.ndarray:
+        """Return the weighted number of neighbours in `state` for every cell.
+
+        Only valid while a generation is being computed; counts are cached
+        per state for the duration of the step.
+        """
+        counts = self._counts.get(state)
+        if counts is None:
+            matches = self._padded == state
+            reach = self.neighbourhood.reach
+            shape = self.board.shape
+            counts = np.zeros(shape, dtype=self._count_dtype)
+            for offset, weight in zip(self.neighbourhood.offsets, self._weights):
+                view = matches[
+                    tuple(
+                        slice(reach + step, reach + step + size)
+                        for step, size in zip(offset, shape)
+                    )
+                ]
+                if weight == 1:
+                    counts += view
+                else:
+                    counts += view * counts.dtype.type(weight)
+            self._counts[state] = counts
+        return counts
+
+    def step(self, generations: int = 1) -> "Automaton":
+        """Advance the board by the given number of generations."""
+        reach = self.neighbourhood.reach
+        for _ in range(generations):
+            if self.infinite:
+                self.board = np.pad(self.board, reach, constant_values=self.background)
+            if self.wrap:
+                self._padded = np.pad(self.board, reach, mode="wrap")
+            else:
+                self._padded = np.pad(self.board, reach, constant_values=self.background)
+            self._counts = {}
+            next_board = self.rule(self.board, self.count)
+            if self.infinite:
+                self.background = self._next_background()
+            self.board = next_board
+            self.generation += 1
+        self._padded = None
+        self._counts = {}
+        return self
+
+    def _next_background(self) -> Any:
+        """Apply the rule to a lone cell surrounded entirely by background."""
+        cell = np.full((1,) * self.board.ndim, self.background, dtype=self.board.dtype)
+        total = sum(self._weights)
+
+        def count(state: Any) -> np.ndarray:
+            return np.full(cell.shape, total if state == self.background else 0)
+
+        return self.rule(cell, count).item()
+
+    def population(self, state: Any = 1) -> int:
+        """Return the number of cells on the board in `state`."""
+        return int(np.count_nonzero(self.board == state))
@@ -0,0 +1,101 @@
+import sys
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class FastForward(Generic[_T]):
+    """The outcome of fast-forwarding a simulation.
+
+    Attributes:
+        state: _T
+            the state after the requested number of steps
+        start: int | None
+            the step at which the cycle begins, or None if no repetition was
+            seen before the requested step
+        length: int | None
+            the number of steps in one pass of the cycle, or None
+        steps: int
+            the number of times `step` was actually called
+        memory: int
+            the peak bytes held in state fingerprints while searching
+    """
+
+    state: _T
+    start: Optional[int]
+    length: Optional[int]
+    steps: int
+    memory: int
+
+
+def fast_forward(
+    state: _T,
+    step: Callable[[_T], _T],
+    n: int,
+    key: Callable[[_T], Hashable] = lambda state: state,
+) -> FastForward[_T]:
+    """Return the state reached after `n` applications of `step`.
+
+    Repetition is found with Brent's algorithm, which keeps only two
+    fingerprints alive at any time however long the tail or cycle is. Once
+    the cycle start and length are known, the remaining steps are reduced
+    modulo the cycle length.
+
+    `step` must return a new state rather than modify its argument, as the
+    search replays the simulation from `state` to locate the cycle start.
+
+    Args:
+        state: The initial state.
+        step: Function returning the state that follows its argument.
+        n: The number of steps to take.
+        key: Function returning a compact fingerprint of a state, such as
+            Grid.fingerprint or an array's tobytes. States are equal when
+            their fingerprints are. Defaults to the state itself.
+
+    Returns:
+        A FastForward holding the final state and the cycle found.
+    """
+    if n <= 0:
+        return FastForward(state, None, None, 0, 0)
+
+    # Brent: the tortoise waits at each power of two while the hare runs on
+    power = length = 1
+    tortoise_key = key(state)
+    hare = step(state)
+    hare_key = key(hare)
+    steps = 1
+    memory = sys.getsizeof(tortoise_key) + sys.getsizeof(hare_key)
+    while hare_key != tortoise_key:
+        if steps == n:
+            return FastForward(hare, None, None, steps, memory)
+        if power == length:
+            tortoise_key = hare_key
+            power *= 2
+            length = 0
+        hare = step(hare)
+        hare_key = key(hare)
+        steps += 1
+        length += 1
+        memory = max(memory, sys.getsizeof(tortoise_key) + sys.getsizeof(hare_key))
+
+    # replay with the hare a cycle ahead; they first meet at the cycle start
+    tortoise = hare = state
+    for _ in range(length):
+        hare = step(hare)
+    steps += length
+    start = 0
+    tortoise_key, hare_key = key(tortoise), key(hare)
+    while tortoise_key != hare_key:
+        tortoise = step(tortoise)
+        hare = step(hare)
+        tortoise_key, hare_key = key(tortoise), key(hare)
+        steps += 2
+        start += 1
+
+    for _ in range((n - start) % length):
+        tortoise = step(tortoise)
+        steps += 1
+    return FastForward(tortoise, start, length, steps, memory)
+
@@ -1,4 +1,283 @@
-from typing import Any, Generator, Iterator
+from array import array
+from collections.abc import ItemsView, Iterable, MutableMapping, ValuesView
+from typing import Any, Generator, Hashable, Iterator
+
+_MISSING = object()
+_CARDINAL_OFFSETS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+_DIAGONAL_OFFSETS = (
+    (-1, -1),
+    (-1, 0),
+    (-1, 1),
+    (0, -1),
+    (0, 1),
+    (1, -1),
+    (1, 0),
+    (1, 1),
+)
+
+
+class DenseStore(MutableMapping):
+    """
+    A row-major, flat-list backing store for rectangular two-dimensional
+    grids. The store behaves like the dictionary used by the sparse grid,
+    mapping (x, y) tuples to values, but keeps the values in a single list
+    indexed by y * width + x so no per-cell tuple keys are built.
+
+    Cells outside 0 <= x < width and 0 <= y < height cannot be stored; the
+    owning Grid falls back to a sparse dictionary when such a write occurs.
+    """
+
+    __slots__ = ("cells", "width", "height", "size", "_adjacency")
+
+    def __init__(self, width: int, height: int, cells: list | None = None) -> None:
+        """
+        Initializes a dense store of the given dimensions, optionally
+        adopting an existing flat list of cell values.
+
+        Args:
+            width: The number of columns in the store.
+            height: The number of rows in the store.
+            cells: An optional row-major list of width * height values.
+            Defaults to an entirely unset store.
+        """
+        if cells is None:
+            cells = [_MISSING] * (width * height)
+        elif len(cells) != width * height:
+            raise ValueError(
+                f"Expected {width * height} cells for {width}x{height}, got {len(cells)}"
+            )
+        self.cells = cells
+        self.width = width
+        self.height = height
+        self.size = sum(1 for cell in cells if cell is not _MISSING)
+        self._adjacency = {}
+
+    def index(self, key) -> int:
+        """
+        Converts an (x, y) key into its offset in the flat cell list.
+
+        Args:
+            key: A two-dimensional coordinate tuple.
+
+        Returns:
+            int: The offset of the coordinate, or -1 if it lies outside the
+            store.
+        """
+        try:
+            x, y = key
+        except (TypeError, ValueError):
+            return -1
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return -1
+
+    def coords(self, index: int) -> tuple[int, int]:
+        """
+        Converts an offset in the flat cell list back into an (x, y) key.
+
+        Args:
+            index: The offset to convert.
+
+        Returns:
+            tuple: The coordinate stored at the given offset.
+        """
+        y, x = divmod(index, self.width)
+        return x, y
+
+    def get(self, key, default=None) -> Any:
+        try:
+            x, y = key
+        except (TypeError, ValueError):
+            return default
+        if 0 <= x < self.width and 0 <= y < self.height:
+            value = self.cells[y * self.width + x]
+            return default if value is _MISSING else value
+        return default
+
+    def __getitem__(self, key) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        index = self.index(key)
+        if index < 0:
+            raise KeyError(f"{key!r} lies outside the {self.width}x{self.height} store")
+        if self.cells[index] is _MISSING:
+            self.size += 1
+            self.cells[index] = value
+            self._update_adjacency(index)
+        else:
+            self.cells[index] = value
+
+    def __delitem__(self, key) -> None:
+        index = self.index(key)
+        if index < 0 or self.cells[index] is _MISSING:
+            raise KeyError(key)
+        self.cells[index] = _MISSING
+        self.size -= 1
+        self._update_adjacency(index)
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        width = self.width
+        for index, value in enumerate(self.cells):
+            if value is not _MISSING:
+                y, x = divmod(index, width)
+                yield x, y
+
+    def __len__(self) -> int:
+        return self.size
+
+    def items(self) -> ItemsView:
+        return _DenseItemsView(self)
+
+    def values(self) -> ValuesView:
+        return _DenseValuesView(self)
+
+    def is_full(self) -> bool:
+        """
+        Reports whether every cell of the store holds a value.
+
+        Returns:
+            bool: True if no cell is unset, False otherwise.
+        """
+        return self.size == len(self.cells)
+
+    def copy(self) -> "DenseStore":
+        """
+        Creates an independent copy of the store.
+
+        Returns:
+            DenseStore: A new store with the same dimensions and values.
+        """
+        ret = DenseStore(self.width, self.height, self.cells[:])
+        ret._adjacency = {key: table[:] for key, table in self._adjacency.items()}
+        return ret
+
+    def _neighbor_offsets(self, index: int, offsets) -> tuple[int, ...]:
+        width, height, cells = self.width, self.height, self.cells
+        y, x = divmod(index, width)
+        return tuple(
+            (y + oy) * width + x + ox
+            for ox, oy in offsets
+            if 0 <= x + ox < width
+            and 0 <= y + oy < height
+            and cells[(y + oy) * width + x + ox] is not _MISSING
+        )
+
+    def _update_adjacency(self, index: int) -> None:
+        """
+        Refreshes the cached neighbour table entries of the cells around
+        `index` after that cell was set for the first time or deleted, so a
+        run of edits costs a few entries each rather than a rebuild.
+
+        Args:
+            index: The offset of the cell that changed.
+        """
+        if not self._adjacency:
+            return
+        width, height = self.width, self.height
+        deleted = self.cells[index] is _MISSING
+        y, x = divmod(index, width)
+        for diagonals in (False, True):
+            table = self._adjacency.get(diagonals)
+            if table is None:
+                continue
+            offsets = _DIAGONAL_OFFSETS if diagonals else _CARDINAL_OFFSETS
+            coords = self._adjacency.get(("coords", diagonals))
+            for ox, oy in offsets:
+                if 0 <= x + ox < width and 0 <= y + oy < height:
+                    neighbor = (y + oy) * width + x + ox
+                    if deleted:
+                        # drop the cell from the entry, keeping the order
+                        row = table[neighbor]
+                        at = row.index(index)
+                        table[neighbor] = row[:at] + row[at + 1:]
+                        if coords is not None:
+                            row = coords[neighbor]
+                            coords[neighbor] = row[:at] + row[at + 1:]
+                    else:
+                        table[neighbor] = self._neighbor_offsets(neighbor, offsets)
+                        if coords is not None:
+                            coords[neighbor] = tuple(self.coords(n) for n in table[neighbor])
+
+    def adjacency(self, diagonals=False) -> list[tuple[int, ...]]:
+        """
+        Returns the neighbour table for the store, building it on first use.
+        Entry i holds the offsets of the set cells adjacent to offset i, in
+        the same order as Grid.neighbors. Setting a cell for the first time
+        or deleting one updates only the entries of the cells around it.
+
+        Args:
+            diagonals: Whether diagonal neighbours are included. Defaults to
+            False.
+
+        Returns:
+            list: One tuple of neighbour offsets per cell.
+        """
+        table = self._adjacency.get(diagonals)
+        if table is None:
+            offsets = _DIAGONAL_OFFSETS if diagonals else _CARDINAL_OFFSETS
+            table = [self._neighbor_offsets(index, offsets) for index in range(len(self.cells))]
+            self._adjacency[diagonals] = table
+        return table
+
+    def adjacency_coords(self, diagonals=False) -> list[tuple[tuple[int, int], ...]]:
+        """
+        Returns the neighbour table for the store with each neighbour given
+        as an (x, y) tuple rather than an offset. It is built from, and
+        updated alongside, the offset table returned by adjacency.
+
+        Args:
+            diagonals: Whether diagonal neighbours are included. Defaults to
+            False.
+
+        Returns:
+            list: One tuple of neighbour coordinates per cell.
+        """
+        key = ("coords", diagonals)
+        table = self._adjacency.get(key)
+        if table is None:
+            width = self.width
+            points = [(x, y) for y in range(self.height) for x in range(width)]
+            table = [
+                tuple(points[neighbor] for neighbor in neighbors)
+                for neighbors in self.adjacency(diagonals)
+            ]
+            self._adjacency[key] = table
+        return table
+
+    def to_dict(self) -> dict:
+        """
+        Converts the store into the equivalent sparse dictionary.
+
+        Returns:
+            dict: A mapping of (x, y) tuples to values for every set cell.
+        """
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.width}x{self.height}, {self.size} set)"
+
+
+class _DenseItemsView(ItemsView):
+    def __iter__(self):
+        width = self._mapping.width
+        for index, value in enumerate(self._mapping.cells):
+            if value is not _MISSING:
+                y, x = divmod(index, width)
+                yield (x, y), value
+
+
+class _DenseValuesView(ValuesView):
+    def __iter__(self):
+        for value in self._mapping.cells:
+            if value is not _MISSING:
+                yield value
 
 
 class Grid:
@@ -8,6 +287,11 @@ class Grid:
     default value. The grid supports multi-dimensional coordinates and
     provides convenient methods for iterating over, accessing, and modifying
     grid values.
+
+    Grids built from rectangular text are held in a DenseStore, a flat
+    row-major list, rather than a dictionary of coordinate tuples. The grid
+    switches to sparse dictionary storage as soon as a value is written
+    outside the dense bounds, so callers see the same behaviour either way.
     """
 
     def __init__(self, default=0) -> None:
@@ -36,10 +320,31 @@ class Grid:
         ret = Grid()
         ret.grid = self.grid.copy()
         ret.default = self.default
+        ret._ranges = self._ranges.copy()
         return ret
 
+    @property
+    def is_dense(self) -> bool:
+        """
+        Reports whether the grid is currently held in dense storage.
+
+        Returns:
+            bool: True if the grid uses a DenseStore, False if it uses a
+            sparse dictionary.
+        """
+        return isinstance(self.grid, DenseStore)
+
+    def to_sparse(self) -> None:
+        """
+        Converts the grid to sparse dictionary storage. The method is called
+        automatically when a value is written outside the dense bounds and
+        does nothing if the grid is already sparse.
+        """
+        if isinstance(self.grid, DenseStore):
+            self.grid = self.grid.to_dict()
+
     @staticmethod
-    def from_text(values) -> "Grid":
+    def from_text(values, dense=True) -> "Grid":
         """
         Creates a Grid instance from text input, supporting single strings or
         multi-line text. The method populates the grid by converting input
@@ -48,6 +353,8 @@ class Grid:
         Args:
             values: Input text to convert into a grid, which can be a single
             string or a list of strings.
+            dense: Whether rectangular input should be stored densely.
+            Ragged input always uses sparse storage. Defaults to True.
 
         Returns:
             Grid: A new grid instance populated with characters from the input
@@ -56,6 +363,15 @@ class Grid:
         grid = Grid()
         if isinstance(values, str):
             values = values.split("\n") if "\n" in values else [values]
+        else:
+            values = list(values)
+        width = len(values[0]) if values else 0
+        if dense and width and all(len(row) == width for row in values):
+            cells = []
+            for row in values:
+                cells.extend(row)
+            grid.grid = DenseStore(width, len(values), cells)
+            return grid
         for y, row in enumerate(values):
             for x, cur in enumerate(row):
                 grid.set(cur, (x, y))
@@ -75,6 +391,15 @@ class Grid:
             The value at the specified grid coordinate, or the default value
             if the coordinate is unset.
         """
+        store = self.grid
+        if store.__class__ is DenseStore and key.__class__ is tuple and len(key) == 2:
+            x, y = key
+            width = store.width
+            if 0 <= x < width and 0 <= y < store.height:
+                value = store.cells[y * width + x]
+                if value is not _MISSING:
+                    return value
+            return self.default
         if isinstance(key, tuple):
             return self.grid.get(tuple(key), self.default)
         else:
@@ -84,34 +409,37 @@ class Grid:
         """
         Enables dictionary-like assignment of values to grid coordinates with
         flexible key handling. The method supports setting grid values using
-        single or multi-dimensional coordinate keys while resetting the grid's
-        range cache.
+        single or multi-dimensional coordinate keys while keeping the grid's
+        range cache up to date.
 
         Args:
             key: A coordinate tuple or single value representing the grid
             location to set.
             value: The value to be stored at the specified grid coordinate.
         """
-        self._ranges = {}
-        if isinstance(key, tuple):
-            self.grid[tuple(key)] = value
-        else:
-            self.grid[(key,)] = value
+        self.set(value, tuple(key) if isinstance(key, tuple) else key)
 
     def __delitem__(self, key) -> None:
         """
         Enables dictionary-like deletion of values from grid coordinates with
         flexible key handling. The method supports removing grid values using
-        single or multi-dimensional coordinate keys.
+        single or multi-dimensional coordinate keys. Cached axis ranges are
+        only dropped when the deleted coordinate lies on their boundary.
 
         Args:
             key: A coordinate tuple or single value representing the grid
             location to delete.
         """
-        if isinstance(key, tuple):
-            del self.grid[key]
-        else:
-            del self.grid[(key,)]
+        if not isinstance(key, tuple):
+            key = (key,)
+        del self.grid[key]
+        ranges = self._ranges
+        for axis in [
+            axis
+            for axis, (low, high) in ranges.items()
+            if axis < len(key) and key[axis] in (low, high)
+        ]:
+            del ranges[axis]
 
     def __iter__(self) -> Iterator:
         """
@@ -163,7 +491,8 @@ class Grid:
         """
         Sets the value at specified grid coordinates, updating the grid with
         the new value. The method supports flexible assignment of values to
-        grid locations with a variable number of coordinate arguments.
+        grid locations with a variable number of coordinate arguments. Any
+        cached axis ranges are widened in place to cover the new coordinate.
 
         Args:
             value: The value to store at the specified grid coordinates.
@@ -172,17 +501,37 @@ class Grid:
         Returns:
             None
         """
-        self._ranges = {}
-        if isinstance(coords, tuple):
-            self.grid[coords] = value
-        else:
-            self.grid[(coords,)] = value
+        if not isinstance(coords, tuple):
+            coords = (coords,)
+        ranges = self._ranges
+        if ranges:
+            for axis, (low, high) in ranges.items():
+                if axis < len(coords):
+                    coord = coords[axis]
+                    if coord < low:
+                        ranges[axis] = coord, high
+                    elif coord > high:
+                        ranges[axis] = low, coord
+        store = self.grid
+        if isinstance(store, DenseStore):
+            index = store.index(coords)
+            if index >= 0:
+                if store.cells[index] is _MISSING:
+                    store.size += 1
+                    store.cells[index] = value
+                    store._update_adjacency(index)
+                else:
+                    store.cells[index] = value
+                return
+            self.to_sparse()
+        self.grid[coords] = value
 
     def axis_min(self, axis) -> Any:
         """
         Calculates and caches the minimum value for a specified grid axis. The
         method efficiently computes the minimum coordinate value along a given
-        axis, storing the result for future use.
+        axis, storing the result for future use. Later writes keep the cached
+        value current, so repeated calls are O(1).
 
         Args:
             axis: The index of the axis to calculate the minimum value for.
@@ -191,16 +540,15 @@ class Grid:
             The minimum coordinate value along the specified axis.
         """
         if self._ranges.get(axis, None) is None:
-            self._ranges[axis] = min(x[axis] for x in self.grid), max(
-                x[axis] for x in self.grid
-            )
+            self._ranges[axis] = self._axis_range(axis)
         return self._ranges[axis][0]
 
     def axis_max(self, axis) -> Any:
         """
         Calculates and caches the maximum value for a specified grid axis. The
         method efficiently computes the maximum coordinate value along a given
-        axis, storing the result for future use.
+        axis, storing the result for future use. Later writes keep the cached
+        value current, so repeated calls are O(1).
 
         Args:
             axis: The index of the axis to calculate the maximum value for.
@@ -209,11 +557,26 @@ class Grid:
             The maximum coordinate value along the specified axis.
         """
         if self._ranges.get(axis, None) is None:
-            self._ranges[axis] = min(x[axis] for x in self.grid), max(
-                x[axis] for x in self.grid
-            )
+            self._ranges[axis] = self._axis_range(axis)
         return self._ranges[axis][1]
 
+    def _axis_range(self, axis) -> tuple[Any, Any]:
+        """
+        Computes the minimum and maximum coordinate along an axis. A full
+        dense grid answers directly from its dimensions; otherwise every
+        stored coordinate is scanned.
+
+        Args:
+            axis: The index of the axis to calculate the range for.
+
+        Returns:
+            tuple: The minimum and maximum coordinate values along the axis.
+        """
+        store = self.grid
+        if isinstance(store, DenseStore) and store.is_full() and axis in (0, 1):
+            return 0, (store.width, store.height)[axis] - 1
+        return min(x[axis] for x in store), max(x[axis] for x in store)
+
     def axis_size(self, axis) -> Any:
         """
         Calculates the size of the grid along a specified axis by determining
@@ -269,25 +632,83 @@ class Grid:
             tuple: The coordinates of each neighbor of the specified location.
         """
         x, y = args[0] if isinstance(args[0], tuple) else args
-        if diagonals:
-            offsets = (
-                (-1, -1),
-                (-1, 0),
-                (-1, 1),
-                (0, -1),
-                (0, 1),
-                (1, -1),
-                (1, 0),
-                (1, 1),
-            )
-        else:
-            offsets = ((0, -1), (1, 0), (0, 1), (-1, 0))
-        for ox, oy in offsets:
+        store = self.grid
+        if valid_only and isinstance(store, DenseStore):
+            index = store.index((x, y))
+            if index >= 0:
+                yield from store.adjacency_coords(diagonals)[index]
+                return
+        for ox, oy in _DIAGONAL_OFFSETS if diagonals else _CARDINAL_OFFSETS:
             ox = ox + x
             oy = oy + y
-            if not valid_only or (ox, oy) in self.grid:
+            if not valid_only or (ox, oy) in store:
                 yield ox, oy
 
+    def index_of(self, coords) -> int:
+        """
+        Converts coordinates into their offset in dense storage, the form
+        used by neighbors_many.
+
+        Args:
+            coords: A tuple representing the grid location.
+
+        Returns:
+            int: The offset of the coordinates.
+
+        Raises:
+            TypeError: If the grid is not held in dense storage.
+            KeyError: If the coordinates lie outside the dense bounds.
+        """
+        index = self._dense_store("index_of").index(coords)
+        if index < 0:
+            raise KeyError(coords)
+        return index
+
+    def coords_of(self, index) -> tuple[int, int]:
+        """
+        Converts an offset in dense storage back into grid coordinates.
+
+        Args:
+            index: The offset to convert.
+
+        Returns:
+            tuple: The coordinates held at that offset.
+
+        Raises:
+            TypeError: If the grid is not held in dense storage.
+        """
+        return self._dense_store("coords_of").coords(index)
+
+    def neighbors_many(self, cells: Iterable[int], diagonals=False) -> array:
+        """
+        Expands a batch of cells to their valid neighbours in one call using
+        the precomputed adjacency table. Cells and neighbours are dense
+        storage offsets (see index_of), so a BFS frontier can be advanced a
+        whole layer at a time.
+
+        Args:
+            cells: The offsets of the cells to expand.
+            diagonals: Whether diagonal neighbours are included. Defaults to
+            False.
+
+        Returns:
+            array: The neighbour offsets of every cell, concatenated in input
+            order. A neighbour shared by several cells appears once per cell.
+
+        Raises:
+            TypeError: If the grid is not held in dense storage.
+        """
+        table = self._dense_store("neighbors_many").adjacency(diagonals)
+        result = array("q")
+        for index in cells:
+            result.extend(table[index])
+        return result
+
+    def _dense_store(self, operation) -> DenseStore:
+        if not isinstance(self.grid, DenseStore):
+            raise TypeError(f"{operation} requires a grid held in dense storage")
+        return self.grid
+
     def next_location(self, location, wrap=False) -> None | tuple[Any, Any]:
         """
         Returns the next location in the grid, or None if there is no next
@@ -333,6 +754,28 @@ class Grid:
         """
         return coords in self.grid
 
+    def fingerprint(self) -> Hashable:
+        """
+        Returns a compact, hashable snapshot of the grid contents, suitable
+        as a key for cycle detection (see aoc.cycles.fast_forward). Two grids
+        with the same storage mode, coordinates and values give equal
+        fingerprints; a dense grid and a sparse grid never do, whatever
+        they hold. A grid only ever changes from dense to sparse, so a cycle
+        that starts before such a change is still found after it, a little
+        later than its true start.
+
+        Returns:
+            Hashable: A string for dense grids of text, otherwise a tuple or
+            frozenset of the stored values.
+        """
+        store = self.grid
+        if isinstance(store, DenseStore):
+            try:
+                return f"{store.width}:" + "\0".join(store.cells)
+            except TypeError:
+                return store.width, tuple(store.cells)
+        return frozenset(store.items())
+
     def transpose(self):
         """
         Transposes the grid, swapping the x and y axes.
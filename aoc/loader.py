@@ -1,31 +1,89 @@
 import os
 import pickle
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from time import perf_counter
 
-from requests import get
+from requests import Session
+
+from aoc.memo import format_cache_stats
+
+# AdventOfCode directories already located, shared by every loader in the process
+_base_paths = []
+
+# puzzle input text by (year, day)
+_texts = {}
+
+_session = None
+
+# puzzles unlock at midnight US Eastern time, five hours behind UTC in December
+_UNLOCK_ZONE = timezone(timedelta(hours=-5))
+
+
+def _find_base_path(start):
+    """Return the AdventOfCode directory containing `start`, walking up only on the first call."""
+    for base_path in _base_paths:
+        if start == base_path or base_path in start.parents:
+            return base_path
+    base_path = start
+    while base_path.parts[-1].casefold() != 'AdventOfCode'.casefold():
+        base_path = base_path.parent
+        if len(base_path.parts) == 1:
+            raise EnvironmentError('Cannot locate directory AdventOfCode')
+    _base_paths.append(base_path)
+    return base_path
+
+
+def _get_session():
+    """Return the process-wide HTTP session, so every download reuses its pooled connections."""
+    global _session
+    if _session is None:
+        _session = Session()
+    return _session
+
+
+def clear_input_cache():
+    """Forget every puzzle input read in this process, so the next request reads it again."""
+    _texts.clear()
 
 
 class LoaderLib:
     """Advent of Code loader library.
 
+    Puzzle inputs are kept in `<AdventOfCode>/<year>/<day>/input.txt`. A
+    missing input is downloaded from the website, or copied from a local
+    mirror laid out like the website (`<mirror>/<year>/day/<day>/input`),
+    or in offline mode is an error. Inputs read once are kept in memory
+    for the rest of the process, so a driver running every day of a year
+    reads each file once.
+
     Attributes:
         aoc_year (int): The year of Advent of Code to work with.
+        mirror (Path | None): The local mirror used instead of the website.
+        offline (bool): Whether the network is never used.
 
     Methods:
         print_solution
-        get_puzzle_input
+        print_cache_stats
+        get_aoc_input
+        prefetch
         cache_data
         retrieve_data
     """
 
     _aoc_input_url = 'https://adventofcode.com/{year}/day/{day}/input'
 
-    def __init__(self, aoc_year):
+    def __init__(self, aoc_year, mirror=None, offline=None):
         """Initialise helper library.
 
         Parameters:
             aoc_year (int): The year of Advent of Code to work with.
+            mirror (str or Path): A local directory standing in for the
+                website. Defaults to the AOC_MIRROR environment variable.
+                A mirror implies offline.
+            offline (bool): Never use the network; inputs must be on disk
+                or in the mirror. Defaults to whether the AOC_OFFLINE
+                environment variable is set.
         """
 
         self._timer_start = perf_counter()
@@ -40,26 +98,65 @@ class LoaderLib:
 
         self._aoc_path = user_profile / 'aoc'
 
-        base_path = Path().cwd()
-        while base_path.parts[-1].casefold() != 'AdventOfCode'.casefold():
-            base_path = base_path.parent
-            if len(base_path.parts) == 1:
-                raise EnvironmentError('Cannot locate directory AdventOfCode')
+        self._base_path = _find_base_path(Path().cwd())
+
+        mirror = mirror or os.environ.get('AOC_MIRROR')
+        self.mirror = Path(mirror) if mirror else None
+        if offline is None:
+            offline = bool(os.environ.get('AOC_OFFLINE'))
+        self.offline = offline or self.mirror is not None
+
+        self._aoc_cookie = None
+
+    def _cookie(self):
+        """Read the session cookie, needed only once an input has to be downloaded."""
+        if self._aoc_cookie is None:
+            aoc_cookie_filename = (self._aoc_path / 'aoc.cookie')
+            if not aoc_cookie_filename.exists():
+                raise EnvironmentError(f"No cookie file found ({aoc_cookie_filename})")
+            aoc_cookie_value = aoc_cookie_filename.read_text()
+            self._aoc_cookie = dict(session=aoc_cookie_value.strip('\n'))
+        return self._aoc_cookie
 
-        self._base_path = base_path
+    def _input_path(self, day):
+        return self._base_path / str(self.aoc_year) / f'{day:02d}' / 'input.txt'
 
-        aoc_cookie_filename = (self._aoc_path / 'aoc.cookie')
-        if not aoc_cookie_filename.exists():
-            raise EnvironmentError(f"No cookie file found ({aoc_cookie_filename})")
-        aoc_cookie_value = aoc_cookie_filename.read_text()
-        self._aoc_cookie = dict(session=aoc_cookie_value.strip('\n'))
+    def _unlocked(self, day):
+        return datetime.now(_UNLOCK_ZONE) >= datetime(self.aoc_year, 12, day, tzinfo=_UNLOCK_ZONE)
+
+    def _fetch(self, day):
+        """Return the puzzle input for `day` from the mirror or the website.
+
+        Returns:
+            The input, or None if offline and the mirror does not have it.
+        Raises:
+            AssertionError: If the website refuses the request.
+        """
+        if self.mirror is not None:
+            mirror_filename = self.mirror / str(self.aoc_year) / 'day' / str(day) / 'input'
+            return mirror_filename.read_text().rstrip('\n') if mirror_filename.exists() else None
+        if self.offline:
+            return None
+        response = _get_session().get(
+            self._aoc_input_url.format(year=self.aoc_year, day=day),
+            cookies=self._cookie())
+        if response.status_code != 200:
+            raise AssertionError(f'Unable to obtain puzzle input! ({response.status_code} {response.reason})')
+        return response.text.rstrip('\n')
+
+    def _store(self, day, puzzle_input):
+        cache_filename = self._input_path(day)
+        cache_filename.parent.mkdir(parents=True, exist_ok=True)
+        cache_filename.write_text(puzzle_input)
 
     def get_aoc_input(self, day, transform_function=lambda x: x):
         """Get puzzle input from the AOC website.
 
         Apply an optional transform function to it before returning.
 
-        Cache the puzzle input locally for next time.
+        Cache the puzzle input locally for next time, and its text in
+        memory for the rest of the process. The transform is applied afresh
+        on every call.
 
         Args:
             day (int): The day of the puzzle.
@@ -68,24 +165,49 @@ class LoaderLib:
         Returns:
             The puzzle input, transformed by transform_function.
         """
-        cache_filename = self._base_path / str(self.aoc_year) / f'{day:02d}' / 'input.txt'
-        puzzle_input = cache_filename.read_text() if cache_filename.exists() else None
-
+        puzzle_input = _texts.get((self.aoc_year, day))
         if puzzle_input is None:
-            response = get(
-                self._aoc_input_url.format(year=self.aoc_year, day=day),
-                cookies=self._aoc_cookie)
+            cache_filename = self._input_path(day)
+            if cache_filename.exists():
+                puzzle_input = cache_filename.read_text()
+            else:
+                puzzle_input = self._fetch(day)
+                if puzzle_input is None:
+                    raise EnvironmentError(f'No puzzle input for {self.aoc_year} day {day} offline')
+                self._store(day, puzzle_input)
+            _texts[self.aoc_year, day] = puzzle_input
 
-            # Adding debugging statements
-            if response.status_code != 200:
-                print(f"Failed to fetch AoC input: {response.status_code} - {response.text}")
-                raise AssertionError('Unable to obtain puzzle input!')
+        return transform_function(puzzle_input)
 
-            puzzle_input = response.text.rstrip('\n')
-            cache_filename.parent.mkdir(parents=True, exist_ok=True)
-            cache_filename.write_text(puzzle_input)
+    def prefetch(self, days=range(1, 26)):
+        """Download every missing input for the year over one pooled session.
 
-        return transform_function(puzzle_input)
+        Inputs already on disk are found with a single scan of the year's
+        directory. Days not yet unlocked are not requested, and days the
+        website or mirror cannot supply are skipped.
+
+        Args:
+            days: The days to fetch. Defaults to all 25.
+        Returns:
+            The days whose input was newly stored.
+        """
+        year_path = self._base_path / str(self.aoc_year)
+        present = set()
+        if year_path.is_dir():
+            present = {entry.name for entry in year_path.iterdir() if (entry / 'input.txt').is_file()}
+        fetched = []
+        for day in days:
+            if f'{day:02d}' in present or not self._unlocked(day):
+                continue
+            try:
+                puzzle_input = self._fetch(day)
+            except AssertionError:
+                continue
+            if puzzle_input is not None:
+                self._store(day, puzzle_input)
+                _texts[self.aoc_year, day] = puzzle_input
+                fetched.append(day)
+        return fetched
 
     def print_solution(self, part, *args, **kwargs):
         """Print the puzzle solution with timer.
@@ -105,6 +227,13 @@ class LoaderLib:
 
         self._timer_last = timer_now
 
+    def print_cache_stats(self):
+        """Print hit/miss statistics for every aoc.memo memoised function.
+
+        Call after the last print_solution to see which caches paid off.
+        """
+        self.print_solution('cache', f'\n{format_cache_stats()}')
+
     def cache_data(self, day, key, obj):
         """Store some data in a cache file for later"""
         cache_filename = self._aoc_path / f'cache_{self.aoc_year}_{day:02d}_{key}.txt'
@@ -0,0 +1,169 @@
+import sys
+from collections import OrderedDict, namedtuple
+from functools import update_wrapper
+from types import MethodType
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+from weakref import WeakSet
+
+CacheInfo = namedtuple("CacheInfo", "hits misses evictions currsize maxsize nbytes")
+
+_KWARGS_MARK = object()
+_registry: "WeakSet[_Memo]" = WeakSet()
+
+
+def to_bitmask(items: Iterable[Any], index: Optional[Dict[Any, int]] = None) -> int:
+    """Pack a collection of small ints (or items numbered by `index`) into a bitmask.
+
+    A frozenset of visited nodes makes a large, slow-to-hash cache key; the
+    equivalent int is a fraction of the size and hashes in constant time.
+    """
+    mask = 0
+    if index is None:
+        for item in items:
+            mask |= 1 << item
+    else:
+        for item in items:
+            mask |= 1 << index[item]
+    return mask
+
+
+def _default_key(args: tuple, kwargs: dict) -> Hashable:
+    if kwargs:
+        return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+    return args
+
+
+class _Memo:
+    """A memoised function with bounded storage and usage counters"""
+
+    def __init__(
+        self,
+        func: Callable,
+        maxsize: Optional[int],
+        maxbytes: Optional[int],
+        key: Optional[Callable[..., Hashable]],
+        name: Optional[str],
+    ) -> None:
+        self.func = func
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.key = key
+        self.name = name or getattr(func, "__qualname__", repr(func))
+        self.hits = self.misses = self.evictions = self.nbytes = 0
+        self.cache: Dict[Hashable, Any] = OrderedDict() if self._bounded else {}
+        update_wrapper(self, func)
+
+    @property
+    def _bounded(self) -> bool:
+        return self.maxsize is not None or self.maxbytes is not None
+
+    def __call__(self, *args, **kwargs) -> Any:
+        cache_key = self.key(*args, **kwargs) if self.key else _default_key(args, kwargs)
+        cache = self.cache
+        try:
+            value = cache[cache_key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            if self._bounded:
+                cache.move_to_end(cache_key)
+            return value
+        self.misses += 1
+        value = self.func(*args, **kwargs)
+        if cache_key in cache:
+            # a recursive call already stored this key
+            return value
+        cache[cache_key] = value
+        if self._bounded:
+            if self.maxbytes is not None:
+                self.nbytes += _entry_size(cache_key, value)
+            self._evict()
+        return value
+
+    def _evict(self) -> None:
+        cache = self.cache
+        while cache and (
+            (self.maxsize is not None and len(cache) > self.maxsize)
+            or (self.maxbytes is not None and self.nbytes > self.maxbytes)
+        ):
+            old_key, old_value = cache.popitem(last=False)
+            if self.maxbytes is not None:
+                self.nbytes -= _entry_size(old_key, old_value)
+            self.evictions += 1
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return MethodType(self, instance)
+
+    @property
+    def qualified_name(self) -> str:
+        """The reported name, prefixed with the module defining the function"""
+        return f"{self.__module__}.{self.name}"
+
+    def cache_info(self) -> CacheInfo:
+        """Return the hit, miss and eviction counts and the current size"""
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, len(self.cache), self.maxsize, self.nbytes
+        )
+
+    def cache_clear(self) -> None:
+        """Empty the cache and reset its counters"""
+        self.cache.clear()
+        self.hits = self.misses = self.evictions = self.nbytes = 0
+
+
+def _entry_size(key: Hashable, value: Any) -> int:
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+def memoize(
+    maxsize: Optional[int] = None,
+    maxbytes: Optional[int] = None,
+    key: Optional[Callable[..., Hashable]] = None,
+    name: Optional[str] = None,
+) -> Callable[[Callable], _Memo]:
+    """Decorator caching a function's results, like functools.lru_cache.
+
+    Every memoised function counts hits, misses and evictions, and is listed
+    in cache_stats() while it is alive, so a run can report where caching
+    paid off.
+
+    Args:
+        maxsize: The most entries to keep; the least recently used entry is
+            evicted first. Defaults to no limit.
+        maxbytes: The most bytes (by sys.getsizeof of keys and values) to
+            keep, evicting least recently used entries. Defaults to no limit.
+        key: Function receiving the call's arguments and returning the
+            cache key, e.g. to turn a frozenset argument into a bitmask with
+            to_bitmask. Defaults to the positional and keyword arguments.
+        name: The name to report in statistics. Defaults to the function's
+            qualified name.
+    """
+
+    def decorator(func: Callable) -> _Memo:
+        memo = _Memo(func, maxsize, maxbytes, key, name)
+        _registry.add(memo)
+        return memo
+
+    return decorator
+
+
+def cache_stats() -> Dict[str, CacheInfo]:
+    """Return the statistics of every live memoised function, keyed by module and name"""
+    return {memo.qualified_name: memo.cache_info() for memo in sorted(_registry, key=lambda m: m.qualified_name)}
+
+
+def format_cache_stats() -> str:
+    """Return a table of statistics for every memoised function that was used"""
+    rows = [
+        f"{name:32} {info.hits:>12} {info.misses:>12} {info.evictions:>10} "
+        f"{info.currsize:>10} {(info.hits / (info.hits + info.misses)):>7.1%}"
+        for name, info in cache_stats().items()
+        if info.hits or info.misses
+    ]
+    if not rows:
+        return "no memoised calls"
+    header = f"{'function':32} {'hits':>12} {'misses':>12} {'evictions':>10} {'size':>10} {'hit %':>7}"
+    return "\n".join([header] + rows)
@@ -0,0 +1,146 @@
+"""
+Opcode inference for register machines whose opcode numbers are unknown.
+
+Given samples of registers before and after one numbered instruction, every
+sample is tested against every candidate opcode at once with NumPy, giving
+a 16-bit mask per sample of the opcodes that fit. The masks for each opcode
+number are intersected, and constraint propagation (an opcode number left
+with one candidate claims it from all the others) settles the mapping. A
+numbered program then assembles into ElfCode for aoc.vm to run.
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from aoc.vm import ELFCODE, InstructionSet, Program, assemble
+
+# the vectorised operation behind each ElfCode mnemonic, by prefix
+_VECTOR = {
+    "add": np.add,
+    "mul": np.multiply,
+    "ban": np.bitwise_and,
+    "bor": np.bitwise_or,
+    "set": lambda a, b: a,
+    "gt": np.greater,
+    "eq": np.equal,
+}
+
+_NUMBERS = re.compile(r"-?\d+")
+
+
+@dataclass(frozen=True)
+class Samples:
+    """Observations of single instructions, one row per sample.
+
+    Attributes:
+        before: np.ndarray
+            the registers before each instruction, shape (samples, registers)
+        instructions: np.ndarray
+            each instruction as opcode number, a, b and c, shape (samples, 4)
+        after: np.ndarray
+            the registers after each instruction
+    """
+
+    before: np.ndarray
+    instructions: np.ndarray
+    after: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.instructions)
+
+    @property
+    def opcodes(self) -> np.ndarray:
+        return self.instructions[:, 0]
+
+    @classmethod
+    def parse(cls, lines: List[str]) -> Tuple["Samples", List[str]]:
+        """Read the "Before:", instruction, "After:" groups at the head of `lines`.
+
+        Returns:
+            The samples, and the lines that follow them.
+        """
+        at = 0
+        while at < len(lines) and (not lines[at].strip() or lines[at].startswith("Before:")):
+            at += 1 if not lines[at].strip() else 3
+        numbers = _NUMBERS.findall("\n".join(lines[:at]))
+        count = sum(line.startswith("Before:") for line in lines[:at])
+        table = np.array(numbers, dtype=np.int64).reshape(count, -1)
+        width = (table.shape[1] - 4) // 2
+        return cls(table[:, :width], table[:, width:width + 4], table[:, width + 4:]), lines[at:]
+
+
+def candidate_masks(samples: Samples, isa: InstructionSet = ELFCODE) -> np.ndarray:
+    """Return, for each sample, a mask with bit k set if opcode k of `isa` explains it.
+
+    An opcode explains a sample when, applied to the registers before, it
+    leaves the value seen after in its output register. An operand naming
+    a register that does not exist rules the opcode out.
+    """
+    count, width = samples.before.shape
+    rows = np.arange(count)
+    _, a, b, c = samples.instructions.T
+    masks = np.zeros(count, dtype=np.uint16)
+    valid_c = c < width
+    seen = samples.after[rows, np.minimum(c, width - 1)]
+    for bit, (mnemonic, op) in enumerate(isa.ops.items()):
+        valid = valid_c.copy()
+        values = []
+        for kind, operand in zip(op.operands, (a, b)):
+            if kind == "r":
+                valid &= operand < width
+                values.append(samples.before[rows, np.minimum(operand, width - 1)])
+            else:
+                values.append(operand)
+        vector = next(f for prefix, f in _VECTOR.items() if mnemonic.startswith(prefix))
+        fits = valid & (vector(*values).astype(np.int64) == seen)
+        masks |= fits.astype(np.uint16) << bit
+    return masks
+
+
+def count_candidates(masks: np.ndarray) -> np.ndarray:
+    """Return the number of opcodes each mask allows."""
+    return np.unpackbits(masks.astype("<u2").view(np.uint8).reshape(-1, 2), axis=1).sum(axis=1)
+
+
+def resolve_opcodes(opcodes: np.ndarray, masks: np.ndarray, isa: InstructionSet = ELFCODE) -> Dict[int, str]:
+    """Return the mnemonic of each opcode number seen, by constraint propagation.
+
+    Each number starts with the opcodes allowed by every one of its samples.
+    A number with a single candidate claims it, removing it from every other
+    number, until every number has one mnemonic.
+
+    Raises:
+        ValueError: if the samples contradict each other or leave more than
+            one mapping possible.
+    """
+    everything = (1 << len(isa.ops)) - 1
+    numbers = np.full(int(opcodes.max()) + 1, everything, dtype=np.uint16)
+    np.bitwise_and.at(numbers, opcodes, masks)
+    possible = {n: int(numbers[n]) for n in set(opcodes.tolist())}
+    while True:
+        if any(mask == 0 for mask in possible.values()):
+            raise ValueError("no opcode fits every sample of some opcode number")
+        if all(mask & (mask - 1) == 0 for mask in possible.values()):
+            break
+        changed = False
+        for n, mask in possible.items():
+            if mask & (mask - 1) == 0:
+                for other in possible:
+                    if other != n and possible[other] & mask:
+                        possible[other] &= ~mask
+                        changed = True
+        if not changed:
+            raise ValueError("the samples allow more than one opcode mapping")
+    return {n: isa.mnemonics[mask.bit_length() - 1] for n, mask in sorted(possible.items())}
+
+
+def decode_program(lines: Iterable[str], table: Dict[int, str], isa: InstructionSet = ELFCODE) -> Program:
+    """Assemble a program written with opcode numbers, using the mnemonics in `table`."""
+    named = []
+    for line in lines:
+        if line.strip():
+            opcode, *operands = line.split()
+            named.append(" ".join([table[int(opcode)], *operands]))
+    return assemble(named, isa)
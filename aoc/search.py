@@ -1,7 +1,6 @@
 import itertools
 from collections import deque
-from functools import lru_cache
-from heapq import heappush, heappop
+from heapq import heapify, heappush, heappop
 from typing import (
     TypeVar,
     Iterable,
@@ -16,12 +15,17 @@ from typing import (
     Optional,
     Union,
     Protocol,
+    Tuple,
+    Iterator,
 )
 
 _T = TypeVar("_T")
 _C = TypeVar("_C", bound="Comparable")
 _N = TypeVar("_N", bound="Node")
 
+_INF = float("inf")
+_EXHAUSTED = object()
+
 
 def linear_contains(iterable: Iterable[_T], key: _T) -> bool:
     """Return True if key is in iterable"""
@@ -222,6 +226,184 @@ def _frontier_search(
     return None
 
 
+class FrontierResult(Generic[_T]):
+    """The outcome of a layered or bidirectional breadth first search"""
+
+    def __init__(
+        self,
+        state: _T,
+        depth: int,
+        path: Optional[List[_T]] = None,
+        peak_frontier: int = 0,
+        visited: int = 0,
+    ) -> None:
+        """Create a frontier search result"""
+        self.state: _T = state
+        self.depth: int = depth
+        self.path: Optional[List[_T]] = path
+        self.peak_frontier: int = peak_frontier
+        self.visited: int = visited
+
+    def __repr__(self) -> str:
+        """Return a string representation of the result"""
+        return f"FrontierResult(state={self.state!r}, depth={self.depth})"
+
+
+def _walk_back(seen: Dict[Any, Any], state: _T, key: Callable[[_T], Any]) -> List[_T]:
+    """Follow a predecessor map from state back to its root"""
+    chain: List[_T] = [state]
+    while (state := seen[key(state)]) is not None:
+        chain.append(state)
+    return chain
+
+
+def layered_bfs(
+    initial: _T,
+    goal_test: Callable[[_T], bool],
+    successors: Callable[[_T], Iterable[_T]],
+    key: Optional[Callable[[_T], Any]] = None,
+    track_path: bool = False,
+    undirected: bool = False,
+) -> Optional[FrontierResult[_T]]:
+    """Breadth first search holding only the frontier layers in memory
+
+    Unlike bfs no Node objects are created: only the current and next
+    layers of states are alive at once, and visited states are remembered
+    by their `key` fingerprint (e.g. `hash`, or a packed int) rather than
+    by the states themselves. This saves memory, not time: every state is
+    still expanded once, so when the successor function dominates it runs
+    about as fast as bfs. With an explicit goal state, bidirectional_bfs
+    is faster.
+
+    Args:
+        initial: The starting state.
+        goal_test: Predicate identifying a goal state.
+        successors: Function returning the states reachable in one step.
+        key: Function returning a compact fingerprint for a state. Defaults
+            to the state itself. A lossy key such as `hash` trades a
+            vanishingly small chance of a collision for memory.
+        track_path: Keep a predecessor map so the path can be returned.
+        undirected: The graph is undirected, so a state can only be
+            rediscovered from the previous two layers; no global visited
+            set is kept at all.
+
+    Returns:
+        A FrontierResult for the first goal found, or None.
+    """
+    if key is None:
+        key = _identity
+    if goal_test(initial):
+        return FrontierResult(initial, 0, [initial] if track_path else None, 1, 1)
+    seen: Any = {key(initial): None} if track_path else {key(initial)}
+    previous: Set[Any] = set()
+    current: Set[Any] = {key(initial)}
+    frontier = [initial]
+    depth = 0
+    peak = visited = 1
+    while frontier:
+        depth += 1
+        layer = []
+        layer_keys: Set[Any] = set()
+        for state in frontier:
+            for child in successors(state):
+                child_key = key(child)
+                if undirected:
+                    if child_key in current or child_key in previous or child_key in layer_keys:
+                        continue
+                    if track_path:
+                        seen[child_key] = state
+                elif child_key in seen:
+                    continue
+                elif track_path:
+                    seen[child_key] = state
+                else:
+                    seen.add(child_key)
+                visited += 1
+                if goal_test(child):
+                    path = _walk_back(seen, child, key)[::-1] if track_path else None
+                    return FrontierResult(child, depth, path, max(peak, len(layer) + 1), visited)
+                layer_keys.add(child_key)
+                layer.append(child)
+        peak = max(peak, len(layer))
+        previous, current = current, layer_keys
+        frontier = layer
+    return None
+
+
+def bidirectional_bfs(
+    initial: _T,
+    goal: _T,
+    successors: Callable[[_T], Iterable[_T]],
+    predecessors: Optional[Callable[[_T], Iterable[_T]]] = None,
+    key: Optional[Callable[[_T], Any]] = None,
+    track_path: bool = True,
+) -> Optional[FrontierResult[_T]]:
+    """Breadth first search from both ends towards an explicit goal state
+
+    Layers are expanded alternately from whichever side has the smaller
+    frontier. The first layer to touch the other side's visited set gives
+    the shortest path, so the search explores roughly two balls of half the
+    radius instead of one of the full radius.
+
+    Args:
+        initial: The starting state.
+        goal: The goal state.
+        successors: Function returning the states reachable in one step.
+        predecessors: Function returning the states one step before a state.
+            Defaults to `successors`, which suits undirected graphs.
+        key: Function returning a compact fingerprint for a state. Defaults
+            to the state itself.
+        track_path: Keep predecessor maps so the path can be returned.
+
+    Returns:
+        A FrontierResult whose state is the meeting point, or None.
+    """
+    if key is None:
+        key = _identity
+    if predecessors is None:
+        predecessors = successors
+    if key(initial) == key(goal):
+        return FrontierResult(initial, 0, [initial] if track_path else None, 1, 1)
+    sides = [
+        ({key(initial): None} if track_path else {key(initial)}, [initial], successors),
+        ({key(goal): None} if track_path else {key(goal)}, [goal], predecessors),
+    ]
+    depth = 0
+    peak = 1
+    while sides[0][1] and sides[1][1]:
+        side = 0 if len(sides[0][1]) <= len(sides[1][1]) else 1
+        seen, frontier, expand = sides[side]
+        other_seen = sides[1 - side][0]
+        depth += 1
+        layer = []
+        for state in frontier:
+            for child in expand(state):
+                child_key = key(child)
+                if child_key in seen:
+                    continue
+                if track_path:
+                    seen[child_key] = state
+                else:
+                    seen.add(child_key)
+                if child_key in other_seen:
+                    path = None
+                    if track_path:
+                        ahead = _walk_back(sides[0][0], child, key)[::-1]
+                        behind = _walk_back(sides[1][0], child, key)
+                        path = ahead + behind[1:]
+                    return FrontierResult(
+                        child, depth, path, max(peak, len(layer) + 1), len(seen) + len(other_seen)
+                    )
+                layer.append(child)
+        peak = max(peak, len(layer))
+        sides[side] = (seen, layer, expand)
+    return None
+
+
+def _identity(state: _T) -> _T:
+    return state
+
+
 class PriorityQueue(Generic[_T]):
     """Priority queue"""
 
@@ -247,87 +429,415 @@ class PriorityQueue(Generic[_T]):
         return repr(self._container)
 
 
+class SearchResult(Generic[_T]):
+    """Distances and parent pointers left behind by a shortest-path search.
+
+    For searches over integer-indexed states (`size` given) both tables are
+    lists indexed by state; otherwise they are dicts keyed by state. Paths
+    are only reconstructed when asked for.
+    """
+
+    def __init__(
+        self,
+        distance: Union[Dict[_T, float], List[float]],
+        parent: Union[Dict[_T, Optional[_T]], List[Optional[int]]],
+        goal: Optional[_T] = None,
+    ) -> None:
+        """Create a search result"""
+        self.distance = distance
+        self.parent = parent
+        self.goal: Optional[_T] = goal
+
+    @property
+    def found(self) -> bool:
+        """Return True if the search stopped at a goal state"""
+        return self.goal is not None
+
+    @property
+    def cost(self) -> float:
+        """Return the cost of the cheapest path to the goal"""
+        if self.goal is None:
+            raise ValueError("The search did not reach a goal")
+        return self.distance[self.goal]
+
+    def reached(self, state: _T) -> bool:
+        """Return True if the search found a path to state"""
+        if isinstance(self.distance, list):
+            return self.distance[state] != _INF
+        return state in self.distance
+
+    def path(self, state: Optional[_T] = None) -> List[_T]:
+        """Return the cheapest path from the start to state (default: the goal)"""
+        if state is None:
+            state = self.goal
+        if state is None or not self.reached(state):
+            return []
+        parent = self.parent
+        path: List[_T] = [state]
+        while (state := parent[state]) is not None:
+            path.append(state)
+        path.reverse()
+        return path
+
+
+def _best_first(
+    sources: Iterable[_T],
+    successors: Callable[[_T], Iterable[Tuple[_T, float]]],
+    goal_test: Optional[Callable[[_T], bool]],
+    heuristic: Optional[Callable[[_T], float]],
+    size: Optional[int],
+) -> SearchResult[_T]:
+    """Main body for dijkstra and astar
+
+    Heap entries are plain (priority, sequence, cost, state) tuples; the
+    sequence number breaks ties so states never need to be comparable.
+    Decrease-key is lazy: an improved state is pushed again and the stale
+    entry is discarded when popped, so every state is expanded at most once
+    per improvement of its cost.
+    """
+    distance: Any = {} if size is None else [_INF] * size
+    parent: Any = {} if size is None else [None] * size
+    frontier = []
+    for sequence, source in enumerate(sources):
+        distance[source] = 0
+        parent[source] = None
+        frontier.append((heuristic(source) if heuristic else 0, sequence, 0, source))
+    heapify(frontier)
+    sequence = len(frontier)
+    dense = size is not None
+
+    while frontier:
+        _, _, current_cost, current = heappop(frontier)
+        # stale entry: a cheaper route was found after this one was pushed
+        if current_cost > distance[current]:
+            continue
+        if goal_test is not None and goal_test(current):
+            return SearchResult(distance, parent, current)
+        for child, step_cost in successors(current):
+            new_cost = current_cost + step_cost
+            if dense:
+                if new_cost >= distance[child]:
+                    continue
+            elif child in distance and new_cost >= distance[child]:
+                continue
+            distance[child] = new_cost
+            parent[child] = current
+            priority = new_cost + heuristic(child) if heuristic else new_cost
+            heappush(frontier, (priority, sequence, new_cost, child))
+            sequence += 1
+    return SearchResult(distance, parent)
+
+
+def dijkstra(
+    initial: _T,
+    successors: Callable[[_T], Iterable[Tuple[_T, float]]],
+    goal_test: Optional[Callable[[_T], bool]] = None,
+    size: Optional[int] = None,
+) -> SearchResult[_T]:
+    """Dijkstra's shortest-path search
+
+    Args:
+        initial: The starting state.
+        successors: Function returning (state, step cost) pairs for a state.
+        goal_test: Optional predicate stopping the search at the first goal
+            state popped. Without it every reachable state is settled.
+        size: If given, states are ints in range(size) and the distance and
+            parent tables are lists rather than dicts.
+
+    Returns:
+        A SearchResult holding the distance map, parent pointers and goal.
+    """
+    return _best_first([initial], successors, goal_test, None, size)
+
+
+def distance_field(
+    sources: Iterable[_T],
+    successors: Callable[[_T], Iterable[Tuple[_T, float]]],
+    size: Optional[int] = None,
+) -> SearchResult[_T]:
+    """Multi-source Dijkstra settling every reachable state
+
+    Every source starts at distance 0, so each state ends up with its
+    distance to the nearest source and a parent chain leading back to it.
+    For a grid, number the cells (e.g. with Grid.index_of) and pass `size`
+    to get the field as a flat list.
+
+    Args:
+        sources: The starting states.
+        successors: Function returning (state, step cost) pairs for a state.
+        size: If given, states are ints in range(size) and the distance and
+            parent tables are lists rather than dicts.
+
+    Returns:
+        A SearchResult holding the distance map and parent pointers.
+    """
+    return _best_first(dict.fromkeys(sources), successors, None, None, size)
+
+
+def bfs_field(
+    sources: Iterable[_T],
+    successors: Callable[[_T], Iterable[_T]],
+    size: Optional[int] = None,
+) -> SearchResult[_T]:
+    """Multi-source breadth first search settling every reachable state
+
+    The unit-cost counterpart of distance_field: `successors` returns plain
+    states and each step costs 1, so whole layers are expanded in turn
+    without a priority queue.
+    """
+    distance: Any = {} if size is None else [_INF] * size
+    parent: Any = {} if size is None else [None] * size
+    frontier = list(dict.fromkeys(sources))
+    for source in frontier:
+        distance[source] = 0
+        parent[source] = None
+    dense = size is not None
+    depth = 0
+    while frontier:
+        depth += 1
+        layer = []
+        for current in frontier:
+            for child in successors(current):
+                if dense:
+                    seen = distance[child] != _INF
+                else:
+                    seen = child in distance
+                if seen:
+                    continue
+                distance[child] = depth
+                parent[child] = current
+                layer.append(child)
+        frontier = layer
+    return SearchResult(distance, parent)
+
+
+def optimal_path_states(
+    sources: Iterable[_T],
+    targets: Iterable[_T],
+    successors: Callable[[_T], Iterable[Tuple[_T, float]]],
+    predecessors: Optional[Callable[[_T], Iterable[Tuple[_T, float]]]] = None,
+    size: Optional[int] = None,
+) -> Tuple[float, Set[_T]]:
+    """Find every state that lies on at least one cheapest path
+
+    One distance field is run forward from the sources and one backward
+    from the targets; a state is on an optimal path exactly when its two
+    distances add up to the optimal cost.
+
+    Args:
+        sources: The starting states.
+        targets: The goal states; the cheapest of them defines the optimum.
+        successors: Function returning (state, step cost) pairs for a state.
+        predecessors: Function returning (state, step cost) pairs for the
+            states that lead to a state. Defaults to `successors`, which is
+            only correct for undirected graphs.
+        size: If given, states are ints in range(size) and the distance
+            tables are lists rather than dicts.
+
+    Returns:
+        The optimal cost and the set of states on optimal paths, or
+        (inf, empty set) if no target is reachable.
+    """
+    targets = list(dict.fromkeys(targets))
+    forward = distance_field(sources, successors, size)
+    best = min((forward.distance[t] for t in targets if forward.reached(t)), default=_INF)
+    if best == _INF:
+        return _INF, set()
+    backward = distance_field(targets, predecessors or successors, size).distance
+    if size is None:
+        return best, {
+            state
+            for state, cost in forward.distance.items()
+            if state in backward and cost + backward[state] == best
+        }
+    return best, {
+        state
+        for state, (ahead, behind) in enumerate(zip(forward.distance, backward))
+        if ahead + behind == best
+    }
+
+
 def astar(
     initial: _T,
     goal_test: Callable[[_T], bool],
     successors: Callable[[_T], List[_T]],
     heuristic: Callable[[_T], float],
-        cost: Callable[[_T, _T], float] = None,
+    cost: Callable[[_T, _T], float] = None,
 ) -> Optional[Node[_T]]:
-    """A* search"""
-    # 1. Create a priority queue
-    # 2. Add the initial node to the queue
-    # 3. Create a set to store the explored nodes
-    # 4. Loop until the queue is empty
-    #     a. Pop the node with the lowest cost
-    #     b. If the node is the goal, return it
-    #     c. For each child of the node
-    #         i. Calculate the cost to the child
-    #         ii. If the child is not explored or the new cost is lower
-    #             1. Add the child to the explored set
-    #             2. Add the child to the queue
-
-    frontier: PriorityQueue[Node[_T]] = PriorityQueue()
-    frontier.push(Node(initial, None, 0.0, heuristic(initial)))
-    explored: Dict[_T, float] = {initial: 0.0}
+    """A* search
+
+    Returns the goal Node, whose parent chain is only built once the goal has
+    been found. Use astar_search for the distance map and parent table.
+    """
     if cost is None:
-        cost = lambda a, b: 1
 
-    # keep going while there is more to explore
-    # and the goal has not been reached
-    while not frontier.empty:
-        current_node: Node[_T] = frontier.pop()
-        current_state: _T = current_node.state
-        if goal_test(current_state):
-            return current_node
-        for child in successors(current_state):
-            step_cost = cost(current_state, child)
-            new_cost: float = current_node.cost + step_cost
-            if child not in explored or explored[child] > new_cost:
-                explored[child] = new_cost
-                frontier.push(Node(child, current_node, new_cost, heuristic(child)))
-    return None
+        def weighted(state: _T) -> Iterable[Tuple[_T, float]]:
+            return ((child, 1) for child in successors(state))
+
+    else:
+
+        def weighted(state: _T) -> Iterable[Tuple[_T, float]]:
+            return ((child, cost(state, child)) for child in successors(state))
+
+    result = _best_first([initial], weighted, goal_test, heuristic, None)
+    if not result.found:
+        return None
+    node: Optional[Node[_T]] = None
+    for state in result.path():
+        node = Node(state, node, result.distance[state], heuristic(state))
+    return node
+
+
+def astar_search(
+    initial: _T,
+    successors: Callable[[_T], Iterable[Tuple[_T, float]]],
+    goal_test: Callable[[_T], bool],
+    heuristic: Callable[[_T], float],
+    size: Optional[int] = None,
+) -> SearchResult[_T]:
+    """A* search returning the distance map and parent pointers
+
+    Arguments are as for dijkstra, plus an admissible heuristic estimating
+    the remaining cost from a state to the goal.
+    """
+    return _best_first([initial], successors, goal_test, heuristic, size)
 
 
 def all_paths(
         start: _T,
         goal: _T,
-        successors: Callable[[_T], List[_T]],
-) -> List[List[_T]]:
+        successors: Callable[[_T], Iterable[_T]],
+) -> Iterator[List[_T]]:
     """
-    Find all paths from start to goal in a graph.
+    Generate every simple path from start to goal in a graph.
+
+    Paths are produced one at a time from an explicit depth-first stack, so
+    only the path currently being extended is held in memory. Wrap the call
+    in list() to collect them all.
 
     Args:
         start: The starting node.
         goal: The goal node.
-        successors: Function that returns a list of successors for a node.
+        successors: Function that returns the successors of a node.
 
-    Returns:
-        A list of paths, where each path is a list of nodes from start to goal.
+    Yields:
+        Each path as a list of nodes from start to goal.
+    """
+    if start == goal:
+        yield [start]
+        return
+    path: List[_T] = [start]
+    on_path: Set[_T] = {start}
+    stack = [iter(successors(start))]
+    while stack:
+        child = next(stack[-1], _EXHAUSTED)
+        if child is _EXHAUSTED:
+            stack.pop()
+            on_path.discard(path.pop())
+        elif child in on_path:
+            continue
+        elif child == goal:
+            yield path + [child]
+        else:
+            path.append(child)
+            on_path.add(child)
+            stack.append(iter(successors(child)))
+
+
+
+def _topological_order(
+        start: _T,
+        successors: Callable[[_T], Iterable[_T]],
+) -> Optional[List[_T]]:
+    """Return the nodes reachable from start in reverse topological order,
+    or None if a cycle is reachable."""
+    order: List[_T] = []
+    state: Dict[_T, bool] = {start: False}  # False while on the stack
+    stack = [(start, iter(successors(start)))]
+    while stack:
+        node, children = stack[-1]
+        child = next(children, _EXHAUSTED)
+        if child is _EXHAUSTED:
+            stack.pop()
+            state[node] = True
+            order.append(node)
+        elif child not in state:
+            state[child] = False
+            stack.append((child, iter(successors(child))))
+        elif not state[child]:
+            return None
+    return order
+
+
+def count_paths(
+        start: _T,
+        goal: _T,
+        successors: Callable[[_T], Iterable[_T]],
+        can_revisit: Optional[Callable[[_T], bool]] = None,
+) -> int:
     """
+    Count the simple paths from start to goal without building them.
+
+    If no cycle is reachable from start the graph is a DAG and the count is
+    a single dynamic-programming pass over a topological order. Otherwise
+    the count is memoised on (node, bitmask of visited nodes), which is
+    exponential only in the number of nodes that must not be revisited.
+
+    Args:
+        start: The starting node.
+        goal: The goal node.
+        successors: Function that returns the successors of a node.
+        can_revisit: Optional predicate for nodes that may appear on a path
+            more than once (e.g. the big caves of 2021/12). Such nodes must
+            not form a cycle among themselves.
 
-    @lru_cache(maxsize=None)
-    def _all_paths(
-            current: _T,
-            goal: _T,
-            path: tuple,
-            visited: frozenset,
-    ) -> List[List[_T]]:
-        if current == goal:
-            return [list(path + (current,))]
-        paths = []
-        for neighbor in successors(current):
-            if neighbor not in visited:
-                new_paths = _all_paths(
-                    neighbor,
-                    goal,
-                    path + (current,),
-                    visited | frozenset([current]),
-                )
-                paths.extend(new_paths)
-        return paths
-
-    return _all_paths(start, goal, tuple(), frozenset())
+    Returns:
+        The number of paths.
+    """
+    order = _topological_order(start, successors) if can_revisit is None else None
+    if order is not None:
+        counts: Dict[_T, int] = {}
+        for node in order:
+            counts[node] = 1 if node == goal else sum(counts[child] for child in successors(node))
+        return counts[start]
+
+    bits: Dict[_T, int] = {}
+    memo: Dict[Tuple[_T, int], int] = {}
+
+    def enter(node: _T, visited: int) -> Tuple[_T, int]:
+        if can_revisit is None or not can_revisit(node):
+            visited |= bits.setdefault(node, 1 << len(bits))
+        return node, visited
+
+    if start == goal:
+        return 1
+    root = enter(start, 0)
+    # each frame is a memo key still being counted, its unexplored children
+    # and the paths found below it so far
+    stack = [(root, iter(successors(start)))]
+    totals = [0]
+    while stack:
+        cache_key, children = stack[-1]
+        visited = cache_key[1]
+        for child in children:
+            if child in bits and visited & bits[child]:
+                continue
+            if child == goal:
+                totals[-1] += 1
+                continue
+            child_key = enter(child, visited)
+            if child_key in memo:
+                totals[-1] += memo[child_key]
+                continue
+            stack.append((child_key, iter(successors(child))))
+            totals.append(0)
+            break
+        else:
+            stack.pop()
+            memo[cache_key] = total = totals.pop()
+            if totals:
+                totals[-1] += total
+    return memo[root]
 
 
 # Implement Karp's algorithm
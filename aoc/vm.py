@@ -0,0 +1,784 @@
+"""
+A register machine for the assembunny, duet, coprocessor, ElfCode and
+2015/23 instruction sets.
+
+Each instruction set is a table of opcode definitions. A program is
+assembled once: every line becomes an integer-coded Instruction whose
+operands are already resolved to a register index or an immediate value.
+A Machine then turns each address into a small Python function that runs
+the straight-line code from there to the next taken branch, so the dispatch
+loop makes one call per branch rather than re-parsing text per instruction.
+
+Counted loops are fused as well. assemble() summarises each loop body by
+running its actions over polynomials in the registers rather than numbers;
+a body that only adds, subtracts, multiplies and runs inner loops, and
+steps the tested register towards zero once per pass, becomes a single
+assignment of every register it changes, taken whenever its guards hold on
+entry. Multiplication by repeated addition, and loops nested around it,
+then cost one step. A toggle rewriting the program finds its loops afresh.
+"""
+import string
+from collections import deque, namedtuple
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# op: the opcode number; registers: a bit per operand naming a register
+Instruction = namedtuple("Instruction", "op registers args")
+
+Patch = Callable[[List[int]], int]
+
+# the longest run of instructions compiled into one function
+MAX_RUN = 32
+
+# added to the address a run stops at for a breakpoint, to leave the dispatch loop
+_BREAK = 1 << 48
+
+# compiled code by source, shared by every machine running the same program
+_compiled: Dict[str, object] = {}
+
+
+class Halt(Exception):
+    """Raised by a hook to stop the machine at the instruction calling it."""
+
+
+class Blocked(Exception):
+    """Raised by a receive hook with nothing to receive; the machine waits to retry the instruction."""
+
+
+@dataclass(frozen=True)
+class Op:
+    """The definition of one opcode.
+
+    Attributes:
+        operands: str
+            one letter per operand: "r" a register, "n" a number, "v" either
+        action: str
+            the Python statement executed, with {a}, {b}, {c} standing for the
+            values of the operands, {A}, {B}, {C} for the registers they name
+            and {ip} for the address of the instruction
+        jump: str
+            for a branch, the offset from the instruction to jump by
+        test: str
+            for a branch, the condition under which it is taken; a branch
+            with no test is always taken
+        io: bool
+            whether the action calls a hook (out, send, receive, toggle) that
+            may stop the machine or change the program, so the instruction
+            is always run on its own
+    """
+
+    operands: str
+    action: str = ""
+    jump: str = ""
+    test: str = ""
+    io: bool = False
+
+    @property
+    def writes(self) -> Tuple[int, ...]:
+        """The positions of the operands the action assigns to."""
+        return tuple(n for n, name in enumerate("ABC") if f"{{{name}}}" in self.action)
+
+
+@dataclass(frozen=True)
+class InstructionSet:
+    """A family of register machine programs.
+
+    Attributes:
+        name: str
+            the name of the instruction set
+        registers: tuple
+            the register names, in register index order
+        ops: dict
+            the Op for each mnemonic; opcode numbers follow this order
+        toggles: dict
+            the mnemonic each mnemonic becomes when toggled by `tgl`
+    """
+
+    name: str
+    registers: Tuple[str, ...]
+    ops: Dict[str, Op]
+    toggles: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def mnemonics(self) -> Tuple[str, ...]:
+        return tuple(self.ops)
+
+    def encode(self, mnemonic: str, tokens: Iterable[str]) -> Optional[Instruction]:
+        """Return the Instruction for one line, or None if its operands do not fit the opcode.
+
+        Raises:
+            KeyError: for an unknown mnemonic.
+            ValueError: for an operand that is neither a register nor a number.
+        """
+        op = self.ops[mnemonic]
+        tokens = tuple(tokens)
+        if len(tokens) != len(op.operands):
+            return None
+        registers, args = 0, []
+        for n, (kind, token) in enumerate(zip(op.operands, tokens)):
+            if kind != "n" and token in self.registers:
+                registers |= 1 << n
+                args.append(self.registers.index(token))
+            elif kind == "r":
+                return None
+            else:
+                args.append(int(token))
+        return Instruction(self.mnemonics.index(mnemonic), registers, tuple(args))
+
+
+ASSEMBUNNY = InstructionSet(
+    "assembunny",
+    tuple("abcd"),
+    {
+        "cpy": Op("vr", "{B} = {a}"),
+        "inc": Op("r", "{A} += 1"),
+        "dec": Op("r", "{A} -= 1"),
+        "jnz": Op("vv", jump="{b}", test="{a} != 0"),
+        "tgl": Op("v", "toggle({ip} + {a})", io=True),
+        "out": Op("v", "out({a})", io=True),
+    },
+    {"inc": "dec", "dec": "inc", "tgl": "inc", "out": "inc", "jnz": "cpy", "cpy": "jnz"},
+)
+
+DUET = InstructionSet(
+    "duet",
+    tuple(string.ascii_lowercase),
+    {
+        "snd": Op("v", "send({a})", io=True),
+        "set": Op("rv", "{A} = {b}"),
+        "add": Op("rv", "{A} += {b}"),
+        "mul": Op("rv", "{A} *= {b}"),
+        "mod": Op("rv", "{A} %= {b}"),
+        "rcv": Op("r", "{A} = receive({a})", io=True),
+        "jgz": Op("vv", jump="{b}", test="{a} > 0"),
+    },
+)
+
+COPROCESSOR = InstructionSet(
+    "coprocessor",
+    tuple("abcdefgh"),
+    {
+        "set": Op("rv", "{A} = {b}"),
+        "sub": Op("rv", "{A} -= {b}"),
+        "mul": Op("rv", "{A} *= {b}"),
+        "jnz": Op("vv", jump="{b}", test="{a} != 0"),
+    },
+)
+
+# 2015/23, which writes "jie a, +4"
+TURING_LOCK = InstructionSet(
+    "turing lock",
+    ("a", "b"),
+    {
+        "hlf": Op("r", "{A} //= 2"),
+        "tpl": Op("r", "{A} *= 3"),
+        "inc": Op("r", "{A} += 1"),
+        "jmp": Op("n", jump="{a}"),
+        "jie": Op("rn", jump="{b}", test="{a} % 2 == 0"),
+        "jio": Op("rn", jump="{b}", test="{a} == 1"),
+    },
+)
+
+# 2018: registers are named by number, and "#ip n" binds the ip to register n
+ELFCODE = InstructionSet(
+    "ElfCode",
+    tuple("012345"),
+    {
+        "addr": Op("rrr", "{C} = {a} + {b}"),
+        "addi": Op("rnr", "{C} = {a} + {b}"),
+        "mulr": Op("rrr", "{C} = {a} * {b}"),
+        "muli": Op("rnr", "{C} = {a} * {b}"),
+        "banr": Op("rrr", "{C} = {a} & {b}"),
+        "bani": Op("rnr", "{C} = {a} & {b}"),
+        "borr": Op("rrr", "{C} = {a} | {b}"),
+        "bori": Op("rnr", "{C} = {a} | {b}"),
+        "setr": Op("rnr", "{C} = {a}"),
+        "seti": Op("nnr", "{C} = {a}"),
+        "gtir": Op("nrr", "{C} = 1 if {a} > {b} else 0"),
+        "gtri": Op("rnr", "{C} = 1 if {a} > {b} else 0"),
+        "gtrr": Op("rrr", "{C} = 1 if {a} > {b} else 0"),
+        "eqir": Op("nrr", "{C} = 1 if {a} == {b} else 0"),
+        "eqri": Op("rnr", "{C} = 1 if {a} == {b} else 0"),
+        "eqrr": Op("rrr", "{C} = 1 if {a} == {b} else 0"),
+    },
+)
+
+
+class _Poly:
+    """A polynomial over the register values at the start of a loop, with integer coefficients.
+
+    Running an Op's action on a list of these instead of ints summarises
+    straight-line code. Anything but +, - and * raises TypeError, so code
+    that compares, divides or branches is never summarised.
+    """
+
+    __slots__ = ("terms",)
+
+    def __init__(self, terms: Optional[Dict[Tuple[int, ...], int]] = None):
+        self.terms = {monomial: k for monomial, k in (terms or {}).items() if k}
+
+    @classmethod
+    def register(cls, index: int) -> "_Poly":
+        return cls({(index,): 1})
+
+    @classmethod
+    def lift(cls, value) -> "_Poly":
+        if isinstance(value, _Poly):
+            return value
+        if isinstance(value, int) and not isinstance(value, bool):
+            return cls({(): value})
+        raise TypeError(f"cannot summarise {value!r}")
+
+    def __add__(self, other) -> "_Poly":
+        terms = dict(self.terms)
+        for monomial, k in _Poly.lift(other).terms.items():
+            terms[monomial] = terms.get(monomial, 0) + k
+        return _Poly(terms)
+
+    __radd__ = __add__
+
+    def __neg__(self) -> "_Poly":
+        return _Poly({monomial: -k for monomial, k in self.terms.items()})
+
+    def __sub__(self, other) -> "_Poly":
+        return self + -_Poly.lift(other)
+
+    def __rsub__(self, other) -> "_Poly":
+        return _Poly.lift(other) - self
+
+    def __mul__(self, other) -> "_Poly":
+        terms = {}
+        for m1, k1 in self.terms.items():
+            for m2, k2 in _Poly.lift(other).terms.items():
+                monomial = tuple(sorted(m1 + m2))
+                terms[monomial] = terms.get(monomial, 0) + k1 * k2
+        return _Poly(terms)
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other):
+        raise TypeError("symbolic values cannot be compared")
+
+    __hash__ = None
+
+    def __bool__(self):
+        raise TypeError("symbolic values have no truth value")
+
+    def same(self, other) -> bool:
+        return self.terms == _Poly.lift(other).terms
+
+    @property
+    def symbols(self) -> set:
+        return {index for monomial in self.terms for index in monomial}
+
+    def substitute(self, values: List["_Poly"]) -> "_Poly":
+        """Return this polynomial with each register replaced by its value in `values`."""
+        total = _Poly()
+        for monomial, k in self.terms.items():
+            term = _Poly.lift(k)
+            for index in monomial:
+                term = term * values[index]
+            total = total + term
+        return total
+
+    def render(self) -> str:
+        """Return Python source evaluating the polynomial over the registers `r`."""
+        parts = []
+        for monomial, k in sorted(self.terms.items(), key=lambda term: (len(term[0]), term[0])):
+            factors = [f"r[{index}]" for index in monomial]
+            if k != 1 or not factors:
+                factors.insert(0, f"({k})" if k < 0 else str(k))
+            parts.append(" * ".join(factors))
+        return " + ".join(parts) or "0"
+
+
+@dataclass(frozen=True, eq=False)
+class Loop:
+    """A counted loop fused into a single step.
+
+    Attributes:
+        start: int
+            the address of the first instruction of the body
+        end: int
+            the address of the branch back to `start`
+        count: _Poly
+            the number of times the body runs, from the registers on entry
+        effects: dict
+            the value each changed register holds once the loop is done,
+            from the registers on entry
+        guards: tuple
+            values that must all be positive on entry for the effects to
+            hold; the first is `count`
+    """
+
+    start: int
+    end: int
+    count: _Poly
+    effects: Dict[int, _Poly]
+    guards: Tuple[_Poly, ...]
+
+    def source(self) -> List[str]:
+        """Return Python statements taking the loop in one step when its guards hold."""
+        registers = sorted(self.effects)
+        return [
+            "if " + " and ".join(f"{guard.render()} > 0" for guard in self.guards) + ":",
+            f"    {', '.join(f'r[{i}]' for i in registers)} = {', '.join(self.effects[i].render() for i in registers)}",
+            f"    return {self.end + 1}",
+        ]
+
+
+def _summarise(
+    code: Tuple[Optional[Instruction], ...], isa: InstructionSet, start: int, end: int, loops: Dict[int, Loop]
+) -> Optional[Tuple[List[_Poly], List[_Poly]]]:
+    """Return the register values after one pass of code[start:end], and the guards it needs.
+
+    Loops already found inside the range count as single instructions. Any
+    other branch, hook or operation without a polynomial form gives None.
+    """
+    state = [_Poly.register(i) for i in range(len(isa.registers))]
+    guards = []
+    at = start
+    while at < end:
+        inner = loops.get(at)
+        if inner is not None and inner.end < end:
+            guards.extend(guard.substitute(state) for guard in inner.guards)
+            state = [
+                inner.effects[i].substitute(state) if i in inner.effects else value for i, value in enumerate(state)
+            ]
+            at = inner.end + 1
+            continue
+        ins = code[at]
+        at += 1
+        if ins is None:
+            continue
+        op = isa.ops[isa.mnemonics[ins.op]]
+        if op.jump or op.io:
+            return None
+        values = {
+            **{name: f"r[{arg}]" if ins.registers >> k & 1 else f"({arg})" for k, (name, arg) in enumerate(zip("abc", ins.args))},
+            **{name: f"r[{arg}]" for name, arg in zip("ABC", ins.args)},
+        }
+        try:
+            exec(op.action.format(**values), {"r": state})
+            state = [_Poly.lift(value) for value in state]
+        except (TypeError, ZeroDivisionError):
+            return None
+    return state, guards
+
+
+def _fuse(
+    code: Tuple[Optional[Instruction], ...], isa: InstructionSet, start: int, end: int, loops: Dict[int, Loop]
+) -> Optional[Loop]:
+    """Return the Loop for the body code[start:end] closed by the branch at `end`, if it is a counted loop.
+
+    Every pass must move the tested value one step nearer zero, and change
+    each other register by adding a polynomial in the registers the loop
+    never changes (an accumulator) or by setting it afresh from those and
+    the accumulators (a temporary).
+    """
+    branch = isa.ops[isa.mnemonics[code[end].op]]
+    summary = _summarise(code, isa, start, end, loops)
+    if summary is None:
+        return None
+    body, inner_guards = summary
+    symbols = [_Poly.register(i) for i in range(len(body))]
+    invariant = {i for i, value in enumerate(body) if value.same(symbols[i])}
+    accumulators = {
+        i: value - symbols[i]
+        for i, value in enumerate(body)
+        if i not in invariant and (value - symbols[i]).symbols <= invariant
+    }
+    temporaries = {
+        i for i, value in enumerate(body) if i not in invariant and i not in accumulators
+        if value.symbols <= invariant | accumulators.keys()
+    }
+    if len(invariant) + len(accumulators) + len(temporaries) != len(body):
+        return None
+    if any(not guard.symbols <= invariant for guard in inner_guards):
+        return None
+
+    # the value tested after each pass, and how it moves from one pass to the next
+    tested = body[code[end].args[0]]
+    step = tested.substitute(body) - tested
+    if step.symbols or step.terms.get((), 0) not in (-1, 1) or (branch.test == "{a} > 0" and not step.same(-1)):
+        return None
+    count = 1 - step * tested
+
+    last = [symbols[i] + (count - 1) * accumulators[i] if i in accumulators else symbols[i] for i in range(len(body))]
+    effects = {i: symbols[i] + count * delta for i, delta in accumulators.items()}
+    effects.update({i: body[i].substitute(last) for i in temporaries})
+    guards = [count, *inner_guards]
+    if any(not guard.symbols and guard.terms.get((), 0) <= 0 for guard in guards):
+        return None
+    return Loop(start, end, count, effects, tuple(guard for guard in guards if guard.symbols))
+
+
+def find_loops(code: Tuple[Optional[Instruction], ...], isa: InstructionSet) -> Dict[int, Loop]:
+    """Find the counted loops in `code`, innermost first, by the address each starts at.
+
+    A loop is a body of straight-line code, and of loops already found,
+    closed by a branch back to its first instruction that is taken while a
+    register is non-zero (or positive).
+    """
+    closers = []
+    for end, ins in enumerate(code):
+        if ins is None:
+            continue
+        op = isa.ops[isa.mnemonics[ins.op]]
+        if op.test in ("{a} != 0", "{a} > 0") and op.jump == "{b}" and ins.registers == 0b01 and ins.args[1] < 0:
+            if end + ins.args[1] >= 0:
+                closers.append((-ins.args[1], end))
+    loops: Dict[int, Loop] = {}
+    for length, end in sorted(closers):
+        loop = _fuse(code, isa, end - length, end, loops)
+        if loop is not None:
+            loops[loop.start] = loop
+    return loops
+
+
+@dataclass(frozen=True)
+class Program:
+    """An assembled program.
+
+    Attributes:
+        isa: InstructionSet
+            the instruction set it was written in
+        code: tuple
+            the Instruction at each address; None where the operands do
+            not fit the opcode, which runs as a no-op
+        source: tuple
+            the (mnemonic, operand tokens) at each address, kept for `tgl`
+        ip_register: int | None
+            the register bound to the instruction pointer by "#ip", if any
+        loops: dict
+            the counted loops found in the code, by start address
+    """
+
+    isa: InstructionSet
+    code: Tuple[Optional[Instruction], ...]
+    source: Tuple[Tuple[str, Tuple[str, ...]], ...]
+    ip_register: Optional[int] = None
+    loops: Dict[int, Loop] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.code)
+
+    def addresses(self, mnemonic: str) -> List[int]:
+        """Return the addresses holding `mnemonic` as loaded."""
+        return [address for address, (name, _) in enumerate(self.source) if name == mnemonic]
+
+
+def assemble(lines: Iterable[str], isa: InstructionSet) -> Program:
+    """Assemble program text, one instruction per line, for `isa`.
+
+    Operands may be separated by spaces or commas. Blank lines are skipped
+    and an "#ip n" line binds the instruction pointer to register n. Counted
+    loops are found here, once, for every machine running the program.
+    """
+    code, source, ip_register = [], [], None
+    for line in lines:
+        mnemonic, *tokens = line.replace(",", " ").split() or [""]
+        if not mnemonic:
+            continue
+        if mnemonic == "#ip":
+            ip_register = int(tokens[0])
+            continue
+        code.append(isa.encode(mnemonic, tokens))
+        source.append((mnemonic, tuple(tokens)))
+    code = tuple(code)
+    loops = find_loops(code, isa) if ip_register is None else {}
+    return Program(isa, code, tuple(source), ip_register, loops)
+
+
+class Machine:
+    """A program loaded into registers, ready to run.
+
+    Hooks named by an instruction set's actions are passed as keyword
+    arguments: out(value) and send(value) default to appending to `output`,
+    and receive(value) to taking the next value from `input`. A hook raises
+    Halt to stop the machine, or Blocked to leave it waiting at the
+    instruction until run() is called again, as the default receive does
+    when `input` is empty.
+
+    Attributes:
+        program: Program
+            the program as loaded; `tgl` changes only this machine's copy
+        registers: list
+            the value of each register, by index
+        ip: int
+            the address of the next instruction
+        output: list
+            the values sent by the default out and send hooks
+        input: deque
+            the values taken by the default receive hook
+        breakpoints: frozenset
+            the addresses run() stops before reaching
+        waiting: bool
+            whether the last run() stopped on Blocked
+
+    Methods:
+        reset
+        run
+        patch
+        set_breakpoints
+    """
+
+    def __init__(self, program: Program, registers: Optional[Dict[str, int]] = None, **hooks: Callable):
+        self.program = program
+        self.registers = [0] * len(program.isa.registers)
+        self.ip = 0
+        self.output = []
+        self.input = deque()
+        self.breakpoints = frozenset()
+        self.waiting = False
+        self._at_breakpoint = False
+        self._instructions = list(program.code)
+        self._source = list(program.source)
+        self._loops = program.loops
+        self._patches: Dict[int, Patch] = {}
+        self._namespace = {
+            "out": self.output.append,
+            "send": self.output.append,
+            "receive": self._receive,
+            **hooks,
+            "toggle": self._toggle,
+        }
+        self._code: List[Patch] = []
+        self._steps: List[Patch] = []
+        self._compile()
+        if registers:
+            self.reset(**registers)
+
+    def __getitem__(self, name: str) -> int:
+        return self.registers[self.program.isa.registers.index(name)]
+
+    def __setitem__(self, name: str, value: int):
+        self.registers[self.program.isa.registers.index(name)] = value
+
+    def reset(self, **registers: int):
+        """Return to the start of the program as loaded, with every register zero unless given."""
+        if self._instructions != list(self.program.code):
+            self._instructions = list(self.program.code)
+            self._source = list(self.program.source)
+            self._loops = self.program.loops
+            self._compile()
+        self.registers[:] = [0] * len(self.registers)
+        for name, value in registers.items():
+            self[name] = value
+        self.ip = 0
+        self.waiting = self._at_breakpoint = False
+        self.output.clear()
+        self.input.clear()
+
+    def patch(self, address: int, replacement: Patch):
+        """Run `replacement(registers)` instead of the code at `address`; it returns the next address.
+
+        This is how a solution substitutes a hand-derived shortcut for a
+        loop it has reverse engineered.
+        """
+        self._patches[address] = replacement
+        self._compile()
+
+    def set_breakpoints(self, *addresses: int):
+        """Make run() stop whenever it is about to execute one of `addresses`."""
+        self.breakpoints = frozenset(addresses)
+        self._compile()
+
+    def run(self, counts: Optional[List[int]] = None) -> bool:
+        """Run until the program ends, a breakpoint is reached or a hook raises Halt or Blocked.
+
+        Args:
+            counts: If given, a list with an entry per address to which the
+                executions of each instruction are added. The machine then
+                steps one instruction at a time.
+
+        Returns:
+            True if the instruction pointer left the program.
+        """
+        r, n = self.registers, len(self._code)
+        ip = self.ip
+        self.waiting = False
+        try:
+            if self._at_breakpoint and ip in self.breakpoints:
+                # step over the breakpoint stopped at last time
+                if counts is not None:
+                    counts[ip] += 1
+                ip = self._steps[ip](r)
+            if counts is None:
+                code = self._code
+                while 0 <= ip < n:
+                    ip = code[ip](r)
+            else:
+                steps, breakpoints = self._steps, self.breakpoints
+                while 0 <= ip < n and ip not in breakpoints:
+                    counts[ip] += 1
+                    ip = steps[ip](r)
+        except (Halt, Blocked) as stop:
+            self.ip = ip
+            self.waiting = isinstance(stop, Blocked)
+            # a breakpoint blocked on is still to be stepped over
+            self._at_breakpoint = self._at_breakpoint and self.waiting
+            return False
+        self._at_breakpoint = ip >= _BREAK or ip in self.breakpoints
+        if ip >= _BREAK:
+            ip -= _BREAK
+        self.ip = ip
+        if self.program.ip_register is not None:
+            r[self.program.ip_register] = ip
+        return not 0 <= ip < n
+
+    def _receive(self, _: int) -> int:
+        if not self.input:
+            raise Blocked
+        return self.input.popleft()
+
+    def _toggle(self, address: int):
+        if 0 <= address < len(self._source):
+            mnemonic, tokens = self._source[address]
+            mnemonic = self.program.isa.toggles[mnemonic]
+            self._source[address] = mnemonic, tokens
+            self._instructions[address] = self.program.isa.encode(mnemonic, tokens)
+            # a fused loop the toggle touched no longer matches its code
+            self._loops = find_loops(tuple(self._instructions), self.program.isa)
+            self._compile()
+
+    def _operand(self, ins: Instruction, n: int, address: int) -> str:
+        value = ins.args[n]
+        if not ins.registers >> n & 1:
+            return f"({value})" if value < 0 else str(value)
+        if value == self.program.ip_register:
+            # the bound register always holds the address of the running instruction
+            return str(address)
+        return f"r[{value}]"
+
+    def _statements(self, address: int, single: bool) -> List[str]:
+        """The body of the function running the code from `address` on."""
+        ops, ip_register, n = self.program.isa.ops, self.program.ip_register, len(self._instructions)
+        lines = [] if single or address not in self._loops else self._loops[address].source()
+        for at in range(address, min(address + (1 if single else MAX_RUN), n)):
+            if at != address and (at in self._patches or at in self.breakpoints or at in self._loops):
+                return lines + [f"return {at}"]
+            ins = self._instructions[at]
+            if ins is None:
+                continue
+            op = ops[self.program.isa.mnemonics[ins.op]]
+            if op.io and at != address:
+                return lines + [f"return {at}"]
+            values = {
+                "ip": at,
+                **{name: self._operand(ins, k, at) for k, name in enumerate("abc"[: len(ins.args)])},
+                **{name: f"r[{arg}]" for name, arg in zip("ABC", ins.args)},
+            }
+            if op.action:
+                lines.append(op.action.format(**values))
+            if ip_register is not None and any(
+                ins.registers >> k & 1 and ins.args[k] == ip_register for k in op.writes
+            ):
+                return lines + [f"return r[{ip_register}] + 1"]
+            if op.jump:
+                test = op.test.format(**values)
+                if test and "r[" not in test and not eval(test):
+                    continue
+                jump = op.jump.format(**values)
+                target = str(at + int(jump.strip("()"))) if "r[" not in jump else f"{at} + {jump}"
+                if not test or "r[" not in test:
+                    return lines + [f"return {target}"]
+                lines.append(f"if {test}: return {target}")
+            if op.io:
+                return lines + [f"return {at + 1}"]
+        return lines + [f"return {min(address + (1 if single else MAX_RUN), n)}"]
+
+    def _compile(self):
+        # each function is compiled the first time control reaches its address
+        n = len(self._instructions)
+        self._steps[:] = [self._patches.get(a) or self._stub(a, True) for a in range(n)]
+        self._code[:] = [self._patches.get(a) or self._stub(a, False) for a in range(n)]
+        for address in self.breakpoints:
+            if 0 <= address < n:
+                self._code[address] = lambda _, stop=_BREAK + address: stop
+
+    def _stub(self, address: int, single: bool) -> Patch:
+        def stub(r: List[int]) -> int:
+            function = self._function(address, single)
+            (self._steps if single else self._code)[address] = function
+            return function(r)
+
+        return stub
+
+    def _function(self, address: int, single: bool) -> Patch:
+        name = f"{'step' if single else 'run'}_{address}"
+        body = "\n    ".join(self._statements(address, single))
+        source = f"def {name}(r):\n    {body}\n"
+        if source not in _compiled:
+            _compiled[source] = compile(source, f"<{self.program.isa.name}>", "exec")
+        namespace = dict(self._namespace)
+        exec(_compiled[source], namespace)
+        return namespace[name]
+
+
+class Network:
+    """Copies of a program passing values to each other, run in turn in one thread.
+
+    Every machine sends to the input queue of the machine `route` names and
+    receives from its own, waiting when it is empty. Each is run until it
+    waits or stops, and then the next, so there are no threads or timeouts:
+    the network is deadlocked exactly when every machine still running is
+    waiting on an empty queue.
+
+    Attributes:
+        machines: list
+            the machines, in order
+        sent: list
+            the number of values each machine has sent
+    """
+
+    def __init__(
+        self,
+        program: Program,
+        size: int = 2,
+        registers: Optional[Callable[[int], Dict[str, int]]] = None,
+        route: Optional[Callable[[int], int]] = None,
+    ):
+        """
+        Initializes `size` machines running `program`, with empty queues.
+
+        Args:
+            program: The program each machine runs.
+            size: The number of machines.
+            registers: Returns the starting registers of machine n, e.g.
+                its id. Defaults to all zero.
+            route: Returns the machine that machine n sends to. Defaults to
+                the next machine, round a ring.
+        """
+        route = route or (lambda n: (n + 1) % size)
+        self.machines = [
+            Machine(program, registers(n) if registers else None, send=self._sender(n, route(n))) for n in range(size)
+        ]
+        self.sent = [0] * size
+        self._stopped = set()
+
+    def _sender(self, n: int, target: int) -> Callable[[int], None]:
+        def send(value: int):
+            self.machines[target].input.append(value)
+            self.sent[n] += 1
+
+        return send
+
+    def run(self) -> bool:
+        """Run the machines in turn until none can make progress.
+
+        Returns:
+            True if the network deadlocked, with at least one machine left
+            waiting for input that will never come.
+        """
+        progressed = True
+        while progressed:
+            progressed = False
+            for n, machine in enumerate(self.machines):
+                if n in self._stopped or (machine.waiting and not machine.input):
+                    continue
+                machine.run()
+                progressed = True
+                if not machine.waiting:
+                    self._stopped.add(n)
+        return any(machine.waiting for machine in self.machines)
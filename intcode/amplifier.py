@@ -1,7 +1,15 @@
-import threading
-from time import sleep
+from .intcode import Intcode, Snapshot
+from .scheduler import Scheduler
 
-from .intcode import Intcode
+
+def phase_chain(processor: Intcode, start: Snapshot, phases) -> int:
+    """Run the amplifiers in series with the given phase settings; usable as a sweep() task."""
+    out = 0
+    for phase in phases:
+        processor.restore(start)
+        processor.feed([phase, out])
+        out = processor.run_until(1)[0]
+    return out
 
 
 class Amplifier(object):
@@ -33,22 +41,12 @@ class Amplifier(object):
     def run_regeneration(self, inputs: str or list, trace=False, quiet=True):
         if isinstance(inputs, str):
             inputs = [int(v) for v in inputs.split(',')]
-        p = self._amps[0]
-        p.reset_core()
-        for n in self._amps[1:]:
-            p.connect(n.receiver)
-            p = n
-            p.reset_core()
-        self._amps[-1].connect(self._amps[0].receiver)
-        threads = []
+        following = {a: n for a, n in zip(self._amps, self._amps[1:] + self._amps[:1])}
         for a, n in zip(self._amps, inputs):
+            a.reset_core()
             a.receiver(n)
-            t = threading.Thread(target=a.simulate, kwargs={'trace': trace})
-            threads.append(t)
-            t.start()
         self._amps[0].receiver(0)
-        while any(t.is_alive() for t in threads):
-            sleep(0.0001)
+        Scheduler(self._amps, lambda a, value: following[a].receiver(value), trace=trace).run()
         self._print_log(quiet)
 
         return self._amps[0]._input.pop()
\ No newline at end of file
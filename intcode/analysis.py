@@ -0,0 +1,279 @@
+"""
+Static analysis of Intcode programs.
+
+analyse() follows every path from address 0 that can be seen without
+running the program: it decodes each reachable instruction once, splits
+them into basic blocks, links the blocks into a control-flow graph and
+marks everything it never reached as data. The compilers used to build the
+puzzle programs call subroutines by storing a return address on the
+relative-base stack and jumping, and return by jumping through that stack
+slot; both idioms are recognised, so a call's return address is followed
+as code and each subroutine entry is labelled.
+
+Jumps through a position-mode operand cannot be followed statically; their
+blocks are marked 'indirect'. Self-modifying code is analysed as loaded.
+
+Results are cached per program text, so the disassembler, the profiler and
+anything else inspecting a program share a single pass.
+"""
+from collections import namedtuple
+from typing import Dict, List, Optional, Set, Tuple
+
+from .intcode import DisStyle, decode, load_program, opcode_list
+
+Instruction = namedtuple('Instruction', 'addr op modes params')
+Block = namedtuple('Block', 'start end instructions successors kind')
+
+_analyses = {}
+
+
+def instruction_length(op: int) -> int:
+    return opcode_list[op].length
+
+
+def _operand(mode: int, value: int) -> str:
+    if mode == 0:
+        return f'[{value}]'
+    if mode == 1:
+        return f'#{value}'
+    return f'[rel{value:+d}]'
+
+
+def format_instruction(ins: Instruction) -> str:
+    """Format an instruction like Intcode.opcode(), without a machine to ask."""
+    code = opcode_list[ins.op]
+    dump = f'{ins.op + sum(m * 10 ** (n + 2) for n, m in enumerate(ins.modes)):05} ' \
+           + ' '.join(f'{v:5}' for v in ins.params)
+    p = [_operand(m, v) for m, v in zip(ins.modes, ins.params)]
+    if code.dis_style == DisStyle.THREE_PARAM:
+        text = f'{p[2]} ← {p[0]} {code.instruction} {p[1]}'
+    elif code.dis_style == DisStyle.IN_PARAM:
+        text = f'{p[0]} ← {code.instruction}'
+    elif code.dis_style == DisStyle.OUT_PARAM:
+        text = f'{code.instruction} ← {p[0]}'
+    elif code.dis_style == DisStyle.COND_JUMP:
+        text = f'{code.instruction} ({p[0]}) {p[1]}'
+    elif code.dis_style == DisStyle.RELATIVE:
+        text = f'{code.instruction} {p[0]}'
+    else:
+        text = 'HALT'
+    return f'{dump:23} : {text:25}'
+
+
+def _always_taken(ins: Instruction) -> Optional[bool]:
+    """Whether a jump with a constant condition is always (True) or never (False) taken."""
+    if ins.modes[0] != 1:
+        return None
+    return (ins.params[0] != 0) == (ins.op == 5)
+
+
+def _pushed_constant(ins: Instruction) -> Optional[int]:
+    """The value an ADD or MUL of two constants stores on the relative-base stack."""
+    if ins.op in (1, 2) and ins.modes == (1, 1, 2):
+        a, b, _ = ins.params
+        return a + b if ins.op == 1 else a * b
+    return None
+
+
+class Analysis(object):
+    """The control-flow graph of an Intcode program, as loaded.
+
+    Attributes:
+        size: int
+            the number of words in the program
+        instructions: dict
+            every reachable Instruction, by address
+        blocks: dict
+            every basic Block, by start address
+        functions: set
+            the entry addresses of called subroutines
+        calls: dict
+            the subroutine entry called by the goto at each address
+        data: list
+            (start, end) ranges of words never reached as code
+    """
+
+    def __init__(self, mem_str: str):
+        self._program = load_program(mem_str)
+        self.size = len(self._program)
+        self.instructions: Dict[int, Instruction] = {}
+        self.blocks: Dict[int, Block] = {}
+        self.functions: Set[int] = set()
+        self.calls: Dict[int, int] = {}
+        self.data: List[Tuple[int, int]] = []
+        self._successors: Dict[int, Tuple[List[int], str]] = {}
+        self._pointers: Set[int] = set()
+        self._trace([0])
+        self._trace_callbacks()
+        self._split_blocks()
+        self._find_data()
+
+    def _decode(self, addr: int) -> Optional[Instruction]:
+        program = self._program
+        try:
+            op, *modes = decode(program[addr])
+        except (KeyError, ValueError):
+            return None
+        length = instruction_length(op)
+        if addr + length > self.size:
+            return None
+        return Instruction(addr, op, tuple(modes[:length - 1]), tuple(program[addr + 1:addr + length]))
+
+    def _exits(self, ins: Instruction, pushed: Optional[int]) -> Tuple[List[int], str]:
+        """Where control can go after `ins`, and how the block it ends is left."""
+        nxt = ins.addr + 1 + len(ins.params)
+        if ins.op == 99:
+            return [], 'halt'
+        if ins.op not in (5, 6):
+            return [nxt], 'fall'
+        taken = _always_taken(ins)
+        if taken is False:
+            return [nxt], 'fall'
+        mode, target = ins.modes[1], ins.params[1]
+        call = taken and pushed == nxt
+        if mode != 1:
+            if call:
+                # through a function pointer: only the way back is known
+                return [nxt], 'indirect'
+            if taken and mode == 2:
+                return [], 'return'
+            return ([] if taken else [nxt]), 'indirect'
+        if not taken:
+            return [target, nxt], 'branch'
+        if call:
+            self.calls[ins.addr] = target
+            self.functions.add(target)
+            return [target, nxt], 'call'
+        return [target], 'goto'
+
+    def _is_entry(self, addr: int) -> bool:
+        """Whether code starts at `addr` like a compiled subroutine, by growing the stack."""
+        program = self._program
+        return 0 <= addr < self.size - 1 and program[addr] == 109 and program[addr + 1] > 0
+
+    def _trace(self, pending: List[int]) -> bool:
+        """Follow every path from the `pending` entries; False if one runs into a bad instruction."""
+        clean = True
+        while pending:
+            addr = pending.pop()
+            pushed = None
+            while addr not in self.instructions:
+                ins = self._decode(addr) if 0 <= addr < self.size else None
+                if ins is None:
+                    clean = False
+                    break
+                self.instructions[addr] = ins
+                successors, kind = self._exits(ins, pushed)
+                self._successors[addr] = successors, kind
+                value = _pushed_constant(ins)
+                if value is not None:
+                    pushed = value
+                    self._pointers.add(value)
+                if kind != 'fall':
+                    pending.extend(successors)
+                    break
+                addr = successors[0]
+        return clean
+
+    def _trace_callbacks(self):
+        """Follow subroutines reached only through pointers, keeping those that decode cleanly.
+
+        Constants passed as arguments are tried first, then any word in the
+        program, such as a handler in a table.
+        """
+        for pointers in (lambda: self._pointers, lambda: set(self._program)):
+            while True:
+                found = False
+                for entry in sorted(p for p in pointers() - self.instructions.keys() if self._is_entry(p)):
+                    saved = (dict(self.instructions), dict(self._successors), set(self.functions),
+                             dict(self.calls), set(self._pointers))
+                    if self._trace([entry]):
+                        self.functions.add(entry)
+                        found = True
+                    else:
+                        self.instructions, self._successors, self.functions, self.calls, self._pointers = saved
+                if not found:
+                    break
+
+    def _split_blocks(self):
+        leaders = {0} | self.functions
+        for addr, (successors, kind) in self._successors.items():
+            if kind != 'fall':
+                leaders.update(successors)
+        for start in sorted(leaders & self.instructions.keys()):
+            body = []
+            addr = start
+            while True:
+                ins = self.instructions[addr]
+                body.append(ins)
+                successors, kind = self._successors[addr]
+                if kind != 'fall':
+                    break
+                addr = successors[0]
+                if addr in leaders or addr not in self.instructions:
+                    kind = 'fall' if addr in self.instructions else 'end'
+                    successors = successors if kind == 'fall' else []
+                    break
+            end = body[-1].addr + 1 + len(body[-1].params)
+            self.blocks[start] = Block(start, end, tuple(body), tuple(successors), kind)
+
+    def _find_data(self):
+        code = bytearray(self.size)
+        for ins in self.instructions.values():
+            code[ins.addr:ins.addr + 1 + len(ins.params)] = b'\x01' * (1 + len(ins.params))
+        start = None
+        for addr in range(self.size + 1):
+            if addr < self.size and not code[addr]:
+                if start is None:
+                    start = addr
+            elif start is not None:
+                self.data.append((start, addr))
+                start = None
+
+    def is_code(self, addr: int) -> bool:
+        return not any(lo <= addr < hi for lo, hi in self.data)
+
+    def block_at(self, addr: int) -> Optional[Block]:
+        """Return the block containing the instruction at `addr`, if any."""
+        for block in self.blocks.values():
+            if block.start <= addr < block.end:
+                return block
+        return None
+
+    def label(self, addr: int) -> str:
+        return f'sub_{addr:05}' if addr in self.functions else f'L{addr:05}'
+
+    def _comment(self, block: Block, ins: Instruction) -> str:
+        if ins is not block.instructions[-1]:
+            return ''
+        if block.kind == 'call':
+            return f'; call {self.label(block.successors[0])}'
+        if block.kind in ('goto', 'branch'):
+            return f'; → {self.label(block.successors[0])}'
+        if block.kind in ('return', 'indirect'):
+            return f'; {block.kind}'
+        return ''
+
+    def listing(self) -> List[str]:
+        """Return the program as labelled blocks of code and rows of data, in address order."""
+        lines = []
+        regions = [(block.start, block) for block in self.blocks.values()] + [(lo, hi) for lo, hi in self.data]
+        for start, region in sorted(regions, key=lambda r: r[0]):
+            if isinstance(region, Block):
+                lines.append(f'{self.label(start)}:')
+                for ins in region.instructions:
+                    lines.append(f'{ins.addr:05} : {format_instruction(ins)} {self._comment(region, ins)}'.rstrip())
+            else:
+                lines.append(f'data_{start:05}:')
+                for addr in range(start, region, 10):
+                    words = ' '.join(f'{v:5}' for v in self._program[addr:min(addr + 10, region)])
+                    lines.append(f'{addr:05} : {words}')
+        return lines
+
+
+def analyse(mem_str: str) -> Analysis:
+    """Return the analysis of a program, made once per distinct program text."""
+    analysis = _analyses.get(mem_str)
+    if analysis is None:
+        analysis = _analyses[mem_str] = Analysis(mem_str)
+    return analysis
@@ -0,0 +1,55 @@
+from typing import List
+
+from .intcode import Intcode
+
+
+class AsciiChannel(object):
+    """Line-at-a-time ASCII I/O with an Intcode machine.
+
+    Commands go in as whole strings and output comes back as decoded text,
+    so a program that talks in ASCII (the 2019/17 vacuum robot, the 2019/21
+    springdroid, the 2019/25 text adventure) costs one call per exchange
+    rather than one per character. Values outside the ASCII range, such as
+    a final answer, are collected separately in `values`.
+
+    Attributes:
+        processor: Intcode
+            the machine being talked to
+        values: list
+            every non-ASCII value output so far, in order
+    """
+
+    def __init__(self, processor: Intcode):
+        self.processor = processor
+        self.values = []
+
+    @property
+    def halted(self):
+        return self.processor.halted
+
+    def send(self, *lines: str):
+        """Queue each line as input, adding the newline ending any line without one."""
+        for line in lines:
+            self.processor.feed(line if line.endswith('\n') else line + '\n')
+
+    def read(self, count: int = None) -> str:
+        """Run until input is needed or the machine halts, and return the text output.
+
+        Args:
+            count: The most values to read. Defaults to no limit.
+        """
+        out = self.processor.run_until(count)
+        try:
+            return bytes(out).decode('ascii')
+        except ValueError:
+            self.values.extend(v for v in out if not 0 <= v < 128)
+            return ''.join(chr(v) for v in out if 0 <= v < 128)
+
+    def read_lines(self) -> List[str]:
+        """Run until input is needed or the machine halts, and return the output lines."""
+        return self.read().splitlines()
+
+    def exchange(self, *lines: str) -> str:
+        """Send the lines and return the text output in reply."""
+        self.send(*lines)
+        return self.read()
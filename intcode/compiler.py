@@ -0,0 +1,287 @@
+"""
+Basic-block compiler for Intcode programs.
+
+CompiledIntcode runs a program by translating blocks of ADD, MUL, LT, EQ,
+RB and jump instructions into Python functions, generated as source and
+built with compile(). A block carries on past a conditional jump, returning
+the target when the jump is taken, and a jump back to the block's own start
+becomes a loop inside the function. Blocks are looked up by address in a
+jump table, so a taken branch costs one list index and one call however far
+it goes.
+
+Operand words are baked into the generated code, so each block guards every
+write it makes: if a write lands inside any compiled block, the block stops
+and the blocks covering that address are discarded, to be compiled again
+from the changed memory. A program that keeps rewriting its own code is
+handed over to the interpreter for the rest of the run.
+
+Input, output and halt instructions, and any instruction reaching beyond
+the dense region of memory, are executed by the driver itself, so the
+connect() callbacks, run() events and Scheduler all work unchanged.
+"""
+from .intcode import Event, Intcode, decode
+
+# block exit codes, alongside a written address (>= 0) that hit compiled code
+CONTINUE = -1
+INTERPRET = -2
+
+MAX_BLOCK = 64
+MAX_INVALIDATIONS = 16
+
+_compiled = {}
+
+
+def _operand(core, addr: int, volatile):
+    """The source for an operand word: a constant, or a live read if the program rewrites it."""
+    return f'core[{addr}]' if addr in volatile else str(core[addr])
+
+
+def _read(mode, word):
+    if mode == 0:
+        return f'core[{word}]'
+    if mode == 1:
+        return word
+    return f'core[rb + {word}]'
+
+
+def block_source(core, start: int, size: int, volatile=frozenset()):
+    """Return the Python source for the block at `start`, its end and the words it bakes in.
+
+    A block runs on through conditional jumps, leaving when one is taken,
+    and follows gotos (jumps on a constant) to code it has not yet covered.
+
+    Operand words in `volatile` (addresses the program has been seen to
+    write) are read from memory as the block runs instead of being baked
+    into the code; an instruction word in `volatile` ends the block. The
+    source is None if the instruction at `start` cannot begin a block, i.e.
+    it must be interpreted.
+    """
+    lines = []
+    baked = []
+    visited = set()
+    pc = start
+    loop = False
+    while pc < size and len(visited) < MAX_BLOCK and pc not in volatile and pc not in visited:
+        visited.add(pc)
+        try:
+            op, m1, m2, m3 = decode(core[pc])
+        except (KeyError, ValueError):
+            break
+        length = 2 if op == 9 else 3 if op in (5, 6) else 4
+        if op in (3, 4, 99) or pc + length > size:
+            break
+        params = [_operand(core, pc + n, volatile) for n in range(1, length)]
+        baked.extend(a for a in range(pc, pc + length) if a not in volatile)
+        nxt = pc + length
+        lines.append(f'ip = {pc}')
+        if op in (1, 2, 7, 8):
+            a, b = _read(m1, params[0]), _read(m2, params[1])
+            expr = {1: f'{a} + {b}', 2: f'{a} * {b}',
+                    7: f'1 if {a} < {b} else 0', 8: f'1 if {a} == {b} else 0'}[op]
+            lines.append(f't = rb + {params[2]}' if m3 == 2 else f't = {params[2]}')
+            lines.append(f'core[t] = {expr}')
+            lines.append(f'if code[t]: return {nxt}, rb, t')
+        elif op == 9:
+            lines.append(f'rb += {_read(m1, params[0])}')
+        else:
+            target = _read(m2, params[1])
+            if m1 == 1 and not params[0].startswith('core'):
+                # a constant condition: either a goto or never taken
+                if (int(params[0]) != 0) != (op == 5):
+                    pc = nxt
+                    continue
+                if m2 == 1 and target == str(start):
+                    loop = True
+                    lines.append('continue')
+                    break
+                if m2 == 1 and not target.startswith('core') and int(target) not in visited:
+                    pc = int(target)
+                    continue
+                lines.append(f'return {target}, rb, {CONTINUE}')
+                break
+            cond = _read(m1, params[0])
+            cond = f'{cond} != 0' if op == 5 else f'{cond} == 0'
+            if m2 == 1 and target == str(start):
+                loop = True
+                lines.append(f'if {cond}: continue')
+            else:
+                lines.append(f'if {cond}: return {target}, rb, {CONTINUE}')
+        pc = nxt
+    if lines and not lines[-1].startswith(('return', 'continue')):
+        lines.append(f'return {pc}, rb, {CONTINUE}')
+    if not lines:
+        return None, start, baked
+    body = lines
+    if loop:
+        body = ['while True:'] + ['    ' + line for line in body]
+    source = '\n'.join(
+        [f'def block_{start}(core, rb, code):', '    ip = 0', '    try:']
+        + ['        ' + line for line in body]
+        + ['    except IndexError:', f'        return ip, rb, {INTERPRET}']
+    )
+    return source, pc, sorted(baked)
+
+
+def compile_block(core, start: int, size: int, volatile=frozenset()):
+    """Compile the basic block at `start` into a function.
+
+    Returns the function (None if the instruction must be interpreted), the
+    block's end address and the addresses of the words baked into it.
+    """
+    source, end, baked = block_source(core, start, size, volatile)
+    if source is None:
+        return None, end, baked
+    namespace = {}
+    exec(compile(source, f'<intcode block {start}>', 'exec'), namespace)
+    return namespace[f'block_{start}'], end, baked
+
+
+def _runs(addresses):
+    """Split sorted addresses into (lo, hi) ranges of consecutive addresses."""
+    runs = []
+    for a in addresses:
+        if runs and runs[-1][1] == a:
+            runs[-1][1] = a + 1
+        else:
+            runs.append([a, a + 1])
+    return runs
+
+
+class CompiledIntcode(Intcode):
+    """An Intcode machine that runs compiled basic blocks instead of interpreting.
+
+    A drop-in replacement for Intcode: untraced simulate(), run() and the
+    Scheduler use the compiled blocks, while traced runs still go through
+    step(). Compiled blocks are shared between every machine loaded with the
+    same program text, and reused wherever the words they baked in still
+    match memory. Addresses that a program writes inside its own code are
+    remembered per program, and later compiles read them live.
+    """
+
+    def _block(self, core, ip: int, size: int):
+        shared, volatile = _compiled.setdefault(self._mem_str, ({}, set()))
+        entry = shared.get(ip)
+        if entry is not None:
+            func, runs, segments = entry
+            if all(core[lo:hi] == words for lo, hi, words in segments):
+                return func, runs
+            # rewritten since the block was compiled, so read those live
+            volatile.update(a for lo, hi, words in segments
+                            for a, w in zip(range(lo, hi), words) if core[a] != w)
+        func, _, baked = compile_block(core, ip, size, volatile)
+        runs = _runs(baked)
+        # an instruction left to the interpreter stays so while its word is unchanged
+        checked = runs if func is not None else [[ip, ip + 1]]
+        shared[ip] = func, runs, [(lo, hi, core[lo:hi]) for lo, hi in checked]
+        return func, runs
+
+    def run(self):
+        """Run untraced as a generator that pauses for I/O, like Intcode.run().
+
+        An nmi() is noticed whenever the generator is resumed.
+        """
+        volatile = _compiled.setdefault(self._mem_str, ({}, set()))[1]
+        mem = self._core
+        core = mem.dense
+        size = len(core)
+        blocks = [None] * size
+        installed = {}
+        code = bytearray(size)
+        invalidations = 0
+        inputs = self._input
+        ip = self._ip
+        rb = self._relative_base
+        if self._nmi:
+            return
+
+        def invalidate(addr):
+            volatile.add(addr)
+            for start, runs in list(installed.items()):
+                if any(lo <= addr < hi for lo, hi in runs):
+                    del installed[start]
+                    blocks[start] = None
+            code[:] = bytes(len(code))
+            for runs in installed.values():
+                for lo, hi in runs:
+                    code[lo:hi] = b'\x01' * (hi - lo)
+
+        try:
+            while 0 <= ip < size:
+                func = blocks[ip]
+                if func is None:
+                    func, runs = self._block(core, ip, size)
+                    if func is None:
+                        # always interpreted; decoded afresh on every visit
+                        blocks[ip] = False
+                    else:
+                        blocks[ip] = func
+                        installed[ip] = runs
+                        for lo, hi in runs:
+                            code[lo:hi] = b'\x01' * (hi - lo)
+                if func:
+                    ip, rb, flag = func(core, rb, code)
+                    if flag == CONTINUE:
+                        continue
+                    if flag >= 0:
+                        invalidate(flag)
+                        invalidations += 1
+                        if invalidations > MAX_INVALIDATIONS:
+                            break
+                        continue
+                # interpret the single instruction at ip
+                op, m1, _, _ = decode(core[ip])
+                target = None
+                if op == 3:
+                    if inputs:
+                        value = inputs.pop()
+                    else:
+                        self._ip, self._relative_base = ip, rb
+                        value = yield Event.INPUT, None
+                        if self._nmi:
+                            return
+                        if value is None:
+                            continue
+                    target = mem[ip + 1] + (rb if m1 == 2 else 0)
+                    mem[target] = value
+                    ip += 2
+                elif op == 4:
+                    a = mem[ip + 1]
+                    if m1 == 0:
+                        a = mem[a]
+                    elif m1 == 2:
+                        a = mem[rb + a]
+                    ip += 2
+                    self._ip, self._relative_base = ip, rb
+                    yield Event.OUTPUT, a
+                    if self._nmi:
+                        return
+                    continue
+                elif op == 99:
+                    self._halted = True
+                    return
+                else:
+                    self._ip, self._relative_base = ip, rb
+                    target = self.parameter(3, target=True) if op in (1, 2, 7, 8) else None
+                    self.step()
+                    ip, rb = self._ip, self._relative_base
+                if len(core) > size:
+                    grown = len(core) - size
+                    blocks.extend([None] * grown)
+                    code.extend(bytes(grown))
+                    size = len(core)
+                if target is not None and 0 <= target < size and code[target]:
+                    invalidate(target)
+                    invalidations += 1
+                    if invalidations > MAX_INVALIDATIONS:
+                        break
+            else:
+                if ip != size:
+                    raise ValueError(f'Bad IP {ip}, IP can only be set within code space 0—{size - 1}')
+                return
+            # too much self-modification: the interpreter takes over
+            self._ip, self._relative_base = ip, rb
+            mem.decoded[:] = [None] * len(mem.decoded)
+            yield from Intcode.run(self)
+            ip, rb = self._ip, self._relative_base
+        finally:
+            self._ip, self._relative_base = ip, rb
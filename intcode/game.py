@@ -46,12 +46,33 @@ class Game(object):
     def _sender(self):
         return sign(self.ball_pos - self.bat_pos)
 
+    def _draw(self, outputs):
+        for x, y, tile in zip(*[iter(outputs)] * 3):
+            if (x, y) == (-1, 0):
+                self.score = tile
+            else:
+                self._rect.include((x, y))
+                self._game_grid[f'{x},{y}'] = tile
+                if tile == 3:
+                    self.bat_pos = x
+                elif tile == 4:
+                    self.ball_pos = x
+
     def run(self, inputs=None, trace=False):
         if inputs is None:
             inputs = []
         self._output_state = 0
-        self._processor.connect(self._receiver, self._sender)
-        self._processor.simulate(inputs, trace=trace, verbose=True)
+        if trace:
+            self._processor.connect(self._receiver, self._sender)
+            self._processor.simulate(inputs, trace=trace, verbose=True)
+            return
+        # draw each frame from the whole batch of tiles output before the joystick is read
+        self._processor.feed(inputs)
+        while True:
+            self._draw(self._processor.run_until())
+            if not self._processor.waiting:
+                break
+            self._processor.receiver(self._sender())
 
     def count_block_tiles(self):
         return sum(1 for n in self._game_grid.values() if n == 2)
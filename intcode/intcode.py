@@ -1,4 +1,6 @@
+import copy
 import operator
+from array import array
 from collections import namedtuple, deque
 from enum import IntEnum
 from time import sleep
@@ -19,6 +21,12 @@ class DisStyle(IntEnum):
     RELATIVE = 5  # offset
 
 
+class Event(IntEnum):
+    INPUT = 0  # waiting on an empty input queue
+    OUTPUT = 1  # value produced
+
+
+Snapshot = namedtuple('Snapshot', 'core ip relative_base input output halted')
 OpCodes = namedtuple('OpCodes', 'num instruction length op dis_style')
 opcode_list = {
     1: OpCodes(1, 'ADD', 4, operator.add, DisStyle.THREE_PARAM),
@@ -38,6 +46,105 @@ def prepare_mem(init_mem: str):
     return [int(v) for v in init_mem.split(',')]
 
 
+_programs = {}
+
+
+def load_program(mem_str: str) -> array:
+    """Parse a program into a packed array, once per distinct program text."""
+    image = _programs.get(mem_str)
+    if image is None:
+        image = _programs[mem_str] = array('q', prepare_mem(mem_str))
+    return image
+
+
+class Memory(object):
+    """Intcode memory that reads as zero at every unwritten address.
+
+    Program space is a packed array of 64-bit words, grown in pages when the
+    program writes a little past its end; writes far beyond that land in a
+    sparse map instead. The array also carries the per-address decode cache
+    used by Intcode.run(), and every write through Memory drops the decoded
+    entry at that address.
+
+    Indexing a Memory takes an address or a slice; negative addresses raise
+    IndexError. len() and iteration cover the dense region only.
+    """
+    PAGE = 256
+    GROWTH = 65536
+
+    __slots__ = ('dense', 'sparse', 'decoded')
+
+    def __init__(self, image: array, sparse: dict = None, decoded: list = None):
+        self.dense = image[:]
+        self.sparse = {} if sparse is None else sparse
+        self.decoded = [None] * len(image) if decoded is None else decoded
+
+    def copy(self) -> 'Memory':
+        return Memory(self.dense, self.sparse.copy(), self.decoded.copy())
+
+    def __len__(self):
+        return len(self.dense)
+
+    def __iter__(self):
+        return iter(self.dense)
+
+    def __eq__(self, other):
+        if isinstance(other, Memory):
+            return self.dense == other.dense and self.sparse == other.sparse
+        return NotImplemented
+
+    def __getitem__(self, addr):
+        if isinstance(addr, slice):
+            return [self[a] for a in range(*addr.indices(max(addr.stop or 0, len(self.dense))))]
+        if addr < 0:
+            raise IndexError(f'Negative address {addr}')
+        if addr < len(self.dense):
+            return self.dense[addr]
+        return self.sparse.get(addr, 0)
+
+    def __setitem__(self, addr, value):
+        dense = self.dense
+        if addr < 0:
+            raise IndexError(f'Negative address {addr}')
+        if addr >= len(dense) and addr < len(dense) + self.GROWTH:
+            self._grow(addr + 1)
+        if addr < len(dense):
+            dense[addr] = value
+            self.decoded[addr] = None
+        else:
+            self.sparse[addr] = value
+
+    def _grow(self, size: int):
+        """Extend the dense region to cover `size` words, absorbing sparse entries."""
+        extra = -(-(size - len(self.dense)) // self.PAGE) * self.PAGE
+        start = len(self.dense)
+        self.dense.frombytes(bytes(extra * self.dense.itemsize))
+        self.decoded.extend([None] * extra)
+        for addr in [a for a in self.sparse if a < start + extra]:
+            self.dense[addr] = self.sparse.pop(addr)
+
+
+_decoded_words = {}
+
+
+def decode(word: int):
+    """Split an instruction word into its opcode and three parameter modes.
+
+    Modes are returned as plain ints for speed; results are shared between
+    every processor, as programs reuse a small set of instruction words.
+    """
+    d = _decoded_words.get(word)
+    if d is None:
+        op = word % 100
+        if op not in opcode_list:
+            raise KeyError(op)
+        d = _decoded_words[word] = (op,
+                                    int(ParameterMode((word // 100) % 10)),
+                                    int(ParameterMode((word // 1000) % 10)),
+                                    int(ParameterMode((word // 10000) % 10)))
+    return d
+
+
 def join_comments(comments: list) -> str:
     comments = [c for c in comments if len(c.strip()) > 0]
     if len(comments) > 0:
@@ -46,11 +153,15 @@ def join_comments(comments: list) -> str:
 
 
 class Intcode(object):
+    # the most log messages kept; older ones are dropped as a traced run goes on
+    LOG_SIZE = 100000
+
     def __init__(self, mem_str: str, name: str = 'Intcode'):
         self.name = name
-        self._log = []
-        self._core = []
+        self._log = deque(maxlen=self.LOG_SIZE)
+        self._core = None
         self._mem_str = mem_str
+        self._image = load_program(mem_str)
         self._ip = 0
         self._relative_base = 0
         self._input = deque()
@@ -62,16 +173,52 @@ class Intcode(object):
         self._receiver = None
         self._receiver2 = None
         self._nmi = False
+        self._halted = False
 
     def reset_core(self):
         self._log.clear()
-        self._core = prepare_mem(self._mem_str + (',0' * len(self._mem_str) * 2))
+        self._core = Memory(self._image)
         self._input.clear()
         self._output.clear()
         self._ip = 0
         self._relative_base = 0
         self._verbose = False
         self._nmi = False
+        self._halted = False
+
+    def snapshot(self) -> Snapshot:
+        """Capture the machine state: memory, registers and I/O queues."""
+        return Snapshot(self._core.copy(), self._ip, self._relative_base,
+                        tuple(self._input), tuple(self._output), self._halted)
+
+    def restore(self, snap: Snapshot):
+        """Return the machine to a state captured by snapshot().
+
+        The snapshot is left untouched and can be restored again. Start a new
+        run() or simulate() afterwards; a paused run() keeps its own position.
+        """
+        self._core = snap.core.copy()
+        self._ip = snap.ip
+        self._relative_base = snap.relative_base
+        self._input = deque(snap.input)
+        self._output = list(snap.output)
+        self._halted = snap.halted
+        self._nmi = False
+
+    def fork(self, name: str = None) -> 'Intcode':
+        """Return an independent machine in the same state, for branching searches.
+
+        The fork shares the parsed program but has its own memory, queues and
+        log, and no connect() callbacks.
+        """
+        twin = copy.copy(self)
+        twin.name = self.name if name is None else name
+        twin._log = deque(maxlen=self.LOG_SIZE)
+        twin.connect()
+        twin._core = self._core.copy()
+        twin._input = deque(self._input)
+        twin._output = list(self._output)
+        return twin
 
     def log(self, msg):
         self._log.append(msg)
@@ -79,7 +226,7 @@ class Intcode(object):
             print(msg)
 
     def get_log(self):
-        return self._log
+        return list(self._log)
 
     def current_instruction(self):
         return opcode_list[int(self.core[self.ip] % 100)]
@@ -88,8 +235,6 @@ class Intcode(object):
         if 0 < param_num < self.current_instruction().length:
             mode = ParameterMode((self.core[self.ip] // 10 ** (param_num + 1)) % 10)
             param = self.core[self.ip + param_num]
-            if mode in [ParameterMode.POSITION, ParameterMode.RELATIVE] and param > len(self.core):
-                print(f'param @{param} in memory 0—{len(self.core)}')
             return mode, param
         else:
             raise OverflowError(f'Incorrect parameter number: {param_num} at instruction {self.ip}')
@@ -130,8 +275,7 @@ class Intcode(object):
         if trace:
             self.log(f'Incoming input: {in_val}')
         if isinstance(in_val, str):
-            for c in in_val:
-                self._input.appendleft(ord(c))
+            self._input.extendleft(map(ord, in_val))
         else:
             self._input.appendleft(in_val)
 
@@ -150,6 +294,16 @@ class Intcode(object):
     def core(self):
         return self._core
 
+    @property
+    def halted(self):
+        return self._halted
+
+    @property
+    def waiting(self):
+        """Whether the machine stopped at an input instruction with nothing queued to read."""
+        return (not self._halted and not self._nmi and self._ip < len(self._core)
+                and self._core[self._ip] % 100 == 3 and not self._input)
+
     @property
     def output(self):
         return self._output
@@ -236,6 +390,7 @@ class Intcode(object):
             if trace:
                 self.log(f'        Relative base now: @{self._relative_base}')
         elif inst.dis_style == DisStyle.NO_PARAM:
+            self._halted = True
             raise GeneratorExit(f'Halt at {self.ip}')
         self.ip += inst.length
 
@@ -244,6 +399,9 @@ class Intcode(object):
         self.log('Begin simulation' + (f' with default inputs {inputs}' if inputs is not None else ''))
         if inputs:
             self._input.extendleft(inputs)
+        if not trace:
+            self._run_fast()
+            return
         while self.ip < len(self.core) and not self._nmi:
             if trace:
                 inst = self.current_instruction()
@@ -253,6 +411,200 @@ class Intcode(object):
             except GeneratorExit:
                 break
 
+    def run(self, trace=False):
+        """Run as a generator that pauses for I/O.
+
+        Yields (Event.OUTPUT, value) for every value output, and
+        (Event.INPUT, None) when an input instruction finds the input queue
+        empty. Resume with send(value) to supply the input directly, or queue
+        it with receiver() and resume with next(). The generator finishes when
+        the program halts, is interrupted or runs off the end of memory;
+        connect() callbacks are not used.
+
+        Each instruction word is decoded once into its opcode and parameter
+        modes; the decoded entry is dropped whenever the program writes over
+        that address, so self-modifying code still behaves. Machine state is
+        held in locals and written back whenever control is yielded.
+        Instructions reaching beyond the dense region of Memory are handed to
+        step(). With `trace`, every instruction is stepped and logged as in a
+        traced simulate(), with the same events.
+        """
+        if trace:
+            yield from self._run_traced()
+            return
+        mem = self._core
+        core = mem.dense
+        decoded = mem.decoded
+        size = len(core)
+        inputs = self._input
+        ip = self._ip
+        rb = self._relative_base
+        try:
+            while ip < size and not self._nmi:
+                d = decoded[ip]
+                if d is None:
+                    d = decoded[ip] = decode(core[ip])
+                op, m1, m2, m3 = d
+                try:
+                    if op == 1 or op == 2 or op == 7 or op == 8:
+                        a = core[ip + 1]
+                        if m1 == 0:
+                            a = core[a]
+                        elif m1 == 2:
+                            a = core[rb + a]
+                        b = core[ip + 2]
+                        if m2 == 0:
+                            b = core[b]
+                        elif m2 == 2:
+                            b = core[rb + b]
+                        c = core[ip + 3]
+                        if m3 == 2:
+                            c += rb
+                        if op == 1:
+                            core[c] = a + b
+                        elif op == 2:
+                            core[c] = a * b
+                        elif op == 7:
+                            core[c] = 1 if a < b else 0
+                        else:
+                            core[c] = 1 if a == b else 0
+                        decoded[c] = None
+                        ip += 4
+                    elif op == 5 or op == 6:
+                        a = core[ip + 1]
+                        if m1 == 0:
+                            a = core[a]
+                        elif m1 == 2:
+                            a = core[rb + a]
+                        if (a != 0) if op == 5 else (a == 0):
+                            b = core[ip + 2]
+                            if m2 == 0:
+                                b = core[b]
+                            elif m2 == 2:
+                                b = core[rb + b]
+                            if not 0 <= b < size:
+                                raise ValueError(f'Bad IP {b}, IP can only be set within code space 0—{size - 1}')
+                            ip = b
+                        else:
+                            ip += 3
+                    elif op == 9:
+                        a = core[ip + 1]
+                        if m1 == 0:
+                            a = core[a]
+                        elif m1 == 2:
+                            a = core[rb + a]
+                        rb += a
+                        ip += 2
+                    elif op == 3:
+                        if inputs:
+                            value = inputs.pop()
+                        else:
+                            self._ip, self._relative_base = ip, rb
+                            value = yield Event.INPUT, None
+                            if value is None:
+                                continue
+                        mem[mem[ip + 1] + (rb if m1 == 2 else 0)] = value
+                        size = len(core)
+                        ip += 2
+                    elif op == 4:
+                        a = mem[ip + 1]
+                        if m1 == 0:
+                            a = mem[a]
+                        elif m1 == 2:
+                            a = mem[rb + a]
+                        ip += 2
+                        self._ip, self._relative_base = ip, rb
+                        yield Event.OUTPUT, a
+                    else:
+                        self._halted = True
+                        break
+                except IndexError:
+                    # an operand lies beyond the dense region: take the slow
+                    # path once, which reads and writes through Memory
+                    if op == 3 or op == 4:
+                        raise
+                    self._ip, self._relative_base = ip, rb
+                    self.step()
+                    ip, rb, size = self._ip, self._relative_base, len(core)
+        finally:
+            self._ip, self._relative_base = ip, rb
+
+    def _run_traced(self):
+        """run() one logged step() at a time, yielding the same events."""
+        while self.ip < len(self.core) and not self._nmi:
+            inst = self.current_instruction()
+            self.log(f'{self.ip:05} : {self.opcode(inst, trace=True)}')
+            if inst.dis_style == DisStyle.IN_PARAM:
+                while not self._input:
+                    self.log(f'Waiting for input (@{self.ip:05})')
+                    value = yield Event.INPUT, None
+                    if value is not None:
+                        self._input.append(value)
+            elif inst.dis_style == DisStyle.OUT_PARAM:
+                value = self.parameter(1)
+                self.log(f'        Sending out (@{self.ip:05}) → {value}')
+                self.ip += inst.length
+                yield Event.OUTPUT, value
+                continue
+            try:
+                self.step(trace=True)
+            except GeneratorExit:
+                break
+
+    def feed(self, values):
+        """Queue a whole batch of input at once: a string, as its character codes, or integers."""
+        if isinstance(values, str):
+            values = map(ord, values)
+        self._input.extendleft(values)
+
+    def run_until(self, count: int = None) -> list:
+        """Run untraced until `count` values are output, input is needed or the machine halts.
+
+        The values output are returned together as a list, with no callback
+        per value. Queue more input with feed() and call again to carry on
+        from where the machine stopped.
+        """
+        outputs = []
+        if count is not None and count <= 0:
+            return outputs
+        machine = self.run()
+        try:
+            for event, out in machine:
+                if event == Event.INPUT:
+                    break
+                outputs.append(out)
+                if len(outputs) == count:
+                    break
+        finally:
+            machine.close()
+        return outputs
+
+    def _run_fast(self):
+        """Drive run() to completion, serving its I/O from the connect() callbacks."""
+        machine = self.run()
+        value = None
+        try:
+            while True:
+                event, out = machine.send(value)
+                value = None
+                if event == Event.OUTPUT:
+                    if self._sender:
+                        self._sender(out, trace=False)
+                    elif self._sender2:
+                        self._sender2(self, out, trace=False)
+                    else:
+                        self._output.append(out)
+                elif self._receiver2:
+                    value = self._receiver2(self)
+                elif self._receiver:
+                    value = self._receiver()
+                else:
+                    value = self._wait_for_input()
+        except StopIteration:
+            pass
+        finally:
+            machine.close()
+
     def disassemble(self, patch: str or None = None, start_at=None, end_at=None):
         end_at = self._setup_patched_dump(end_at, patch, start_at) + 1
         try:
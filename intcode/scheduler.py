@@ -0,0 +1,99 @@
+from typing import Callable, Iterable, Optional
+
+from .intcode import Event, Intcode
+
+Route = Callable[[Intcode, int], None]
+
+
+class Scheduler(object):
+    """Round-robin driver for several Intcode machines in a single thread.
+
+    Each machine runs on its turn until it waits on an empty input queue or
+    halts; every value it outputs is handed to `route` straight away, which
+    will usually queue it on another machine with receiver(). A round in
+    which no machine outputs anything or consumes any input is idle: either
+    every machine is blocked (a feedback loop waiting on itself) or, with an
+    `idle_input`, every machine is polling an empty queue (a network with no
+    traffic). There are no threads, no sleeps, and the interleaving is the
+    same on every run.
+
+    Attributes:
+        processors: list
+            the machines, in the order they take turns
+        rounds: int
+            the number of rounds run so far
+        idle_rounds: int
+            the number of rounds found idle so far
+    """
+
+    def __init__(self, processors: Iterable[Intcode], route: Route, idle_input: Optional[int] = None,
+                 trace: bool = False):
+        """Args:
+            processors: The machines to drive, ready to run.
+            route: Called as route(processor, value) for every value output.
+            idle_input: The value a machine reads when its input queue is
+                empty, after which its turn ends; -1 for the 2019/23 network.
+                Defaults to None, where a machine instead waits for input.
+            trace: Log every instruction each machine runs, as a traced
+                simulate() does.
+        """
+        self.processors = list(processors)
+        self.route = route
+        self.idle_input = idle_input
+        self.rounds = 0
+        self.idle_rounds = 0
+        self._machines = {p: p.run(trace=trace) for p in self.processors}
+        self._pending = {p: None for p in self.processors}
+
+    @property
+    def running(self):
+        return [p for p in self.processors if p in self._machines]
+
+    def _turn(self, processor: Intcode) -> bool:
+        """Run one machine until it blocks; return whether it did any I/O."""
+        machine = self._machines[processor]
+        queued = len(processor._input)
+        busy = False
+        value, self._pending[processor] = self._pending[processor], None
+        if queued:
+            # input arrived since the last poll, so read that instead
+            value = None
+        try:
+            while True:
+                event, out = machine.send(value)
+                value = None
+                if event == Event.OUTPUT:
+                    busy = True
+                    self.route(processor, out)
+                elif self.idle_input is None:
+                    break
+                else:
+                    self._pending[processor] = self.idle_input
+                    break
+        except StopIteration:
+            del self._machines[processor]
+        return busy or len(processor._input) < queued
+
+    def run(self, on_idle: Optional[Callable[['Scheduler'], bool]] = None, max_rounds: Optional[int] = None):
+        """Take turns until every machine halts or the machines stay idle.
+
+        Args:
+            on_idle: Called after each idle round, and may queue input to get
+                the machines moving again. Scheduling stops unless it returns
+                True. Defaults to stopping at the first idle round.
+            max_rounds: The most rounds to run. Defaults to no limit.
+
+        Returns:
+            The number of rounds run.
+        """
+        while self._machines and (max_rounds is None or self.rounds < max_rounds):
+            self.rounds += 1
+            busy = False
+            for processor in self.processors:
+                if processor in self._machines:
+                    busy |= self._turn(processor)
+            if not busy and self._machines:
+                self.idle_rounds += 1
+                if on_idle is None or not on_idle(self):
+                    break
+        return self.rounds
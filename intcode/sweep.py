@@ -0,0 +1,132 @@
+"""
+Parameter sweeps: one Intcode program run over many inputs, across processes.
+
+Each worker process loads the program once, takes a snapshot of the fresh
+machine and restores it before every case, so no worker parses the program
+or builds a machine more than once. Cases are handed out in chunks, and the
+results come back in case order.
+"""
+import os
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Optional, Sequence
+
+from .intcode import Intcode, Snapshot
+
+# the values to feed in, and any {address: value} words to write before running
+Case = namedtuple('Case', 'inputs patch', defaults=((), None))
+
+Result = namedtuple('Result', 'case output memory')
+
+Task = Callable[[Intcode, Snapshot, object], object]
+
+_worker = None
+
+
+def run_case(processor: Intcode, start: Snapshot, case, read: Sequence[int] = ()) -> Result:
+    """The default sweep task: run a Case, or a plain sequence of inputs, from `start`.
+
+    Returns the case, the values output and the words at the `read`
+    addresses once the machine halts or waits for more input.
+    """
+    if not isinstance(case, Case):
+        case = Case(case)
+    processor.restore(start)
+    if case.patch:
+        for addr, value in case.patch.items():
+            processor.core[addr] = value
+    processor.feed(case.inputs)
+    output = processor.run_until()
+    return Result(case, output, tuple(processor.core[addr] for addr in read))
+
+
+def _start_worker(program: str, machine: type, task: Task, read: Sequence[int]):
+    global _worker
+    processor = machine(program, 'Sweep')
+    _worker = processor, processor.snapshot(), task, read
+
+
+def _run_chunk(cases: list) -> list:
+    processor, start, task, read = _worker
+    if task is run_case:
+        return [run_case(processor, start, case, read) for case in cases]
+    return [task(processor, start, case) for case in cases]
+
+
+def _chunks(cases: Iterable, size: int):
+    cases = iter(cases)
+    while True:
+        chunk = list(islice(cases, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def sweep(program: str, cases: Iterable, task: Task = run_case, read: Sequence[int] = (),
+          until: Optional[Callable[[object], bool]] = None, workers: Optional[int] = None,
+          chunksize: int = 64, machine: type = Intcode):
+    """Run `program` once per case, in parallel, yielding each result in case order.
+
+    Args:
+        program: The program text.
+        cases: Case tuples, or sequences of input values. May be endless if
+            `until` will be met.
+        task: A module-level function called as task(processor, start, case)
+            in a worker, returning the result for one case. `start` is a
+            snapshot of the freshly loaded machine, to restore before each
+            run. Defaults to run_case.
+        read: Addresses whose words run_case returns with each result.
+        until: Stop after the first result for which this returns True,
+            dropping any work still queued. Defaults to running every case.
+        workers: The number of worker processes; 1 runs every case in this
+            process. Defaults to one per CPU.
+        chunksize: The number of cases handed to a worker at a time.
+        machine: The Intcode class to run, e.g. CompiledIntcode.
+    """
+    if workers == 1:
+        _start_worker(program, machine, task, read)
+        for chunk in _chunks(cases, chunksize):
+            for result in _run_chunk(chunk):
+                yield result
+                if until is not None and until(result):
+                    return
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=_start_worker,
+                             initargs=(program, machine, task, read)) as pool:
+        chunks = _chunks(cases, chunksize)
+        # keep every worker busy, without queueing an endless sweep at once
+        pending = deque(pool.submit(_run_chunk, chunk)
+                        for chunk in islice(chunks, 2 * workers))
+        try:
+            while pending:
+                results = pending.popleft().result()
+                for chunk in islice(chunks, 1):
+                    pending.append(pool.submit(_run_chunk, chunk))
+                for result in results:
+                    yield result
+                    if until is not None and until(result):
+                        return
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def search(program: str, cases: Iterable, until: Callable[[object], bool], **kwargs):
+    """Return the result of the first case, in order, for which `until` returns True.
+
+    Takes the same keyword arguments as sweep(). Returns None if no case
+    matches.
+    """
+    found = []
+
+    def first(result):
+        if until(result):
+            found.append(result)
+        return bool(found)
+
+    for _ in sweep(program, cases, until=first, **kwargs):
+        pass
+    return found[0] if found else None
@@ -0,0 +1,49 @@
+"""
+Benchmark the NumPy automaton engine against the per-cell 2015/18 solution.
+
+Both run 100 generations of Life on the 100x100 2015/18 puzzle input.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python tests/bench_automaton.py
+"""
+
+import importlib.util
+from pathlib import Path
+from time import perf_counter
+
+from aoc.automaton import Automaton, life_rule
+from aoc.grid import Grid
+
+DAY = Path(__file__).parent.parent / "2015" / "18"
+
+
+def load_lights_of_life():
+    spec = importlib.util.spec_from_file_location("lights_of_life", DAY / "lights_of_life.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def measure(label: str, run) -> None:
+    start = perf_counter()
+    result = run()
+    elapsed = perf_counter() - start
+    print(f"{label:10} {elapsed:9.6f}s ({elapsed / 100 * 1e6:9.1f} us/generation) -> {result}")
+
+
+if __name__ == "__main__":
+    lines = (DAY / "input").read_text().splitlines()
+
+    def per_cell():
+        life = load_lights_of_life().Life(lines)
+        for _ in range(100):
+            life.generation()
+        return life.on_lamps()
+
+    def vectorised():
+        automaton = Automaton.from_grid(Grid.from_text(lines), life_rule([3], [2, 3]))
+        return automaton.step(100).population()
+
+    measure("per-cell", per_cell)
+    measure("automaton", vectorised)
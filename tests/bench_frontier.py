@@ -0,0 +1,62 @@
+"""
+Benchmark bfs against layered_bfs and bidirectional_bfs on 2016/11.
+
+The searches all use the day's own state model from 2016/11/lifts.py: the
+lift floor plus the sorted (chip floor, generator floor) pair of every
+element. Moves are reversible, so the backward search reuses the
+successor function. Wall time is measured on a plain run and peak memory
+on a second run under tracemalloc, which slows everything down.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python tests/bench_frontier.py
+"""
+
+import sys
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+from aoc.search import bfs, bidirectional_bfs, layered_bfs, node_to_path
+
+DAY = Path(__file__).parent.parent / "2016" / "11"
+sys.path.insert(0, str(DAY))
+from lifts import moves, pack, parse, to_state  # noqa: E402
+
+
+def measure(label, run) -> None:
+    began = perf_counter()
+    depth = run()
+    elapsed = perf_counter() - began
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:24} {elapsed:9.3f}s peak {peak / 2**20:8.1f} MiB -> {depth}")
+
+
+def main() -> None:
+    text = (DAY / "input").read_text()
+    for part in (1, 2):
+        floors = parse(text)
+        if part == 2:
+            # the elerium and dilithium generators and chips, on the first floor
+            floors[0] ^= 0b1111 << (6 * 2 - 1)
+        initial = to_state(floors)
+        goal = (3, tuple((3, 3) for _ in initial[1]))
+        measure(
+            f"part {part} bfs",
+            lambda: len(node_to_path(bfs(initial, goal.__eq__, lambda s: list(moves(s))))) - 1,
+        )
+        measure(
+            f"part {part} layered_bfs",
+            lambda: layered_bfs(initial, goal.__eq__, moves, key=pack, undirected=True).depth,
+        )
+        measure(
+            f"part {part} bidirectional",
+            lambda: bidirectional_bfs(initial, goal, moves, key=pack, track_path=False).depth,
+        )
+
+
+if __name__ == "__main__":
+    main()
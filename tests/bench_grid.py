@@ -0,0 +1,132 @@
+"""
+Benchmark the dense and sparse Grid storage engines.
+
+The workloads mirror 2024/06 (guard patrol with loop detection), 2025/07
+(tachyon beam splitting) and 2025/04 (removing paper rolls, a delete after
+every few neighbour queries) on seeded synthetic inputs of puzzle size, so
+they run without any cached puzzle input.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python tests/bench_grid.py
+"""
+
+import random
+import tracemalloc
+from time import perf_counter
+
+from aoc.grid import Grid
+
+DIRECTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+
+def patrol_text(size: int = 130, seed: int = 2024) -> str:
+    """Build a 2024/06 style map with scattered obstacles and a guard."""
+    rng = random.Random(seed)
+    rows = [
+        ["#" if rng.random() < 0.02 else "." for _ in range(size)] for _ in range(size)
+    ]
+    rows[size * 2 // 3][size // 2] = "^"
+    return "\n".join("".join(row) for row in rows)
+
+
+def beam_text(size: int = 141, seed: int = 2025) -> str:
+    """Build a 2025/07 style manifold of splitters on alternate rows."""
+    rng = random.Random(seed)
+    rows = [["."] * size for _ in range(size + 1)]
+    rows[0][size // 2] = "S"
+    for y in range(2, size + 1, 2):
+        for x in range(1, size - 1):
+            if rng.random() < 0.3:
+                rows[y][x] = "^"
+    return "\n".join("".join(row) for row in rows)
+
+
+def patrol_loops(grid: Grid) -> int:
+    """Count obstruction positions that trap the guard in a loop."""
+    start = next(pos for pos, value in grid.grid.items() if value == "^")
+
+    def walk(extra=None):
+        (x, y), facing = start, 0
+        seen = set()
+        while (x, y, facing) not in seen:
+            seen.add((x, y, facing))
+            dx, dy = DIRECTIONS[facing]
+            ahead = (x + dx, y + dy)
+            cell = grid[ahead]
+            if cell == 0:
+                return seen, False
+            if cell == "#" or ahead == extra:
+                facing = (facing + 1) % 4
+            else:
+                x, y = ahead
+        return seen, True
+
+    route, _ = walk()
+    candidates = {(x, y) for x, y, _ in route} - {start}
+    return sum(1 for pos in candidates if walk(pos)[1])
+
+
+def beam_paths(grid: Grid) -> int:
+    """Count beam timelines from S to the bottom of the manifold."""
+    width, height = grid.width(), grid.height()
+    ways = [0] * width
+    ways[next(x for x in range(width) if grid[(x, 0)] == "S")] = 1
+    for y in range(1, height):
+        new_ways = [0] * width
+        for x in range(width):
+            if ways[x] and grid[(x, y)] == "^":
+                new_ways[x - 1] += ways[x]
+                new_ways[x + 1] += ways[x]
+            elif ways[x]:
+                new_ways[x] += ways[x]
+        ways = new_ways
+    return sum(ways)
+
+
+def rolls_text(size: int = 137, seed: int = 2504) -> str:
+    """Build a 2025/04 style floor densely covered with paper rolls."""
+    rng = random.Random(seed)
+    return "\n".join("".join("@" if rng.random() < 0.7 else "." for _ in range(size)) for _ in range(size))
+
+
+def erode(grid: Grid) -> int:
+    """Remove rolls with fewer than four rolled neighbours until none are left to remove."""
+    for pos, value in list(grid.grid.items()):
+        if value == ".":
+            del grid[pos]
+    pending = list(grid.grid)
+    removed = 0
+    while pending:
+        pos = pending.pop()
+        if pos not in grid.grid:
+            continue
+        around = list(grid.neighbors(pos, diagonals=True, valid_only=True))
+        if len(around) < 4:
+            del grid[pos]
+            removed += 1
+            pending.extend(around)
+    return removed
+
+
+def measure(label: str, text: str, workload) -> None:
+    for dense in (False, True):
+        tracemalloc.start()
+        start = perf_counter()
+        grid = Grid.from_text(text, dense=dense)
+        built = perf_counter()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result = workload(grid)
+        finished = perf_counter()
+        print(
+            f"{label:8} {'dense' if dense else 'sparse':6} "
+            f"build {built - start:9.6f}s ({peak / 1024:8.1f} KiB) "
+            f"run {finished - built:9.6f}s -> {result}"
+        )
+
+
+if __name__ == "__main__":
+    measure("2024/06", patrol_text(), patrol_loops)
+    measure("2025/07", beam_text(), beam_paths)
+    measure("2025/04", rolls_text(), erode)
@@ -0,0 +1,270 @@
+"""
+Benchmark the Intcode interpreter's fast and traced-style execution paths.
+
+The BOOST diagnostic (2019/09 part 2) is one long compute-bound run; the
+tractor beam (2019/19) restarts a small program for every probe. The slow
+path is measured by driving step() directly, which is what simulate() did
+for every instruction before the fast mode existed.
+
+Snapshots are measured on the 2019/15 maze, mapped by the original
+wall-following droid and by a breadth first search that forks the machine
+at every open cell, and on 2019/19 probes launched by reset_core() or by
+restoring a snapshot taken at the first input.
+
+The block compiler is compared with the interpreter on the same runs, plus
+the 2019/21 springdroid running its part two script.
+
+Memory is measured for the fifty machines of the 2019/23 network, against
+the old layout of a list padded to three times the program text length.
+
+Batched output from run_until() is compared with a connect() callback per
+value on the 2019/13 screen and the 2019/17 camera dump, and the 2019/19
+scan is swept across worker processes, which can only scale as far as the
+machine has cores. The 2019/25 program is disassembled linearly and by the
+control-flow analysis.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python tests/bench_intcode.py
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+from intcode.analysis import analyse
+from intcode.compiler import CompiledIntcode
+from intcode.intcode import Intcode, prepare_mem
+from intcode.scheduler import Scheduler
+from intcode.sweep import sweep
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def stepped(processor: Intcode, inputs) -> int:
+    """Run with the per-instruction step() path, returning instructions executed."""
+    processor._input.extendleft(inputs)
+    count = 0
+    try:
+        while processor.ip < len(processor.core):
+            processor.step()
+            count += 1
+    except GeneratorExit:
+        pass
+    return count + 1
+
+
+def bench(label: str, program: str, runs) -> None:
+    processor = Intcode(program)
+    start = perf_counter()
+    instructions = 0
+    slow_output = []
+    for inputs in runs:
+        processor.reset_core()
+        instructions += stepped(processor, inputs)
+        slow_output.extend(processor.output)
+    slow = perf_counter() - start
+
+    start = perf_counter()
+    fast_output = []
+    for inputs in runs:
+        processor.reset_core()
+        processor.simulate(inputs)
+        fast_output.extend(processor.output)
+    fast = perf_counter() - start
+
+    assert fast_output == slow_output
+    print(f'{label}: {instructions} instructions')
+    print(f'  step():     {slow:8.3f}s {instructions / slow:12,.0f} instructions/s')
+    print(f'  simulate(): {fast:8.3f}s {instructions / fast:12,.0f} instructions/s '
+          f'({slow / fast:.1f}x)')
+
+
+def bench_snapshots() -> None:
+    sys.path.insert(0, str(ROOT / '2019/15'))
+    from computer7 import Droid
+
+    maze = (ROOT / '2019/15/input').read_text().strip()
+    start = perf_counter()
+    walker = Droid(maze)
+    with contextlib.redirect_stdout(io.StringIO()):
+        walker.run([])
+    walked = perf_counter() - start
+    start = perf_counter()
+    searcher = Droid(maze)
+    searcher.explore()
+    searched = perf_counter() - start
+    assert walker.path_to_oxygen_length == searcher.path_to_oxygen_length
+    print('2019/15 maze map')
+    print(f'  wall following: {walked:8.3f}s')
+    print(f'  forked search:  {searched:8.3f}s ({walked / searched:.1f}x)')
+
+    beam = (ROOT / '2019/19/input').read_text().strip()
+    probes = [(x, y) for y in range(900, 950) for x in range(700, 750)]
+    processor = Intcode(beam)
+    start = perf_counter()
+    for probe in probes:
+        processor.reset_core()
+        processor.simulate(list(probe))
+    reset = perf_counter() - start
+    processor.reset_core()
+    next(processor.run())
+    ready = processor.snapshot()
+    start = perf_counter()
+    for probe in probes:
+        processor.restore(ready)
+        processor.simulate(list(probe))
+    restored = perf_counter() - start
+    print(f'2019/19 {len(probes)} probes')
+    print(f'  reset_core(): {reset:8.3f}s')
+    print(f'  restore():    {restored:8.3f}s ({reset / restored:.1f}x)')
+
+
+def allocated(build) -> int:
+    tracemalloc.start()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def bench_memory() -> None:
+    network = (ROOT / '2019/23/input').read_text().strip()
+
+    def padded():
+        return [prepare_mem(network + (',0' * len(network) * 2)) for _ in range(50)]
+
+    def machines():
+        nics = [Intcode(network, f'NIC-{n:02}') for n in range(50)]
+        for n, nic in enumerate(nics):
+            nic.receiver(n)
+        Scheduler(nics, lambda nic, value: None, idle_input=-1).run(max_rounds=20)
+        return nics
+
+    legacy = allocated(padded)
+    compact = allocated(machines)
+    print('2019/23 network of 50 machines')
+    print(f'  padded lists: {legacy / 1024:10,.0f} KiB')
+    print(f'  Memory:       {compact / 1024:10,.0f} KiB ({legacy / compact:.1f}x less)')
+
+
+SPRINGSCRIPT = 'OR A J\nAND B J\nAND C J\nNOT J J\nAND D J\nOR E T\nOR H T\nAND T J\nRUN\n'
+
+
+def bench_compiler() -> None:
+    boost = (ROOT / '2019/09/input').read_text().strip()
+    beam = (ROOT / '2019/19/input').read_text().strip()
+    droid = (ROOT / '2019/21/input').read_text().strip()
+    cases = [
+        ('2019/09 BOOST sensor mode', boost, [[2]]),
+        ('2019/19 50x50 beam scan', beam, [[x, y] for y in range(50) for x in range(50)]),
+        ('2019/21 springdroid RUN', droid, [[ord(c) for c in SPRINGSCRIPT]]),
+    ]
+    for label, program, runs in cases:
+        timings = []
+        outputs = []
+        for machine in (Intcode, CompiledIntcode):
+            processor = machine(program)
+            start = perf_counter()
+            output = []
+            for inputs in runs:
+                processor.reset_core()
+                processor.simulate(list(inputs))
+                output.extend(processor.output)
+            timings.append(perf_counter() - start)
+            outputs.append(output)
+        assert outputs[0] == outputs[1]
+        print(label)
+        print(f'  interpreted: {timings[0]:8.3f}s')
+        print(f'  compiled:    {timings[1]:8.3f}s ({timings[0] / timings[1]:.1f}x)')
+
+
+def bench_batched_io() -> None:
+    cases = [
+        ('2019/13 arcade screen draw', (ROOT / '2019/13/input').read_text().strip()),
+        ('2019/17 scaffold camera dump', (ROOT / '2019/17/input').read_text().strip()),
+    ]
+    for label, program in cases:
+        processor = Intcode(program)
+        received = []
+
+        def receiver(output, trace=False):
+            received.append(output)
+
+        start = perf_counter()
+        for _ in range(20):
+            received.clear()
+            processor.reset_core()
+            processor.connect(receiver)
+            processor.simulate()
+        callbacks = perf_counter() - start
+        processor.connect()
+        start = perf_counter()
+        for _ in range(20):
+            processor.reset_core()
+            batch = processor.run_until()
+        batched = perf_counter() - start
+        assert batch == received
+        print(f'{label} ({len(batch)} values, 20 runs)')
+        print(f'  per-value callback: {callbacks:8.3f}s')
+        print(f'  run_until batch:    {batched:8.3f}s ({callbacks / batched:.1f}x)')
+
+
+def bench_sweep() -> None:
+    beam = (ROOT / '2019/19/input').read_text().strip()
+    cells = [(x, y) for y in range(50) for x in range(50)]
+    processor = Intcode(beam)
+    start = perf_counter()
+    serial = []
+    for cell in cells:
+        processor.reset_core()
+        processor.simulate(list(cell))
+        serial.extend(processor.output)
+    baseline = perf_counter() - start
+    print(f'2019/19 50x50 beam scan sweep ({os.cpu_count()} CPUs)')
+    print(f'  serial simulate:  {baseline:8.3f}s')
+    for workers in sorted({1, 2, os.cpu_count()}):
+        start = perf_counter()
+        swept = [r.output[0] for r in sweep(beam, cells, workers=workers)]
+        elapsed = perf_counter() - start
+        assert swept == serial
+        print(f'  {workers:2} worker(s):     {elapsed:8.3f}s ({baseline / elapsed:.1f}x)')
+
+
+def bench_analysis() -> None:
+    adventure = (ROOT / '2019/25/input').read_text().strip()
+    processor = Intcode(adventure)
+    start = perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            processor.disassemble()
+    except KeyError:
+        # the linear listing walks straight into data and stops there
+        pass
+    linear = perf_counter() - start
+    start = perf_counter()
+    analysis = analyse(adventure)
+    analysis.listing()
+    structured = perf_counter() - start
+    print(f'2019/25 disassembly ({len(analysis.blocks)} blocks, {len(analysis.functions)} subroutines)')
+    print(f'  linear disassemble(): {linear:8.3f}s (stopped at data, address {processor.ip})')
+    print(f'  analyse() + listing(): {structured:7.3f}s ({len(analysis.instructions)} instructions, '
+          f'{sum(hi - lo for lo, hi in analysis.data)} data words)')
+
+
+if __name__ == '__main__':
+    boost = (ROOT / '2019/09/input').read_text().strip()
+    bench('2019/09 BOOST sensor mode', boost, [[2]])
+    beam = (ROOT / '2019/19/input').read_text().strip()
+    bench('2019/19 50x50 beam scan', beam, [[x, y] for y in range(50) for x in range(50)])
+    bench_snapshots()
+    bench_memory()
+    bench_compiler()
+    bench_batched_io()
+    bench_sweep()
+    bench_analysis()
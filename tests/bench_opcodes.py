@@ -0,0 +1,85 @@
+"""
+Benchmark vectorised opcode inference against testing samples one at a time.
+
+Both classify the samples of the 2018/16 puzzle input against the sixteen
+ElfCode opcodes. The per-sample loop is the approach the solution used
+before: parse each sample into lists and call one function per opcode.
+Parsing and classification are timed apart; the vectorised run includes
+resolving the opcode table.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python tests/bench_opcodes.py
+"""
+
+from pathlib import Path
+from time import perf_counter
+
+from aoc.opcodes import Samples, candidate_masks, count_candidates, resolve_opcodes
+
+DAY = Path(__file__).parent.parent / "2018" / "16"
+
+OPS = {
+    "addr": lambda r, a, b: r[a] + r[b],
+    "addi": lambda r, a, b: r[a] + b,
+    "mulr": lambda r, a, b: r[a] * r[b],
+    "muli": lambda r, a, b: r[a] * b,
+    "banr": lambda r, a, b: r[a] & r[b],
+    "bani": lambda r, a, b: r[a] & b,
+    "borr": lambda r, a, b: r[a] | r[b],
+    "bori": lambda r, a, b: r[a] | b,
+    "setr": lambda r, a, b: r[a],
+    "seti": lambda r, a, b: a,
+    "gtir": lambda r, a, b: 1 if a > r[b] else 0,
+    "gtri": lambda r, a, b: 1 if r[a] > b else 0,
+    "gtrr": lambda r, a, b: 1 if r[a] > r[b] else 0,
+    "eqir": lambda r, a, b: 1 if a == r[b] else 0,
+    "eqri": lambda r, a, b: 1 if r[a] == b else 0,
+    "eqrr": lambda r, a, b: 1 if r[a] == r[b] else 0,
+}
+
+
+def parse(lines: list[str]) -> list[tuple[list[int], list[int], list[int]]]:
+    samples = []
+    for n in range(0, len(lines), 4):
+        if not lines[n].startswith("Before:"):
+            break
+        before = list(map(int, lines[n][9:-1].split(", ")))
+        instruction = list(map(int, lines[n + 1].split()))
+        after = list(map(int, lines[n + 2][9:-1].split(", ")))
+        samples.append((before, instruction, after))
+    return samples
+
+
+def per_sample(samples) -> int:
+    ambiguous = 0
+    for before, (_, a, b, c), after in samples:
+        fits = 0
+        for op in OPS.values():
+            try:
+                fits += op(before, a, b) == after[c]
+            except IndexError:
+                pass
+        ambiguous += fits >= 3
+    return ambiguous
+
+
+def vectorised(samples: Samples) -> int:
+    masks = candidate_masks(samples)
+    resolve_opcodes(samples.opcodes, masks)
+    return int((count_candidates(masks) >= 3).sum())
+
+
+def measure(label: str, run) -> None:
+    start = perf_counter()
+    result = run()
+    print(f"{label:16} {perf_counter() - start:9.4f}s -> {result}")
+
+
+if __name__ == "__main__":
+    lines = (DAY / "input.txt").read_text().splitlines()
+    measure("parse lists", lambda: len(parse(lines)))
+    measure("parse arrays", lambda: len(Samples.parse(lines)[0]))
+    listed, (arrays, _) = parse(lines), Samples.parse(lines)
+    measure("per sample", lambda: per_sample(listed))
+    measure("vectorised", lambda: vectorised(arrays))
@@ -0,0 +1,127 @@
+"""
+Benchmark the aoc.search shortest-path engines on a 2024/16 style maze.
+
+States are (x, y, facing); stepping forward costs 1 and turning costs 1000.
+The maze is a seeded 141x141 labyrinth with some walls knocked through so
+that there are many equal-cost routes, as in the puzzle input.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python tests/bench_search.py
+"""
+
+import random
+from heapq import heappop, heappush
+from time import perf_counter
+
+from aoc.grid import Grid
+from aoc.search import Node, astar, dijkstra
+
+DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+
+def maze_text(size: int = 141, seed: int = 2024) -> str:
+    rng = random.Random(seed)
+    cells = [["#"] * size for _ in range(size)]
+    stack = [(1, 1)]
+    cells[1][1] = "."
+    while stack:
+        x, y = stack[-1]
+        options = [
+            (x + 2 * dx, y + 2 * dy, dx, dy)
+            for dx, dy in DIRECTIONS
+            if 0 < x + 2 * dx < size - 1
+            and 0 < y + 2 * dy < size - 1
+            and cells[y + 2 * dy][x + 2 * dx] == "#"
+        ]
+        if not options:
+            stack.pop()
+            continue
+        nx, ny, dx, dy = rng.choice(options)
+        cells[y + dy][x + dx] = cells[ny][nx] = "."
+        stack.append((nx, ny))
+    for _ in range(size * 4):
+        x, y = rng.randrange(1, size - 1), rng.randrange(1, size - 1)
+        cells[y][x] = "."
+    cells[size - 2][1] = "S"
+    cells[1][size - 2] = "E"
+    return "\n".join("".join(row) for row in cells)
+
+
+def legacy_astar(initial, goal_test, successors, heuristic, cost):
+    """The Node-per-push A* that aoc.search.astar replaced."""
+    frontier = [Node(initial, None, 0.0, heuristic(initial))]
+    explored = {initial: 0.0}
+    while frontier:
+        current_node = heappop(frontier)
+        current_state = current_node.state
+        if goal_test(current_state):
+            return current_node
+        for child in successors(current_state):
+            new_cost = current_node.cost + cost(current_state, child)
+            if child not in explored or explored[child] > new_cost:
+                explored[child] = new_cost
+                heappush(frontier, Node(child, current_node, new_cost, heuristic(child)))
+    return None
+
+
+def main() -> None:
+    grid = Grid.from_text(maze_text())
+    width = grid.width()
+    start = next(pos for pos, value in grid.grid.items() if value == "S")
+    end = next(pos for pos, value in grid.grid.items() if value == "E")
+
+    def moves(state):
+        x, y, d = state
+        dx, dy = DIRECTIONS[d]
+        if grid[(x + dx, y + dy)] != "#":
+            yield x + dx, y + dy, d
+        yield x, y, (d + 1) % 4
+        yield x, y, (d - 1) % 4
+
+    def move_cost(a, b):
+        return 1 if a[2] == b[2] else 1000
+
+    def weighted(state):
+        x, y, d = state
+        dx, dy = DIRECTIONS[d]
+        if grid[(x + dx, y + dy)] != "#":
+            yield (x + dx, y + dy, d), 1
+        yield (x, y, (d + 1) % 4), 1000
+        yield (x, y, (d - 1) % 4), 1000
+
+    walls = [value == "#" for value in grid.grid.cells]
+
+    def indexed(state):
+        cell, d = divmod(state, 4)
+        dx, dy = DIRECTIONS[d]
+        ahead = cell + dx + dy * width
+        if not walls[ahead]:
+            yield ahead * 4 + d, 1
+        yield cell * 4 + (d + 1) % 4, 1000
+        yield cell * 4 + (d - 1) % 4, 1000
+
+    def at_end(state):
+        return state[:2] == end
+
+    end_index = end[0] + end[1] * width
+
+    def at_end_index(state):
+        return state >> 2 == end_index
+
+    runs = {
+        "legacy astar": lambda: legacy_astar((*start, 0), at_end, moves, lambda s: 0, move_cost).cost,
+        "astar": lambda: astar((*start, 0), at_end, moves, lambda s: 0, move_cost).cost,
+        "dijkstra": lambda: dijkstra((*start, 0), weighted, at_end).cost,
+        "dijkstra[int]": lambda: dijkstra(
+            (start[0] + start[1] * width) * 4, indexed, at_end_index, size=len(walls) * 4
+        ).cost,
+    }
+    for label, run in runs.items():
+        began = perf_counter()
+        result = run()
+        print(f"{label:14} {perf_counter() - began:9.6f}s -> {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark the register machine against a string-splitting interpreter.
+
+Both run part 1 of 2016/12 (about a million assembunny instructions). The
+interpreter is the loop the solutions used before: split the text of the
+current line on every step and dispatch on its mnemonic. The machine runs
+with and without its counted loops fused, and on part 2 (28 million
+instructions) and on 2016/23 with a = 12, which used to need a hand-written
+shortcut for its multiplication loop.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python tests/bench_vm.py
+"""
+
+import dataclasses
+from pathlib import Path
+from time import perf_counter
+
+from aoc.vm import ASSEMBUNNY, Machine, assemble
+
+DAY = Path(__file__).parent.parent / "2016" / "12"
+
+
+def split_loop(lines: list[str]) -> int:
+    registers = {"a": 0, "b": 0, "c": 0, "d": 0}
+
+    def value(x: str) -> int:
+        return registers[x] if x in registers else int(x)
+
+    ip = 0
+    while ip < len(lines):
+        ins, *params = lines[ip].split()
+        if ins == "cpy":
+            registers[params[1]] = value(params[0])
+        elif ins == "inc":
+            registers[params[0]] += 1
+        elif ins == "dec":
+            registers[params[0]] -= 1
+        elif ins == "jnz" and value(params[0]) != 0:
+            ip += int(params[1])
+            continue
+        ip += 1
+    return registers["a"]
+
+
+def measure(label: str, run, executed: int) -> None:
+    start = perf_counter()
+    result = run()
+    elapsed = perf_counter() - start
+    print(f"{label:12} {elapsed:9.4f}s ({executed / elapsed / 1e6:6.2f} M instructions/s) -> {result}")
+
+
+if __name__ == "__main__":
+    lines = (DAY / "input").read_text().splitlines()
+    program = assemble(lines, ASSEMBUNNY)
+    counts = [0] * len(program)
+    Machine(program).run(counts)
+    executed = sum(counts)
+
+    def vm(program, **registers):
+        machine = Machine(program, registers)
+        machine.run()
+        return machine["a"]
+
+    def stepped():
+        machine = Machine(program)
+        machine.run([0] * len(program))
+        return machine["a"]
+
+    measure("split loop", lambda: split_loop(lines), executed)
+    measure("vm stepped", stepped, executed)
+    unfused = dataclasses.replace(program, loops={})
+    measure("vm unfused", lambda: vm(unfused), executed)
+    measure("vm", lambda: vm(program), executed)
+    measure("part 2", lambda: vm(unfused, c=1), 27683181)
+    measure("fused", lambda: vm(program, c=1), 27683181)
+
+    safe = assemble((DAY.parent / "23" / "input.txt").read_text().splitlines(), ASSEMBUNNY)
+    start = perf_counter()
+    print(f"2016/23 a=12 fused {vm(safe, a=12)} in {perf_counter() - start:.4f}s")
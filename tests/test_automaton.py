@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from aoc.automaton import Automaton, Neighbourhood, life_rule, table_rule
+from aoc.grid import Grid
+
+CONWAY = life_rule(birth=[3], survive=[2, 3])
+
+
+@pytest.mark.parametrize(
+    "dimensions,topology,expected",
+    [(2, "moore", 8), (3, "moore", 26), (4, "moore", 80), (2, "von_neumann", 4), (3, "von_neumann", 6)],
+    ids=["moore_2d", "moore_3d", "moore_4d", "von_neumann_2d", "von_neumann_3d"],
+)
+def test_neighbourhood_sizes(dimensions, topology, expected):
+    # Act
+    neighbourhood = getattr(Neighbourhood, topology)(dimensions)
+
+    # Assert
+    assert len(neighbourhood.offsets) == expected
+    assert neighbourhood.reach == 1
+
+
+def test_blinker_oscillates():
+    # Arrange
+    automaton = Automaton.from_grid(Grid.from_text(".....\n..#..\n..#..\n..#..\n....."), CONWAY)
+
+    # Act
+    automaton.step()
+
+    # Assert
+    assert str(automaton.to_grid()) == ".....\n.....\n.###.\n.....\n....."
+    assert str(automaton.step().to_grid()) == ".....\n..#..\n..#..\n..#..\n....."
+    assert automaton.generation == 2
+
+
+def test_lights_example():
+    # Arrange
+    text = ".#.#.#\n...##.\n#....#\n..#...\n#.#..#\n####.."
+    automaton = Automaton.from_grid(Grid.from_text(text), CONWAY)
+
+    # Act
+    automaton.step(4)
+
+    # Assert
+    assert automaton.population() == 4
+
+
+@pytest.mark.parametrize("dimensions,expected", [(3, 112), (4, 848)], ids=["cubes_3d", "cubes_4d"])
+def test_infinite_conway_cubes(dimensions, expected):
+    # Arrange
+    automaton = Automaton.from_grid(
+        Grid.from_text(".#.\n..#\n###"), CONWAY, dimensions=dimensions, infinite=True
+    )
+
+    # Act
+    automaton.step(6)
+
+    # Assert
+    assert automaton.population() == expected
+
+
+def test_hexagonal_tiles():
+    # Arrange
+    board = np.zeros((5, 5), dtype=int)
+    board[2, 2] = board[3, 2] = 1
+    automaton = Automaton(board, life_rule([2], [1, 2]), Neighbourhood.hexagonal())
+
+    # Act
+    automaton.step()
+
+    # Assert
+    assert automaton.population() == 4
+    assert automaton.board[3, 1] == automaton.board[2, 3] == 1
+
+
+def test_wrapping_board():
+    # Arrange
+    board = np.zeros((4, 4), dtype=int)
+    board[0, 0] = board[0, 1] = board[0, 3] = 1
+
+    # Act
+    automaton = Automaton(board, CONWAY, wrap=True).step()
+
+    # Assert
+    assert automaton.board[3, 0] == automaton.board[1, 0] == 1
+    assert automaton.population() == 3
+
+
+def test_background_flips_on_infinite_board():
+    # Arrange
+    offsets = tuple((dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1))
+    weights = tuple(2 ** (8 - n) for n in range(9))
+    table = [1] + [0] * 510 + [0]
+    automaton = Automaton(
+        np.zeros((3, 3), dtype=int),
+        table_rule(table),
+        Neighbourhood(offsets, weights),
+        infinite=True,
+    )
+
+    # Act
+    automaton.step()
+    first_background = automaton.background
+    automaton.step()
+
+    # Assert
+    assert first_background == 1
+    assert automaton.background == 0
+    assert automaton.board.shape == (7, 7)
+    assert automaton.population() == 0
+
+
+def test_wrap_and_infinite_rejected():
+    # Act & Assert
+    with pytest.raises(ValueError):
+        Automaton(np.zeros((2, 2)), CONWAY, wrap=True, infinite=True)
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from aoc.automaton import Automaton, life_rule
+from aoc.cycles import fast_forward
+from aoc.grid import Grid
+
+
+def _step(x):
+    return (x * x + 1) % 255
+
+
+def _naive(state, step, n):
+    for _ in range(n):
+        state = step(state)
+    return state
+
+
+@pytest.mark.parametrize("n", [0, 1, 5, 17, 100], ids=["zero", "one", "five", "seventeen", "hundred"])
+def test_fast_forward_matches_simulation(n):
+    # Act
+    result = fast_forward(3, _step, n)
+
+    # Assert
+    assert result.state == _naive(3, _step, n)
+
+
+def test_fast_forward_skips_to_huge_step():
+    # Act
+    result = fast_forward(3, _step, 10**12)
+
+    # Assert
+    assert result.state == _naive(3, _step, result.start + (10**12 - result.start) % result.length)
+    assert result.steps < 200
+
+
+def test_fast_forward_reports_cycle():
+    # Arrange
+    sequence = [0, 1, 2, 3, 4, 5, 6, 7, 3]
+
+    # Act
+    result = fast_forward(0, lambda x: sequence[x + 1], 10**9)
+
+    # Assert
+    assert (result.start, result.length) == (3, 5)
+    assert result.state == 3 + (10**9 - 3) % 5
+    assert result.steps < 50
+    assert result.memory > 0
+
+
+def test_fast_forward_without_repeat():
+    # Act
+    result = fast_forward(0, lambda x: x + 1, 50)
+
+    # Assert
+    assert result.state == 50
+    assert result.start is None and result.length is None
+    assert result.steps == 50
+
+
+def test_fast_forward_with_grid_fingerprint():
+    # Arrange
+    def rotate(grid: Grid) -> Grid:
+        return Grid.from_text(str(grid.transpose()).split("\n")[::-1])
+
+    grid = Grid.from_text("ab\ncd")
+
+    # Act
+    result = fast_forward(grid, rotate, 10**9 + 1, key=Grid.fingerprint)
+
+    # Assert
+    assert result.length == 4
+    assert str(result.state) == str(rotate(grid))
+
+
+def test_fast_forward_with_automaton_board():
+    # Arrange
+    board = np.zeros((5, 5), dtype=int)
+    board[2, 1:4] = 1
+
+    def generation(board):
+        return Automaton(board, life_rule([3], [2, 3])).step().board
+
+    # Act
+    result = fast_forward(board, generation, 10**9 + 1, key=np.ndarray.tobytes)
+
+    # Assert
+    assert (result.start, result.length) == (0, 2)
+    assert result.state[1:4, 2].all()
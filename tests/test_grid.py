@@ -198,3 +198,194 @@ def test_grid_next_location(location, wrap, expected):
 
     # Assert
     assert result == expected
+
+
+@pytest.mark.parametrize(
+    "input_text,dense,expected",
+    [
+        ("AB\nCD", True, True),
+        ("AB\nCD", False, False),
+        ("AB\nC", True, False),
+    ],
+    ids=["rectangular", "forced_sparse", "ragged"],
+)
+def test_grid_from_text_storage(input_text, dense, expected):
+    # Act
+    grid = Grid.from_text(input_text, dense=dense)
+
+    # Assert
+    assert grid.is_dense is expected
+    assert grid[(1, 0)] == "B"
+    assert grid[(0, 1)] == "C"
+
+
+def test_grid_dense_matches_sparse():
+    # Arrange
+    text = "#.#\n.S.\n#.#"
+    dense = Grid.from_text(text)
+    sparse = Grid.from_text(text, dense=False)
+
+    # Assert
+    assert dense.grid == sparse.grid
+    assert list(dense.grid.items()) == list(sparse.grid.items())
+    assert (dense.width(), dense.height()) == (sparse.width(), sparse.height())
+    assert str(dense) == str(sparse)
+    assert dense[(-1, 0)] == sparse[(-1, 0)] == 0
+    assert (3, 0) not in dense
+    assert list(dense.neighbors((0, 0), valid_only=True)) == list(
+        sparse.neighbors((0, 0), valid_only=True)
+    )
+
+
+def test_grid_dense_falls_back_to_sparse():
+    # Arrange
+    grid = Grid.from_text("ab\ncd")
+
+    # Act
+    grid[(1, 1)] = "x"
+    in_bounds_dense = grid.is_dense
+    grid[(-1, 0)] = "y"
+
+    # Assert
+    assert in_bounds_dense is True
+    assert grid.is_dense is False
+    assert grid[(1, 1)] == "x"
+    assert grid[(-1, 0)] == "y"
+    assert grid.axis_min(0) == -1
+
+
+def test_grid_dense_delete_and_copy():
+    # Arrange
+    grid = Grid.from_text("ab\ncd")
+    copied = grid.copy()
+
+    # Act
+    del grid[(0, 0)]
+
+    # Assert
+    assert (0, 0) not in grid
+    assert grid[(0, 0)] == 0
+    assert len(grid.grid) == 3
+    assert copied[(0, 0)] == "a"
+    assert copied.is_dense is True
+
+
+def test_grid_ranges_track_writes():
+    # Arrange
+    grid = Grid()
+    grid.set(1, (0, 0))
+    grid.set(1, (2, 2))
+    assert grid.width() == 3
+
+    # Act
+    grid[(5, 1)] = "a"
+    grid.set("b", (-1, 4))
+    grid[(0, 0)] = "c"
+
+    # Assert
+    assert (grid.axis_min(0), grid.axis_max(0)) == (-1, 5)
+    assert (grid.axis_min(1), grid.axis_max(1)) == (0, 4)
+    assert grid._ranges == {0: (-1, 5), 1: (0, 4)}
+    assert (grid[(5, 1)], grid[(-1, 4)], grid[(0, 0)], grid[(2, 2)]) == ("a", "b", "c", 1)
+
+
+def test_grid_ranges_after_delete():
+    # Arrange
+    grid = Grid()
+    for coord in [(0, 0), (1, 1), (4, 2)]:
+        grid.set(1, coord)
+    assert (grid.width(), grid.height()) == (5, 3)
+
+    # Act
+    del grid[(1, 1)]
+    interior_ranges = dict(grid._ranges)
+    del grid[(4, 2)]
+    assert (grid.width(), grid.height()) == (1, 1)
+    grid[(0, 0)] = "x"
+    grid[(3, 1)] = "y"
+
+    # Assert
+    assert interior_ranges == {0: (0, 4), 1: (0, 2)}
+    assert grid._ranges == {0: (0, 3), 1: (0, 1)}
+    assert (grid[(0, 0)], grid[(3, 1)]) == ("x", "y")
+
+
+@pytest.mark.parametrize("diagonals", [False, True], ids=["cardinal", "diagonal"])
+def test_grid_dense_neighbors_match_sparse(diagonals):
+    # Arrange
+    text = "abc\ndef\nghi"
+    dense = Grid.from_text(text)
+    sparse = Grid.from_text(text, dense=False)
+    del dense[(1, 0)]
+    del sparse[(1, 0)]
+
+    # Assert
+    for location in [(0, 0), (1, 1), (2, 2), (1, 0), (5, 5)]:
+        assert list(dense.neighbors(location, diagonals=diagonals, valid_only=True)) == list(
+            sparse.neighbors(location, diagonals=diagonals, valid_only=True)
+        )
+
+
+@pytest.mark.parametrize("diagonals", [False, True], ids=["cardinal", "diagonal"])
+def test_grid_dense_adjacency_tracks_edits(diagonals):
+    # Arrange
+    text = "abcd\nefgh\nijkl"
+    dense = Grid.from_text(text)
+    sparse = Grid.from_text(text, dense=False)
+    list(dense.neighbors((1, 1), diagonals=diagonals, valid_only=True))
+    copied = dense.copy()
+
+    # Act: interleave deletes and re-sets with neighbour queries
+    for location in [(1, 1), (0, 0), (2, 1), (3, 2)]:
+        del dense[location]
+        del sparse[location]
+        list(dense.neighbors((1, 0), diagonals=diagonals, valid_only=True))
+    dense[(1, 1)] = "z"
+    sparse[(1, 1)] = "z"
+    dense.set("y", (0, 0))
+    sparse.set("y", (0, 0))
+
+    # Assert
+    for location in [(x, y) for y in range(3) for x in range(4)]:
+        assert list(dense.neighbors(location, diagonals=diagonals, valid_only=True)) == list(
+            sparse.neighbors(location, diagonals=diagonals, valid_only=True)
+        )
+    assert len(list(copied.neighbors((1, 0), diagonals=diagonals, valid_only=True))) == (5 if diagonals else 3)
+
+
+def test_grid_neighbors_many():
+    # Arrange
+    grid = Grid.from_text("...\n.#.\n...")
+    centre = grid.index_of((1, 1))
+    corner = grid.index_of((0, 0))
+
+    # Act
+    layer = grid.neighbors_many([centre, corner])
+
+    # Assert
+    assert [grid.coords_of(i) for i in layer] == [
+        (1, 0), (2, 1), (1, 2), (0, 1), (1, 0), (0, 1)
+    ]
+    assert len(grid.neighbors_many([centre], diagonals=True)) == 8
+
+
+def test_grid_neighbors_many_invalidated_on_delete():
+    # Arrange
+    grid = Grid.from_text("..\n..")
+    origin = grid.index_of((0, 0))
+    assert len(grid.neighbors_many([origin])) == 2
+
+    # Act
+    del grid[(1, 0)]
+
+    # Assert
+    assert list(grid.neighbors_many([origin])) == [grid.index_of((0, 1))]
+
+
+def test_grid_neighbors_many_requires_dense():
+    # Arrange
+    grid = Grid.from_text("..\n..", dense=False)
+
+    # Act & Assert
+    with pytest.raises(TypeError):
+        grid.neighbors_many([0])
@@ -0,0 +1,414 @@
+import pytest
+from intcode.amplifier import Amplifier
+from intcode.analysis import analyse
+from intcode.channel import AsciiChannel
+from intcode.compiler import CompiledIntcode
+from intcode.game import Game
+from intcode.intcode import Event, Intcode
+from intcode.profiler import profile
+from intcode.scheduler import Scheduler
+from intcode.sweep import Case, search, sweep
+
+QUINE = "109,1,204,-1,1001,100,1,100,1008,100,16,101,1006,101,0,99"
+COMPARE_TO_EIGHT = (
+    "3,21,1008,21,8,20,1005,20,22,107,8,21,20,1006,20,31,1106,0,36,98,0,0,1002,21,125,20,4,20,"
+    "1105,1,46,104,999,1105,1,46,1101,1000,1,20,4,20,1105,1,46,98,99"
+)
+
+
+@pytest.mark.parametrize(
+    "program,inputs",
+    [(QUINE, []), (COMPARE_TO_EIGHT, [7]), (COMPARE_TO_EIGHT, [8]), (COMPARE_TO_EIGHT, [9])],
+    ids=["quine", "below_eight", "eight", "above_eight"],
+)
+def test_fast_path_matches_traced(program, inputs):
+    # Arrange
+    fast = Intcode(program)
+    traced = Intcode(program)
+
+    # Act
+    fast.simulate(list(inputs))
+    traced.simulate(list(inputs), trace=True)
+
+    # Assert
+    assert fast.output == traced.output
+    assert fast.core == traced.core
+    assert fast.ip == traced.ip
+
+
+def test_fast_path_self_modifying_code():
+    # Arrange: output 1, overwrite that OUT with a HLT, then jump back to it
+    processor = Intcode("104,1,1101,99,0,0,1105,1,0")
+
+    # Act
+    processor.simulate()
+
+    # Assert
+    assert processor.output == [1]
+    assert processor.ip == 0
+
+
+def test_fast_path_callbacks_and_nmi():
+    # Arrange
+    processor = Intcode("3,9,4,9,1105,1,0,99,0,0")
+    sent = []
+
+    def send(value, trace=False):
+        sent.append(value)
+        if len(sent) == 3:
+            processor.nmi(True)
+
+    processor.connect(send, lambda: len(sent) * 10)
+
+    # Act
+    processor.simulate()
+
+    # Assert
+    assert sent == [0, 10, 20]
+    assert processor.ip == 4
+
+
+def test_run_yields_io_events():
+    # Arrange: read two values, output their sum
+    processor = Intcode("3,11,3,12,1,11,12,13,4,13,99,0,0,0")
+    machine = processor.run()
+
+    # Act
+    first = next(machine)
+    processor.receiver(4)
+    second = next(machine)
+    third = machine.send(5)
+
+    # Assert
+    assert first == second == (Event.INPUT, None)
+    assert third == (Event.OUTPUT, 9)
+    assert list(machine) == []
+    assert processor.halted
+
+
+def test_run_until_batches_output():
+    # Arrange: echo two inputs back, then output 1000
+    processor = Intcode("3,0,4,0,3,0,4,0,104,1000,99")
+    processor.feed([7, 8])
+
+    # Act
+    first = processor.run_until(1)
+    rest = processor.run_until()
+    after = processor.run_until()
+
+    # Assert
+    assert first == [7]
+    assert rest == [8, 1000]
+    assert after == []
+    assert processor.halted
+
+
+def test_run_until_stops_for_input():
+    # Arrange: read a value and output it doubled, forever
+    processor = Intcode("3,9,1002,9,2,9,4,9,1105,1,0")
+
+    # Act
+    waiting = processor.run_until()
+    processor.feed([3, 5])
+    doubled = processor.run_until()
+
+    # Assert
+    assert waiting == []
+    assert doubled == [6, 10]
+    assert not processor.halted
+    assert processor.waiting
+
+
+@pytest.mark.parametrize(
+    "program,bat_pos,score",
+    [("104,1,104,2,104,3", 1, 0), ("104,-1,104,0,104,7,99", 0, 7)],
+    ids=["runs_off_end", "halts"],
+)
+def test_game_stops_when_not_waiting(program, bat_pos, score):
+    # Arrange
+    game = Game(program)
+
+    # Act
+    game.run()
+
+    # Assert
+    assert not game._processor.waiting
+    assert (game.bat_pos, game.score) == (bat_pos, score)
+
+
+def test_ascii_channel_exchange():
+    # Arrange: echo each character until a newline, then output 12345 and halt
+    processor = Intcode("3,20,4,20,1008,20,10,21,1006,21,0,104,12345,99,0,0,0,0,0,0,0,0")
+    channel = AsciiChannel(processor)
+
+    # Act
+    prompt = channel.read()
+    reply = channel.exchange("hello")
+
+    # Assert
+    assert prompt == ""
+    assert reply == "hello\n"
+    assert channel.values == [12345]
+    assert channel.halted
+
+
+def test_scheduler_feedback_loop():
+    # Arrange: 2019/07 part two example, five amps wired in a ring
+    program = (
+        "3,26,1001,26,-4,26,3,27,1002,27,2,27,1,27,26,27,4,27,1001,28,-1,28,1005,28,6,99,0,0,5"
+    )
+    amps = [Intcode(program) for _ in range(5)]
+    for amp, phase in zip(amps, [9, 8, 7, 6, 5]):
+        amp.receiver(phase)
+    amps[0].receiver(0)
+    signals = []
+
+    def route(amp, value):
+        if amp is amps[-1]:
+            signals.append(value)
+        amps[(amps.index(amp) + 1) % 5].receiver(value)
+
+    # Act
+    Scheduler(amps, route).run()
+
+    # Assert
+    assert signals[-1] == 139629729
+    assert all(amp.halted for amp in amps)
+
+
+def test_amplifier_regeneration_traced():
+    # Arrange
+    program = (
+        "3,26,1001,26,-4,26,3,27,1002,27,2,27,1,27,26,27,4,27,1001,28,-1,28,1005,28,6,99,0,0,5"
+    )
+    amplifier = Amplifier(program)
+
+    # Act
+    plain = amplifier.run_regeneration([9, 8, 7, 6, 5])
+    traced = amplifier.run_regeneration([9, 8, 7, 6, 5], trace=True)
+
+    # Assert
+    assert plain == traced == 139629729
+    log = amplifier._amps[0].get_log()
+    assert any(line.startswith("00000 : ") for line in log)
+    assert any("Sending out" in line for line in log)
+
+
+def test_scheduler_idle_detection():
+    # Arrange: echo anything but -1 to the other machine, forever
+    program = "3,20,1008,20,-1,21,1005,21,0,4,20,1105,1,0"
+    machines = [Intcode(program) for _ in range(2)]
+    machines[0].receiver(3)
+    seen = []
+    wakes = []
+
+    def route(machine, value):
+        seen.append(value)
+        if value < 5:
+            machines[1 - machines.index(machine)].receiver(value + 1)
+
+    def on_idle(scheduler):
+        wakes.append(scheduler.rounds)
+        if len(wakes) == 2:
+            return False
+        machines[0].receiver(10)
+        return True
+
+    scheduler = Scheduler(machines, route, idle_input=-1)
+
+    # Act
+    scheduler.run(on_idle=on_idle)
+
+    # Assert
+    assert seen == [3, 4, 5, 10]
+    assert scheduler.idle_rounds == 2
+    assert len(scheduler.running) == 2
+
+
+def test_snapshot_restore():
+    # Arrange: running total of inputs, output after each
+    processor = Intcode("3,13,1,13,14,14,4,14,1105,1,0,99,0,0,0")
+    machine = processor.run()
+    next(machine)
+    machine.send(5)
+    snap = processor.snapshot()
+    next(machine)
+    machine.send(7)
+
+    # Act
+    processor.restore(snap)
+    machine = processor.run()
+    next(machine)
+    resumed = machine.send(1)
+
+    # Assert
+    assert resumed == (Event.OUTPUT, 6)
+    assert snap.core[14] == 5
+
+
+def test_fork_is_independent():
+    # Arrange
+    processor = Intcode("3,13,1,13,14,14,4,14,1105,1,0,99,0,0,0")
+    processor.receiver(2)
+    next(processor.run())
+
+    # Act
+    twin = processor.fork("twin")
+    twin.receiver(10)
+    processor.receiver(20)
+    twin_out = next(twin.run())
+    original_out = next(processor.run())
+
+    # Assert
+    assert twin.name == "twin"
+    assert twin_out == (Event.OUTPUT, 12)
+    assert original_out == (Event.OUTPUT, 22)
+
+
+@pytest.mark.parametrize(
+    "address",
+    [50, 1000, 10**9],
+    ids=["near_end", "grown_page", "sparse"],
+)
+def test_addresses_beyond_program(address):
+    # Arrange: store 7 at the address, add the unwritten next word, output
+    program = f"1101,7,0,{address},1,{address},{address + 1},{address},4,{address},99"
+    processor = Intcode(program)
+
+    # Act
+    processor.simulate()
+
+    # Assert
+    assert processor.output == [7]
+    assert processor.core[address] == 7
+    assert processor.core[address + 2] == 0
+
+
+@pytest.mark.parametrize(
+    "program,inputs",
+    [
+        (QUINE, []),
+        (COMPARE_TO_EIGHT, [8]),
+        (COMPARE_TO_EIGHT, [9]),
+        ("104,1,1101,99,0,0,1105,1,0", []),
+        ("1101,0,5,20,1001,20,-1,20,4,20,1005,20,4,99", []),
+        ("1101,7,0,1000000,4,1000000,99", []),
+    ],
+    ids=["quine", "eight", "above_eight", "self_modifying", "countdown_loop", "sparse_address"],
+)
+def test_compiled_matches_interpreter(program, inputs):
+    # Arrange
+    interpreted = Intcode(program)
+    compiled = CompiledIntcode(program)
+
+    # Act
+    interpreted.simulate(list(inputs))
+    compiled.simulate(list(inputs))
+
+    # Assert
+    assert compiled.output == interpreted.output
+    assert compiled.core == interpreted.core
+    assert compiled.ip == interpreted.ip
+
+
+def test_compiled_reads_rewritten_operands_live():
+    # Arrange: each run stores its input into an immediate operand of the ADD at 2
+    program = "3,4,1101,100,0,11,4,11,99,0,0,0"
+    processor = CompiledIntcode(program)
+    outputs = []
+
+    # Act
+    for value in [3, 8, 5]:
+        processor.reset_core()
+        processor.simulate([value])
+        outputs.extend(processor.output)
+
+    # Assert
+    assert outputs == [103, 108, 105]
+
+
+@pytest.mark.parametrize("workers", [1, 2], ids=["in_process", "pool"])
+def test_sweep_results_in_case_order(workers):
+    # Arrange: compare each input with eight
+    cases = [[n] for n in range(12)]
+
+    # Act
+    results = list(sweep(COMPARE_TO_EIGHT, cases, workers=workers, chunksize=5))
+
+    # Assert
+    assert [r.case.inputs for r in results] == cases
+    assert [r.output for r in results] == [[999]] * 8 + [[1000]] + [[1001]] * 3
+
+
+def test_search_patches_memory_and_stops_early():
+    # Arrange: like 2019/02, patch the two operands and read the sum from address 0
+    program = "1101,0,0,0,99"
+    cases = (Case(patch={1: a, 2: b}) for a in range(5) for b in range(5))
+    seen = []
+
+    def until(result):
+        seen.append(result)
+        return result.memory[0] == 2 + 4
+
+    # Act
+    found = search(program, cases, until=until, read=(0,), workers=1, chunksize=3)
+
+    # Assert
+    assert found.case.patch == {1: 2, 2: 4}
+    assert len(seen) == 15
+
+
+def test_analysis_finds_calls_returns_and_data():
+    # Arrange: push return address 9 and call 12, output 5 and halt; two data words follow
+    program = "109,30,21101,9,0,0,1105,1,12,104,5,99,109,1,109,-1,2106,0,0,42,43"
+
+    # Act
+    analysis = analyse(program)
+    listing = analysis.listing()
+
+    # Assert
+    assert analysis is analyse(program)
+    assert analysis.functions == {12}
+    assert analysis.calls == {6: 12}
+    assert {start: (b.end, b.successors, b.kind) for start, b in analysis.blocks.items()} == {
+        0: (9, (12, 9), "call"),
+        9: (12, (), "halt"),
+        12: (19, (), "return"),
+    }
+    assert analysis.data == [(19, 21)]
+    assert not analysis.is_code(20)
+    assert "sub_00012:" in listing
+    assert any(line.endswith("; call sub_00012") for line in listing)
+    assert listing[-1] == "00019 :    42    43"
+
+
+def test_profile_counts_addresses_and_opcodes():
+    # Arrange: count down from 3, outputting each value, then halt
+    program = "1101,3,0,14,4,14,1001,14,-1,14,1005,14,4,99,0"
+    processor = Intcode(program)
+
+    # Act
+    prof = profile(processor)
+    report = prof.report(program)
+
+    # Assert
+    assert processor.output == [3, 2, 1]
+    assert list(prof.counts[:14]) == [1, 0, 0, 0, 3, 0, 3, 0, 0, 0, 3, 0, 0, 1]
+    assert (prof.opcodes[1], prof.opcodes[4], prof.opcodes[5], prof.opcodes[99]) == (4, 3, 3, 1)
+    assert prof.executed == 11
+    assert prof.hot_spots(1)[0][1] == 3
+    assert "L00004: 9 instructions, 81.8%" in report
+
+
+def test_log_is_bounded(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(Intcode, "LOG_SIZE", 5)
+    processor = Intcode(QUINE)
+
+    # Act
+    processor.simulate(trace=True)
+
+    # Assert
+    assert len(processor.get_log()) == 5
+    assert processor.output == [int(v) for v in QUINE.split(",")]
+
@@ -0,0 +1,214 @@
+"""
+Conformance suite: every 2019 Intcode day, run on its puzzle input through
+the day's own module (and so through the shared engine wherever the day
+uses it), checked against the accepted answers and timed.
+
+Run it with pytest after any change to the intcode package, or from the
+repository root for a timing table:
+
+    PYTHONPATH=. python tests/test_intcode_conformance.py
+"""
+import contextlib
+import importlib.util
+import io
+import itertools
+import re
+import sys
+from pathlib import Path
+from time import perf_counter
+
+import pytest
+from intcode.amplifier import Amplifier, phase_chain
+from intcode.channel import AsciiChannel
+from intcode.compiler import CompiledIntcode
+from intcode.sweep import Case, search, sweep
+
+ROOT = Path(__file__).resolve().parent.parent / "2019"
+
+
+def day_module(day: str, name: str):
+    """Import a day's solution module from its directory."""
+    spec = importlib.util.spec_from_file_location(f"aoc2019_{day}_{name}", ROOT / day / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.path.insert(0, str(ROOT / day))
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(str(ROOT / day))
+    return module
+
+
+def puzzle_input(day: str) -> str:
+    return (ROOT / day / "input").read_text().strip()
+
+
+def day02():
+    computer = day_module("02", "computer")
+    program = computer.INITIAL_CELLS
+    cells = [int(v) for v in program.split(",")]
+    cells[1], cells[2] = 12, 2
+    part1 = computer.simulate(cells)[0]
+    cases = (Case(patch={1: noun, 2: verb}) for noun, verb in itertools.product(range(100), range(100)))
+    found = search(program, cases, until=lambda r: r.memory[0] == 19690720, read=(0,), workers=1)
+    return part1, 100 * found.case.patch[1] + found.case.patch[2]
+
+
+def day05():
+    computer2 = day_module("05", "computer2")
+    answers = []
+    for system in (1, 5):
+        processor = computer2.Processor(computer2.INITIAL_CELLS)
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            processor.simulate([system])
+        lines = printed.getvalue().splitlines()
+        # the diagnostic computer prints every output with the address of its OUT
+        assert all(re.fullmatch(r"OUT\(\d{5}\) → -?\d+", line) for line in lines)
+        answers.append(int(lines[-1].split()[-1]))
+    return tuple(answers)
+
+
+def day07():
+    program = puzzle_input("07")
+    amplifier = Amplifier(program)
+    part1 = max(sweep(program, itertools.permutations(range(5)), task=phase_chain, workers=1))
+    part2 = max(amplifier.run_regeneration(phases) for phases in itertools.permutations(range(5, 10)))
+    return part1, part2
+
+
+def day09():
+    processor_class = day_module("09", "computer4").Processor
+    answers = []
+    for mode in (1, 2):
+        processor = processor_class(puzzle_input("09"))
+        processor.simulate([mode])
+        answers.append(processor.output[0])
+    return tuple(answers)
+
+
+# the registration painted in 2019/11 part 2, one character per panel
+REGISTRATION = (
+    " #  # ###   ##   ##  #### #     ##  ###",
+    " #  # #  # #  # #  # #    #    #  # #  #",
+    " #  # #  # #    #  # ###  #    #    #  #",
+    " #  # ###  #    #### #    #    #    ###",
+    " #  # # #  #  # #  # #    #    #  # #",
+    "  ##  #  #  ##  #  # #    ####  ##  #",
+)
+
+
+def day11():
+    robot = day_module("11", "computer5").Robot(puzzle_input("11"))
+    robot.run([0])
+    part1 = robot.visited()
+    robot.reset_core()
+    robot.run([1])
+    panels = tuple(
+        "".join("#" if line[x:x + 2] == "##" else " " for x in range(0, len(line), 2)).rstrip()
+        for line in robot.image().split("\n")
+    )
+    return part1, panels
+
+
+def day13():
+    computer6 = day_module("13", "computer6")
+    game = computer6.Game(puzzle_input("13"))
+    game.run([])
+    part1 = game.count_block_tiles()
+    game.reset_core()
+    game.set_freeplay()
+    game.run([])
+    return part1, game.score
+
+
+def day15():
+    droid = day_module("15", "computer7").Droid(puzzle_input("15"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        droid.run([])
+        part2 = droid.spread_oxygen()
+    return droid.path_to_oxygen_length, part2
+
+
+def day17():
+    ascii_robot = day_module("17", "computer8").Ascii(puzzle_input("17"))
+    ascii_robot.run()
+    part1 = ascii_robot.find_crossings()
+    ascii_robot.reset_core()
+    routine = "A,B,A,C,A,C,B,C,C,B\nL,4,L,4,L,10,R,4\nR,4,L,4,L,4,R,8,R,10\nR,4,L,10,R,10\nn\n"
+    with contextlib.redirect_stdout(io.StringIO()):
+        ascii_robot.run(routine, vac=True)
+    return part1, ascii_robot._channel.values[-1]
+
+
+def day19():
+    drone = day_module("19", "computer9").TractorBeamDrone(puzzle_input("19"))
+    drone.sweep_block(0, 0, workers=1)
+    x, y = drone.zigzag_scan(800, 900)
+    return drone.count_affected(), (x - 99) * 10000 + y
+
+
+def day21():
+    droid = day_module("21", "computer10").SpringDroid(puzzle_input("21"))
+    answers = []
+    for script in ("NOT A J\nNOT B T\nOR T J\nNOT C T\nOR T J\nAND D J\nWALK\n",
+                   "OR A J\nAND B J\nAND C J\nNOT J J\nAND D J\nOR E T\nOR H T\nAND T J\nRUN\n"):
+        droid.reset_core()
+        droid.script = script
+        with contextlib.redirect_stdout(io.StringIO()):
+            droid.run()
+        answers.append(droid.result)
+    return tuple(answers)
+
+
+def day23():
+    return day_module("23", "computer11").NetSix(puzzle_input("23")).run()
+
+
+def day25():
+    commands = day_module("25", "computer12").EXPLORATION_COMMANDS
+    channel = AsciiChannel(CompiledIntcode(puzzle_input("25")))
+    text = channel.exchange(*commands)
+    code = text.split("typing ")[1].split()[0]
+    return (int(code),)
+
+
+DAYS = [
+    ("02", day02, (6568671, 3951)),
+    ("05", day05, (10987514, 14195011)),
+    ("07", day07, (262086, 5371621)),
+    ("09", day09, (2932210790, 73144)),
+    ("11", day11, (2088, REGISTRATION)),
+    ("13", day13, (329, 15973)),
+    ("15", day15, (318, 390)),
+    ("17", day17, (3336, 597517)),
+    ("19", day19, (211, 8071006)),
+    ("21", day21, (19359969, 1140082748)),
+    ("23", day23, (18192, 10738)),
+    ("25", day25, (2147485856,)),
+]
+
+
+@pytest.mark.parametrize("solve,expected", [(solve, expected) for _, solve, expected in DAYS],
+                         ids=[f"2019_{day}" for day, _, _ in DAYS])
+def test_day_answers(solve, expected, record_property):
+    # Arrange
+    start = perf_counter()
+
+    # Act
+    answers = solve()
+
+    # Assert
+    record_property("seconds", round(perf_counter() - start, 3))
+    assert tuple(answers) == expected
+
+
+if __name__ == "__main__":
+    total = 0.0
+    for day, solve, expected in DAYS:
+        start = perf_counter()
+        answers = solve()
+        elapsed = perf_counter() - start
+        total += elapsed
+        status = "ok" if tuple(answers) == expected else f"FAILED {answers}"
+        print(f"2019/{day} {elapsed:8.3f}s {status}")
+    print(f"total   {total:8.3f}s")
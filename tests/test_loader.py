@@ -0,0 +1,170 @@
+import pytest
+from aoc import loader
+from aoc.loader import LoaderLib
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    """An AdventOfCode checkout to run from, a home without a cookie and a mirror."""
+    base = tmp_path / "AdventOfCode"
+    (base / "2020" / "01").mkdir(parents=True)
+    home = tmp_path / "home"
+    home.mkdir()
+    mirror = tmp_path / "mirror"
+    for day in (1, 2, 3):
+        (mirror / "2020" / "day" / str(day)).mkdir(parents=True)
+        (mirror / "2020" / "day" / str(day) / "input").write_text(f"mirror {day}\n")
+    monkeypatch.chdir(base / "2020" / "01")
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.delenv("USERPROFILE", raising=False)
+    monkeypatch.delenv("AOC_MIRROR", raising=False)
+    monkeypatch.delenv("AOC_OFFLINE", raising=False)
+    monkeypatch.setattr(loader, "_base_paths", [])
+    loader.clear_input_cache()
+    yield base, mirror
+    loader.clear_input_cache()
+
+
+def test_cached_input_needs_no_cookie(tree):
+    # Arrange
+    base, _ = tree
+    (base / "2020" / "01" / "input.txt").write_text("1\n2\n3")
+
+    # Act
+    numbers = LoaderLib(2020).get_aoc_input(1, lambda text: [int(n) for n in text.split()])
+
+    # Assert
+    assert numbers == [1, 2, 3]
+
+
+def test_missing_cookie_raises_only_when_downloading(tree):
+    # Arrange
+    aoc = LoaderLib(2020)
+
+    # Act / Assert
+    with pytest.raises(EnvironmentError, match="cookie"):
+        aoc.get_aoc_input(4)
+
+
+def test_inputs_are_read_once_per_process(tree):
+    # Arrange
+    base, _ = tree
+    cache_filename = base / "2020" / "01" / "input.txt"
+    cache_filename.write_text("abc")
+    first = LoaderLib(2020).get_aoc_input(1, list)
+
+    # Act
+    cache_filename.unlink()
+    first.append("d")
+    again = LoaderLib(2020).get_aoc_input(1, list)
+    raw = LoaderLib(2020).get_aoc_input(1)
+
+    # Assert
+    assert again == ["a", "b", "c"]
+    assert raw == "abc"
+
+
+def test_mirror_supplies_and_stores_missing_input(tree):
+    # Arrange
+    base, mirror = tree
+
+    # Act
+    text = LoaderLib(2020, mirror=mirror).get_aoc_input(2)
+
+    # Assert
+    assert text == "mirror 2"
+    assert (base / "2020" / "02" / "input.txt").read_text() == "mirror 2"
+
+
+def test_offline_without_input_raises(tree, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("AOC_OFFLINE", "1")
+    aoc = LoaderLib(2020)
+
+    # Act / Assert
+    assert aoc.offline
+    with pytest.raises(EnvironmentError, match="offline"):
+        aoc.get_aoc_input(5)
+
+
+def test_prefetch_fetches_only_missing_days(tree):
+    # Arrange
+    base, mirror = tree
+    (base / "2020" / "01" / "input.txt").write_text("on disk")
+
+    # Act
+    fetched = LoaderLib(2020, mirror=mirror).prefetch(range(1, 6))
+
+    # Assert
+    assert fetched == [2, 3]
+    assert (base / "2020" / "01" / "input.txt").read_text() == "on disk"
+    assert (base / "2020" / "03" / "input.txt").read_text() == "mirror 3"
+
+
+def test_base_directory_is_found_once(tree, monkeypatch):
+    # Arrange
+    base, _ = tree
+    LoaderLib(2020)
+    monkeypatch.chdir(base)
+
+    # Act
+    aoc = LoaderLib(2020)
+
+    # Assert
+    assert aoc._base_path == base
+    assert loader._base_paths == [base]
+
+
+class _Response:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.reason = "OK" if status_code == 200 else "Not Found"
+        self.text = text
+
+
+class _Session:
+    """Answers like the website: day 2 is missing, every other day has an input."""
+
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, cookies):
+        self.urls.append(url)
+        day = int(url.split("/")[-2])
+        return _Response(404) if day == 2 else _Response(200, f"web {day}\n")
+
+
+@pytest.fixture
+def website(tree, monkeypatch):
+    base, _ = tree
+    cookie = base.parent / "home" / "aoc" / "aoc.cookie"
+    cookie.parent.mkdir()
+    cookie.write_text("secret\n")
+    session = _Session()
+    monkeypatch.setattr(loader, "_session", session)
+    return session
+
+
+def test_prefetch_skips_failed_days_quietly(tree, website, capsys):
+    # Act
+    fetched = LoaderLib(2020).prefetch(range(1, 4))
+
+    # Assert
+    assert fetched == [1, 3]
+    assert len(website.urls) == 3
+    assert capsys.readouterr().out == ""
+
+
+def test_prefetch_does_not_request_locked_days(tree, website):
+    # Act
+    fetched = LoaderLib(9999).prefetch()
+
+    # Assert
+    assert fetched == []
+    assert website.urls == []
+
+
+def test_failed_download_names_the_status(tree, website):
+    # Act / Assert
+    with pytest.raises(AssertionError, match="404"):
+        LoaderLib(2020).get_aoc_input(2)
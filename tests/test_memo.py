@@ -0,0 +1,177 @@
+import gc
+
+import pytest
+
+from aoc.memo import cache_stats, format_cache_stats, memoize, to_bitmask
+
+
+def test_memoize_counts_hits_and_misses():
+    # Arrange
+    @memoize()
+    def fib(n):
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    # Act
+    result = fib(30)
+
+    # Assert
+    assert result == 832040
+    info = fib.cache_info()
+    assert info.misses == 31
+    assert info.hits == 28
+    assert info.currsize == 31
+    assert info.evictions == 0
+
+
+def test_memoize_lru_eviction():
+    # Arrange
+    calls = []
+
+    @memoize(maxsize=2)
+    def square(n):
+        calls.append(n)
+        return n * n
+
+    # Act
+    square(1)
+    square(2)
+    square(1)
+    square(3)
+    square(1)
+    square(2)
+
+    # Assert
+    assert calls == [1, 2, 3, 2]
+    assert square.cache_info().evictions == 2
+    assert square.cache_info().currsize == 2
+
+
+def test_memoize_size_based_eviction():
+    # Arrange
+    @memoize(maxbytes=1000)
+    def blob(n):
+        return "x" * 300
+
+    # Act
+    for n in range(10):
+        blob(n)
+
+    # Assert
+    info = blob.cache_info()
+    assert info.nbytes <= 1000
+    assert info.currsize < 10
+    assert info.evictions == 10 - info.currsize
+
+
+def test_memoize_key_compaction():
+    # Arrange
+    @memoize(key=lambda node, visited: (node, to_bitmask(visited)))
+    def visit(node, visited):
+        return len(visited)
+
+    # Act
+    visit(1, frozenset({0, 3}))
+    visit(1, frozenset({3, 0}))
+
+    # Assert
+    assert visit.cache_info().hits == 1
+    assert list(visit.cache) == [(1, 0b1001)]
+
+
+def test_memoize_keyword_arguments_and_clear():
+    # Arrange
+    @memoize()
+    def add(a, b=0):
+        return a + b
+
+    # Act
+    add(1, b=2)
+    add(1, b=2)
+    add(1, 2)
+    add.cache_clear()
+
+    # Assert
+    assert add.cache_info() == (0, 0, 0, 0, None, 0)
+
+
+def test_memoize_methods():
+    # Arrange
+    class Counter:
+        def __init__(self, step):
+            self.step = step
+
+        @memoize()
+        def scaled(self, n):
+            return n * self.step
+
+    counter = Counter(3)
+
+    # Act & Assert
+    assert counter.scaled(2) == 6
+    assert counter.scaled(2) == 6
+    assert Counter.scaled.cache_info().hits == 1
+    assert counter.scaled.__name__ == "scaled"
+    assert counter.scaled.cache_info().hits == 1
+
+
+@pytest.mark.parametrize(
+    "items,index,expected",
+    [([0, 2], None, 0b101), (["a", "c"], {"a": 0, "b": 1, "c": 2}, 0b101), ([], None, 0)],
+    ids=["ints", "indexed", "empty"],
+)
+def test_to_bitmask(items, index, expected):
+    # Act & Assert
+    assert to_bitmask(items, index) == expected
+
+
+def test_cache_stats_report():
+    # Arrange
+    @memoize(name="stats_probe")
+    def probe(n):
+        return n
+
+    # Act
+    probe(1)
+    probe(1)
+
+    # Assert
+    assert cache_stats()[f"{__name__}.stats_probe"].hits == 1
+    assert f"{__name__}.stats_probe" in format_cache_stats()
+
+
+def test_cache_stats_keep_same_names_apart():
+    # Arrange
+    memos = []
+    for module in ("day01", "day02"):
+        def solve(n):
+            return n
+
+        solve.__module__ = module
+        memos.append(memoize()(solve))
+
+    # Act
+    memos[0](1)
+    memos[0](1)
+    memos[1](1)
+    stats = cache_stats()
+
+    # Assert
+    qualname = memos[0].name
+    assert stats[f"day01.{qualname}"].hits == 1
+    assert stats[f"day02.{qualname}"].hits == 0
+
+
+def test_cache_stats_drop_collected_memos():
+    # Arrange
+    @memoize(name="short_lived")
+    def probe(n):
+        return n
+
+    probe(1)
+
+    # Act
+    del probe
+    gc.collect()
+
+    # Assert
+    assert f"{__name__}.short_lived" not in cache_stats()
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from aoc.opcodes import Samples, candidate_masks, count_candidates, decode_program, resolve_opcodes
+from aoc.vm import ELFCODE, Machine
+
+EXAMPLE = ["Before: [3, 2, 1, 1]", "9 2 1 2", "After:  [3, 2, 2, 1]", "", "", "", "7 3 2 0", "7 0 0 1"]
+
+
+def bits(*mnemonics: str) -> int:
+    return sum(1 << ELFCODE.mnemonics.index(mnemonic) for mnemonic in mnemonics)
+
+
+def test_parse_splits_samples_from_program():
+    # Act
+    samples, program = Samples.parse(EXAMPLE)
+
+    # Assert
+    assert len(samples) == 1
+    assert samples.before.tolist() == [[3, 2, 1, 1]]
+    assert samples.instructions.tolist() == [[9, 2, 1, 2]]
+    assert samples.after.tolist() == [[3, 2, 2, 1]]
+    assert program == ["7 3 2 0", "7 0 0 1"]
+
+
+def test_example_behaves_like_three_opcodes():
+    # Arrange
+    samples, _ = Samples.parse(EXAMPLE)
+
+    # Act
+    masks = candidate_masks(samples)
+
+    # Assert
+    assert masks.tolist() == [bits("mulr", "addi", "seti")]
+    assert count_candidates(masks).tolist() == [3]
+
+
+def test_missing_register_rules_an_opcode_out():
+    # Arrange
+    samples, _ = Samples.parse(["Before: [0, 0, 0, 0]", "1 7 0 1", "After:  [0, 7, 0, 0]"])
+
+    # Act
+    masks = candidate_masks(samples)
+
+    # Assert
+    assert masks.tolist() == [bits("seti")]
+
+
+def test_resolve_by_propagation():
+    # Arrange
+    opcodes = np.array([0, 0, 1, 2, 2])
+    masks = np.array(
+        [bits("addr", "addi", "seti"), bits("addr", "addi"), bits("addr"), bits("addi", "seti"), bits("seti", "mulr")],
+        dtype=np.uint16,
+    )
+
+    # Act
+    table = resolve_opcodes(opcodes, masks)
+
+    # Assert
+    assert table == {0: "addi", 1: "addr", 2: "seti"}
+
+
+@pytest.mark.parametrize(
+    "opcodes,masks",
+    [([0, 0], [bits("addr"), bits("addi")]), ([0, 1], [bits("addr", "addi"), bits("addr", "addi")])],
+    ids=["contradiction", "ambiguous"],
+)
+def test_resolve_rejects_bad_samples(opcodes, masks):
+    # Act / Assert
+    with pytest.raises(ValueError):
+        resolve_opcodes(np.array(opcodes), np.array(masks, dtype=np.uint16))
+
+
+def test_decoded_program_runs():
+    # Arrange
+    program = decode_program(["", "3 5 0 0", "1 0 4 1", ""], {1: "muli", 3: "seti"})
+
+    # Act
+    machine = Machine(program)
+    machine.run()
+
+    # Assert
+    assert machine.registers[:2] == [5, 20]
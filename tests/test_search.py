@@ -10,7 +10,17 @@ from aoc.search import (
     dfs,
     bfs,
     astar,
+    astar_search,
+    bfs_field,
+    bidirectional_bfs,
+    layered_bfs,
+    dijkstra,
+    distance_field,
+    optimal_path_states,
+    all_paths,
+    count_paths,
 )
+from aoc.grid import Grid
 
 
 # Linear Contains Tests
@@ -187,3 +197,320 @@ def test_priority_queue():
     assert pq.pop() == 2
     assert pq.pop() == 3
     assert pq.empty is True
+
+
+# Dijkstra Tests
+WEIGHTED_GRAPH = {
+    "a": [("b", 7), ("c", 9), ("f", 14)],
+    "b": [("a", 7), ("c", 10), ("d", 15)],
+    "c": [("a", 9), ("b", 10), ("d", 11), ("f", 2)],
+    "d": [("b", 15), ("c", 11), ("e", 6)],
+    "e": [("d", 6), ("f", 9)],
+    "f": [("a", 14), ("c", 2), ("e", 9)],
+}
+
+
+def test_dijkstra_to_goal():
+    # Act
+    result = dijkstra("a", WEIGHTED_GRAPH.__getitem__, lambda s: s == "e")
+
+    # Assert
+    assert result.found
+    assert result.cost == 20
+    assert result.path() == ["a", "c", "f", "e"]
+
+
+def test_dijkstra_distance_map():
+    # Act
+    result = dijkstra("a", WEIGHTED_GRAPH.__getitem__)
+
+    # Assert
+    assert result.goal is None
+    assert result.distance == {"a": 0, "b": 7, "c": 9, "d": 20, "e": 20, "f": 11}
+    assert result.path("d") == ["a", "c", "d"]
+
+
+def test_dijkstra_integer_states():
+    # Arrange
+    names = sorted(WEIGHTED_GRAPH)
+    graph = [[(names.index(n), w) for n, w in WEIGHTED_GRAPH[name]] for name in names]
+
+    # Act
+    result = dijkstra(0, graph.__getitem__, size=len(names) + 1)
+
+    # Assert
+    assert result.distance[:6] == [0, 7, 9, 20, 20, 11]
+    assert not result.reached(6)
+    assert result.path(6) == []
+    assert result.path(4) == [0, 2, 5, 4]
+
+
+def test_dijkstra_unreachable_goal():
+    # Act
+    result = dijkstra(1, lambda s: [(s + 1, 1)] if s < 3 else [], lambda s: s == 10)
+
+    # Assert
+    assert not result.found
+    assert result.path() == []
+
+
+def test_astar_search_grid():
+    # Arrange
+    walls = {(1, 0), (1, 1), (1, 2)}
+
+    def successors(state):
+        x, y = state
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nx < 4 and 0 <= ny < 4 and (nx, ny) not in walls:
+                yield (nx, ny), 1
+
+    # Act
+    result = astar_search(
+        (0, 0), successors, lambda s: s == (3, 0), lambda s: abs(3 - s[0]) + abs(s[1])
+    )
+
+    # Assert
+    assert result.cost == 9
+    assert result.path()[0] == (0, 0) and result.path()[-1] == (3, 0)
+    assert len(result.path()) == 10
+
+
+def test_astar_returns_node_chain():
+    # Act
+    result = astar(
+        0, lambda s: s == 6, lambda s: [s + 1, s + 3], lambda s: 0, cost=lambda a, b: b - a
+    )
+
+    # Assert
+    assert node_to_path(result)[0] == 0
+    assert node_to_path(result)[-1] == 6
+    assert result.cost == 6
+
+
+# Distance Field Tests
+def test_distance_field_multi_source():
+    # Act
+    result = distance_field(["a", "e"], WEIGHTED_GRAPH.__getitem__)
+
+    # Assert
+    assert result.distance == {"a": 0, "b": 7, "c": 9, "d": 6, "e": 0, "f": 9}
+    assert result.path("d") == ["e", "d"]
+
+
+def test_bfs_field_on_grid():
+    # Arrange
+    grid = Grid.from_text("...\n.#.\n...")
+    sources = [grid.index_of((0, 0)), grid.index_of((2, 2))]
+    open_cells = {i for i in range(9) if grid[grid.coords_of(i)] != "#"}
+
+    # Act
+    result = bfs_field(
+        sources,
+        lambda i: [n for n in grid.neighbors_many([i]) if n in open_cells],
+        size=9,
+    )
+
+    # Assert
+    assert result.distance == [0, 1, 2, 1, float("inf"), 1, 2, 1, 0]
+
+
+REINDEER_MAZE = """\
+###############
+#.......#....E#
+#.#.###.#.###.#
+#.....#.#...#.#
+#.###.#####.#.#
+#.#.#.......#.#
+#.#.#####.###.#
+#...........#.#
+###.#.#####.#.#
+#...#.....#.#.#
+#.#.#.###.#.#.#
+#.....#...#.#.#
+#.###.#.#.#.#.#
+#S..#.....#...#
+###############"""
+
+
+def test_optimal_path_states_reindeer_maze():
+    # Arrange
+    grid = Grid.from_text(REINDEER_MAZE)
+    steps = ((1, 0), (0, 1), (-1, 0), (0, -1))
+    start = next(p for p, v in grid.grid.items() if v == "S")
+    end = next(p for p, v in grid.grid.items() if v == "E")
+
+    def turns(x, y, d):
+        yield (x, y, (d + 1) % 4), 1000
+        yield (x, y, (d - 1) % 4), 1000
+
+    def forward(state):
+        x, y, d = state
+        dx, dy = steps[d]
+        if grid[(x + dx, y + dy)] != "#":
+            yield (x + dx, y + dy, d), 1
+        yield from turns(x, y, d)
+
+    def backward(state):
+        x, y, d = state
+        dx, dy = steps[d]
+        if grid[(x - dx, y - dy)] != "#":
+            yield (x - dx, y - dy, d), 1
+        yield from turns(x, y, d)
+
+    # Act
+    cost, states = optimal_path_states(
+        [(*start, 0)], [(*end, d) for d in range(4)], forward, backward
+    )
+
+    # Assert
+    assert cost == 7036
+    assert len({(x, y) for x, y, _ in states}) == 45
+
+
+def test_optimal_path_states_unreachable():
+    # Act
+    cost, states = optimal_path_states(["a"], ["z"], WEIGHTED_GRAPH.get)
+
+    # Assert
+    assert cost == float("inf")
+    assert states == set()
+
+
+# Frontier Search Tests
+def _lattice(state):
+    x, y = state
+    return [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
+
+
+@pytest.mark.parametrize("undirected", [False, True], ids=["directed", "undirected"])
+def test_layered_bfs(undirected):
+    # Act
+    result = layered_bfs((0, 0), lambda s: s == (3, 2), _lattice, track_path=True, undirected=undirected)
+
+    # Assert
+    assert result.depth == 5
+    assert result.path[0] == (0, 0) and result.path[-1] == (3, 2)
+    assert len(result.path) == 6
+
+
+def test_layered_bfs_hashed_keys_without_path():
+    # Act
+    result = layered_bfs(1, lambda s: s == 40, lambda s: [s + 1, s * 2], key=hash)
+
+    # Assert
+    assert result.state == 40
+    assert result.depth == 6
+    assert result.path is None
+
+
+def test_layered_bfs_no_goal():
+    # Act
+    result = layered_bfs(0, lambda s: s == 10, lambda s: [s + 1] if s < 5 else [])
+
+    # Assert
+    assert result is None
+
+
+def test_bidirectional_bfs():
+    # Act
+    result = bidirectional_bfs((0, 0), (4, -3), _lattice)
+
+    # Assert
+    assert result.depth == 7
+    assert result.path[0] == (0, 0) and result.path[-1] == (4, -3)
+    assert all(
+        abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(result.path, result.path[1:])
+    )
+
+
+def test_bidirectional_bfs_directed():
+    # Act
+    result = bidirectional_bfs(
+        1, 40, lambda s: [s + 1, s * 2], lambda s: [s - 1] + ([s // 2] if s % 2 == 0 else [])
+    )
+
+    # Assert
+    assert result.depth == 6
+    assert result.path[0] == 1 and result.path[-1] == 40
+    assert len(result.path) == 7
+
+
+# Path Enumeration Tests
+CAVES = {}
+for _edge in ["start-A", "start-b", "A-c", "A-b", "b-d", "A-end", "b-end"]:
+    _a, _b = _edge.split("-")
+    CAVES.setdefault(_a, []).append(_b)
+    CAVES.setdefault(_b, []).append(_a)
+
+DAG = {"a": ["b", "c"], "b": ["d"], "c": ["d", "e"], "d": ["e"], "e": []}
+
+
+def test_all_paths_is_lazy():
+    # Act
+    paths = all_paths("a", "e", DAG.__getitem__)
+
+    # Assert
+    assert next(paths) == ["a", "b", "d", "e"]
+    assert sorted(paths) == [["a", "c", "d", "e"], ["a", "c", "e"]]
+
+
+def test_all_paths_simple_paths_in_cyclic_graph():
+    # Act
+    paths = list(all_paths("start", "end", CAVES.__getitem__))
+
+    # Assert
+    assert len(paths) == len({tuple(p) for p in paths})
+    assert all(len(p) == len(set(p)) for p in paths)
+    assert ["start", "A", "end"] in paths
+
+
+@pytest.mark.parametrize(
+    "graph,start,goal,expected",
+    [(DAG, "a", "e", 3), (DAG, "e", "a", 0), (CAVES, "start", "end", None)],
+    ids=["dag", "unreachable", "cyclic"],
+)
+def test_count_paths_matches_enumeration(graph, start, goal, expected):
+    # Act
+    count = count_paths(start, goal, graph.__getitem__)
+
+    # Assert
+    assert count == len(list(all_paths(start, goal, graph.__getitem__)))
+    if expected is not None:
+        assert count == expected
+
+
+def test_count_paths_with_revisitable_nodes():
+    # Act
+    count = count_paths("start", "end", CAVES.__getitem__, can_revisit=str.isupper)
+
+    # Assert
+    assert count == 10
+
+
+def test_count_paths_large_dag():
+    # Arrange
+    layers = 60
+
+    def successors(node):
+        layer, side = node
+        return [(layer + 1, 0), (layer + 1, 1)] if layer < layers else []
+
+    # Act
+    count = count_paths((0, 0), (layers, 0), successors)
+
+    # Assert
+    assert count == 2 ** (layers - 1)
+
+
+def test_count_paths_long_cyclic_corridor():
+    # Arrange: a corridor far longer than the recursion limit, walkable both ways
+    length = 5000
+
+    def successors(node):
+        return [n for n in (node - 1, node + 1) if 0 <= n <= length]
+
+    # Act
+    count = count_paths(0, length, successors)
+
+    # Assert
+    assert count == 1
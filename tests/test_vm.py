@@ -0,0 +1,241 @@
+import pytest
+
+from aoc.vm import ASSEMBUNNY, DUET, ELFCODE, TURING_LOCK, Halt, Instruction, Machine, Network, assemble
+
+LEONARDO = ["cpy 41 a", "inc a", "inc a", "dec a", "jnz a 2", "dec a"]
+TOGGLER = ["cpy 2 a", "tgl a", "tgl a", "tgl a", "cpy 1 a", "dec a", "dec a"]
+FLOW = ["#ip 0", "seti 5 0 1", "seti 6 0 2", "addi 0 1 0", "addr 1 2 3", "setr 1 0 0", "seti 8 0 4", "seti 9 0 5"]
+
+
+@pytest.mark.parametrize(
+    "line,isa,expected",
+    [
+        ("cpy 41 a", ASSEMBUNNY, Instruction(0, 0b10, (41, 0))),
+        ("cpy c d", ASSEMBUNNY, Instruction(0, 0b11, (2, 3))),
+        ("jnz 1 -2", ASSEMBUNNY, Instruction(3, 0b00, (1, -2))),
+        ("jio a, +2", TURING_LOCK, Instruction(5, 0b01, (0, 2))),
+        ("gtir 256 1 3", ELFCODE, Instruction(10, 0b110, (256, 1, 3))),
+        ("cpy 1 2", ASSEMBUNNY, None),
+    ],
+    ids=["immediate", "registers", "jump", "comma", "elfcode", "invalid"],
+)
+def test_assemble_resolves_operands(line, isa, expected):
+    # Act
+    program = assemble([line], isa)
+
+    # Assert
+    assert program.code == (expected,)
+
+
+def test_assembunny_example():
+    # Arrange
+    machine = Machine(assemble(LEONARDO, ASSEMBUNNY))
+
+    # Act
+    ended = machine.run()
+
+    # Assert
+    assert ended
+    assert machine["a"] == 42
+
+
+def test_toggle_rewrites_only_this_machine():
+    # Arrange
+    program = assemble(TOGGLER, ASSEMBUNNY)
+    machine = Machine(program)
+
+    # Act
+    machine.run()
+
+    # Assert
+    assert machine["a"] == 3
+    assert program.source[3] == ("tgl", ("a",))
+    machine.reset()
+    machine.run()
+    assert machine["a"] == 3
+
+
+def test_turing_lock_example():
+    # Arrange
+    machine = Machine(assemble(["inc a", "jio a, +2", "tpl a", "inc a"], TURING_LOCK))
+
+    # Act
+    machine.run()
+
+    # Assert
+    assert machine.registers == [2, 0]
+
+
+def test_elfcode_binds_the_instruction_pointer():
+    # Arrange
+    machine = Machine(assemble(FLOW, ELFCODE))
+
+    # Act
+    machine.run()
+
+    # Assert
+    assert machine.registers == [7, 5, 6, 0, 0, 9]
+
+
+def test_hooks_can_halt():
+    # Arrange
+    sent = []
+    text = ["set a 1", "add a 2", "mul a a", "mod a 5", "snd a", "set a 0", "rcv a", "jgz a -1", "set a 1",
+            "jgz a -2"]
+
+    def receive(value):
+        if value:
+            raise Halt
+        return value
+
+    machine = Machine(assemble(text, DUET), send=sent.append, receive=receive)
+
+    # Act
+    ended = machine.run()
+
+    # Assert
+    assert not ended
+    assert sent == [4]
+    assert machine.ip == 6
+
+
+def test_counts_match_a_fused_run():
+    # Arrange
+    program = assemble(LEONARDO, ASSEMBUNNY)
+    machine = Machine(program)
+    counts = [0] * len(program)
+
+    # Act
+    machine.run(counts)
+
+    # Assert
+    assert machine["a"] == 42
+    assert counts == [1, 1, 1, 1, 1, 0]
+
+
+def test_patch_and_breakpoint():
+    # Arrange
+    text = ["cpy 3 c", "inc a", "dec c", "jnz c -2", "cpy a b"]
+    machine = Machine(assemble(text, ASSEMBUNNY))
+    stops = []
+
+    def add(registers):
+        registers[0] += registers[2]
+        registers[2] = 0
+        return 4
+
+    machine.patch(1, add)
+    machine.set_breakpoints(4)
+
+    # Act
+    while not machine.run():
+        stops.append((machine.ip, machine["a"], machine["b"]))
+
+    # Assert
+    assert stops == [(4, 3, 0)]
+    assert machine["b"] == 3
+
+
+def test_multiply_loop_is_fused():
+    # Arrange
+    text = ["cpy 4 b", "cpy 3 d", "cpy b c", "inc a", "dec c", "jnz c -2", "dec d", "jnz d -5"]
+    program = assemble(text, ASSEMBUNNY)
+    counted = Machine(program)
+    counted.run([0] * len(program))
+
+    # Act
+    machine = Machine(program)
+    machine.run()
+
+    # Assert
+    assert sorted((loop.start, loop.end) for loop in program.loops.values()) == [(2, 7), (3, 5)]
+    assert program.loops[2].source()[1] == "    r[0], r[2], r[3] = r[0] + r[1] * r[3], 0, 0"
+    assert machine.registers == counted.registers == [12, 4, 0, 0]
+
+
+@pytest.mark.parametrize(
+    "text,isa",
+    [
+        (["inc a", "dec c", "jnz c 2", "jnz 1 -3"], ASSEMBUNNY),
+        (["dec c", "dec c", "jnz c -2"], ASSEMBUNNY),
+        (["mul a 2", "add i -1", "jgz i -2"], DUET),
+        (["mod a 7", "add i -1", "jgz i -2"], DUET),
+        (["add i 1", "jgz i -1"], DUET),
+    ],
+    ids=["branch_in_body", "step_of_two", "doubling", "modulo", "counting_away"],
+)
+def test_loops_that_are_not_fused(text, isa):
+    # Act
+    program = assemble(text, isa)
+
+    # Assert
+    assert program.loops == {}
+
+
+def test_counting_up_to_zero():
+    # Arrange
+    machine = Machine(assemble(["cpy -3 c", "inc a", "inc c", "jnz c -2"], ASSEMBUNNY))
+
+    # Act
+    machine.run()
+
+    # Assert
+    assert machine.registers == [3, 0, 0, 0]
+
+
+def test_toggled_loop_runs_as_rewritten():
+    # Arrange
+    text = ["cpy 3 c", "tgl 2", "inc a", "inc c", "jnz c -2"]
+    program = assemble(text, ASSEMBUNNY)
+    machine = Machine(program)
+
+    # Act
+    machine.run()
+
+    # Assert
+    assert program.loops[2].guards[0].render() == "(-1) * r[2]"
+    assert machine.registers == [3, 0, 0, 0]
+
+
+def test_receive_waits_for_input():
+    # Arrange
+    machine = Machine(assemble(["rcv a", "add b a", "rcv a", "add b a"], DUET))
+    machine.input.append(3)
+
+    # Act
+    first = machine.run(), machine.waiting
+    machine.input.append(4)
+    second = machine.run(), machine.waiting
+
+    # Assert
+    assert first == (False, True)
+    assert second == (True, False)
+    assert machine["b"] == 7
+
+
+def test_network_detects_deadlock():
+    # Arrange
+    text = ["snd 1", "snd 2", "snd p", "rcv a", "rcv b", "rcv c", "rcv d"]
+    network = Network(assemble(text, DUET), 2, registers=lambda n: {"p": n})
+
+    # Act
+    deadlocked = network.run()
+
+    # Assert
+    assert deadlocked
+    assert network.sent == [3, 3]
+    assert [machine["c"] for machine in network.machines] == [1, 0]
+
+
+def test_network_runs_to_the_end():
+    # Arrange
+    text = ["snd p", "rcv a", "add a 10", "snd a"]
+    network = Network(assemble(text, DUET), 3, registers=lambda n: {"p": n}, route=lambda n: (n - 1) % 3)
+
+    # Act
+    deadlocked = network.run()
+
+    # Assert
+    assert not deadlocked
+    assert network.sent == [2, 2, 2]
+    assert [list(machine.input) for machine in network.machines] == [[12], [10], [11]]